@@ -1,17 +1,17 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
-from flasgger import Swagger
+from .database import RoutingSession
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__)
     app.config.from_object('app.config.Config')
+    if config:
+        app.config.update(config)
 
     # Enhanced Swagger Configuration
     app.config['SWAGGER'] = {
@@ -28,12 +28,24 @@ def create_app():
         },
         'security': [{'Bearer': []}]
     }
-    swagger = Swagger(app)
+    if app.config['SWAGGER_ENABLED']:
+        # flasgger and its YAML/JSON schema stack are slow to import
+        from flasgger import Swagger
+        Swagger(app)
 
     # Initialize extensions
+    from .database import configure_engines, register_database
+    configure_engines(app)
     db.init_app(app)
-    migrate.init_app(app, db)
+    register_database(app)
     jwt.init_app(app)
+    from . import identity  # Registers the JWT user lookup
+
+    # First registered, so its after_request hook runs last and times everything
+    from .request_log import register_request_logging
+    register_request_logging(app)
+    from .metrics import register_metrics
+    register_metrics(app)
     
     # Comprehensive CORS Configuration
     CORS(
@@ -66,13 +78,20 @@ def create_app():
     )
 
     # Register blueprints
-    from .routes import auth, players, teams, leagues, dashboard, scores
+    from .routes import auth, players, teams, leagues, dashboard, scores, jobs
     app.register_blueprint(auth.bp)
     app.register_blueprint(players.bp)
     app.register_blueprint(teams.bp)
     app.register_blueprint(leagues.bp)
     app.register_blueprint(dashboard.bp)
     app.register_blueprint(scores.bp)
+    app.register_blueprint(jobs.bp)
+
+    from .commands import register_commands
+    register_commands(app)
+
+    from .http_cache import register_compression
+    register_compression(app)
 
     @app.route('/')
     def index():
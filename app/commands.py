@@ -0,0 +1,154 @@
+import os
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from . import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+def init_migrations(app):
+    """
+    Set up Flask-Migrate for an app, once. Alembic is slow to import and
+    only the migration commands need it, so this runs on demand rather than
+    in create_app.
+    Returns:
+        The app's Flask-Migrate config.
+    """
+    if 'migrate' not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db, directory=MIGRATIONS_DIR)
+    return app.extensions['migrate']
+
+
+class LazyMigrateGroup(click.Group):
+    """`flask db`, loading Flask-Migrate's commands the first time one is looked up."""
+
+    def _group(self):
+        from flask_migrate.cli import db as db_cli_group
+        return db_cli_group
+
+    def list_commands(self, ctx):
+        return self._group().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        init_migrations(current_app._get_current_object())
+        return self._group().get_command(ctx, name)
+
+
+@click.command('rebuild-points')
+@with_appcontext
+def rebuild_points_command():
+    """Recompute stored team points, squad sizes, league points and member counts from scratch."""
+    from .points import rebuild_member_counts, rebuild_points
+
+    rebuild_points()
+    rebuild_member_counts()
+    db.session.commit()
+    click.echo('Team points, squad sizes, league points and member counts rebuilt.')
+
+
+@click.command('password-benchmark')
+@click.option('--scheme', type=click.Choice(['bcrypt', 'pbkdf2', 'scrypt']), default=None,
+              help='Scheme to tune (default: PASSWORD_SCHEME).')
+@click.option('--target-ms', type=float, default=250.0, show_default=True,
+              help='Time one hash may take on this machine.')
+@with_appcontext
+def password_benchmark_command(scheme, target_ms):
+    """Find the highest password hashing cost that fits within a time budget."""
+    from .passwords import benchmark
+
+    scheme = scheme or current_app.config['PASSWORD_SCHEME']
+    cost, timings = benchmark(scheme, target_ms)
+    for tried, elapsed_ms in timings:
+        click.echo(f'{scheme} cost {tried}: {elapsed_ms:.1f} ms')
+    click.echo(f'Suggested settings: PASSWORD_SCHEME={scheme} PASSWORD_COST={cost}')
+
+
+@click.group('seed')
+def seed_group():
+    """Create tables and fill them with generated or test data."""
+
+
+@seed_group.command('init')
+@click.option('--drop', is_flag=True, help='Drop every table first. All data is lost.')
+@with_appcontext
+def seed_init_command(drop):
+    """Create all database tables and mark them as migrated to the latest revision."""
+    from flask_migrate import stamp
+
+    init_migrations(current_app._get_current_object())
+    if drop:
+        click.confirm('Drop all tables and their data?', abort=True)
+        db.drop_all()
+        db.session.execute(db.text('DROP TABLE IF EXISTS alembic_version'))
+        db.session.commit()
+    db.create_all()
+    stamp()
+    click.echo('Database tables created.')
+
+
+@seed_group.command('data')
+@click.option('--users', type=click.IntRange(min=1), default=1000, show_default=True,
+              help='Users to create, each with a team.')
+@click.option('--rows', type=click.IntRange(min=1), default=None,
+              help='Target squad (team_player) rows; sets --users to rows / squad size.')
+@click.option('--leagues', type=click.IntRange(min=0), default=None,
+              help='Leagues to create (default: one per 10 users).')
+@click.option('--players', type=click.IntRange(min=0), default=500, show_default=True)
+@click.option('--squad-size', type=click.IntRange(min=0, max=11), default=11, show_default=True)
+@click.option('--seed', type=int, default=42, show_default=True, help='Same seed, same data.')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=5000, show_default=True,
+              help='Rows per INSERT batch.')
+@with_appcontext
+def seed_data_command(users, rows, leagues, players, squad_size, seed, chunk_size):
+    """Bulk-generate users, teams, leagues, memberships, players and squads."""
+    import time
+    from .seed import SEED_PASSWORD, seed_dataset
+
+    if rows is not None:
+        if not squad_size:
+            raise click.BadParameter('needs a squad size above 0.', param_hint='--rows')
+        users = -(-rows // squad_size)
+    if leagues is None:
+        leagues = max(1, users // 10)
+
+    started = time.perf_counter()
+    counts = seed_dataset(users=users, leagues=leagues, players=players, squad_size=squad_size,
+                          seed=seed, chunk_size=chunk_size)
+    db.session.commit()
+    for table, count in counts.items():
+        click.echo(f'{table}: {count}')
+    click.echo(f'Seeded in {time.perf_counter() - started:.1f}s. Every user\'s password is {SEED_PASSWORD!r}.')
+
+
+@seed_group.command('user')
+@click.argument('email')
+@click.option('--username', default=None, help='Defaults to the part of EMAIL before the @.')
+@click.option('--password', prompt=True, hide_input=True, confirmation_prompt=True)
+@with_appcontext
+def seed_user_command(email, username, password):
+    """Create a login user with a team, or reset an existing user's password."""
+    from .models import User, Team
+
+    user = User.query.filter_by(email=email).first()
+    created = user is None
+    if created:
+        username = username or email.split('@')[0]
+        if User.query.filter_by(username=username).first():
+            raise click.ClickException(f'Username {username!r} is taken; pass --username.')
+        user = User(username=username, email=email)
+        db.session.add(user)
+    user.set_password(password)
+    db.session.flush()
+    if not Team.query.filter_by(user_id=user.id).first():
+        db.session.add(Team(name=f"{user.username}'s Team", user_id=user.id, budget_left=100.0))
+    db.session.commit()
+    click.echo(f'{"Created" if created else "Updated"} user {user.username} <{email}>.')
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_points_command)
+    app.cli.add_command(password_benchmark_command)
+    app.cli.add_command(seed_group)
+    app.cli.add_command(LazyMigrateGroup('db', help='Perform database migrations.'))
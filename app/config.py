@@ -3,11 +3,89 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _parse_rates(value):
+    """Parse 'endpoint=rate,endpoint=rate' into a dict."""
+    pairs = (item.split('=', 1) for item in value.split(',') if '=' in item)
+    return {endpoint.strip(): float(rate) for endpoint, rate in pairs}
+
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.getenv('SQLALCHEMY_DATABASE_URI', 'sqlite:///dreamsquad.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = os.getenv('SQLALCHEMY_TRACK_MODIFICATIONS', 'False') == 'True'
+    # Connection pool per worker process (see app.database); SQLite ignores
+    # all but pre-ping. Keep workers * (size + overflow) under the server's
+    # connection limit.
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True') == 'True'
+    # Optional read replica for GET requests
+    DB_REPLICA_URL = os.getenv('DB_REPLICA_URL')
+    # Pragmas for every SQLite connection (empty or 0: SQLite's default). WAL
+    # lets readers run alongside a writer; synchronous=NORMAL is safe with WAL.
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
     API_FOOTBALL_KEY = os.getenv('API_FOOTBALL_KEY')
+    API_FOOTBALL_URL = os.getenv('API_FOOTBALL_URL', 'https://v3.football.api-sports.io')
+    API_FOOTBALL_WORKERS = int(os.getenv('API_FOOTBALL_WORKERS', '4'))
+    API_FOOTBALL_TIMEOUT = float(os.getenv('API_FOOTBALL_TIMEOUT', '20'))
+    API_FOOTBALL_MAX_RETRIES = int(os.getenv('API_FOOTBALL_MAX_RETRIES', '3'))
+    API_FOOTBALL_BACKOFF = float(os.getenv('API_FOOTBALL_BACKOFF', '0.5'))
+    # Keep below the plan's per-minute quota (free plan: 10, paid plans: 300+)
+    API_FOOTBALL_REQUESTS_PER_MINUTE = int(os.getenv('API_FOOTBALL_REQUESTS_PER_MINUTE', '30'))
+    # Swagger UI at /apidocs/. Turning it off skips importing flasgger, which
+    # shortens cold starts where nobody reads the docs.
+    SWAGGER_ENABLED = os.getenv('SWAGGER_ENABLED', 'True') == 'True'
     SWAGGER_URL = '/apidocs'
-    API_URL = '/static/swagger.json'
\ No newline at end of file
+    API_URL = '/static/swagger.json'
+    # Responses at least this large are gzipped when the client accepts it
+    GZIP_MIN_SIZE = int(os.getenv('GZIP_MIN_SIZE', '1024'))
+    GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '6'))
+    # Background jobs: worker threads per process, and how long a running job
+    # may go without a progress update before it is considered abandoned
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+    JOB_STALE_SECONDS = int(os.getenv('JOB_STALE_SECONDS', '900'))
+    JOBS_RUN_INLINE = os.getenv('JOBS_RUN_INLINE', 'False') == 'True'
+    # Per-user dashboard snapshots (per worker); entries are also keyed by the
+    # team, league and catalogue versions, so changes invalidate them at once
+    DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', '30'))
+    DASHBOARD_CACHE_SIZE = int(os.getenv('DASHBOARD_CACHE_SIZE', '10000'))
+    # Password hashing: scheme ('scrypt', 'bcrypt' or 'pbkdf2') and its cost
+    # (bcrypt/scrypt: log2 work factor, pbkdf2: iterations; unset = scheme
+    # default). Tune with `flask password-benchmark`. Existing hashes are
+    # upgraded to these settings when their owners log in.
+    PASSWORD_SCHEME = os.getenv('PASSWORD_SCHEME', 'scrypt')
+    PASSWORD_COST = int(os.getenv('PASSWORD_COST')) if os.getenv('PASSWORD_COST') else None
+    # Hashes run on a per-worker pool; requests past the pending limit wait
+    # up to PASSWORD_HASH_WAIT_SECONDS and then get a 503
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '8'))
+    PASSWORD_HASH_WAIT_SECONDS = float(os.getenv('PASSWORD_HASH_WAIT_SECONDS', '5'))
+    # Google Sign-In: tokens must be issued for this client ID
+    GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID', '390480519666-5d2b8en0e3slv374hhm696mrtq0l4l0e.apps.googleusercontent.com')
+    GOOGLE_CERTS_URL = os.getenv('GOOGLE_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs')
+    GOOGLE_CERTS_TIMEOUT = float(os.getenv('GOOGLE_CERTS_TIMEOUT', '10'))
+    GOOGLE_CLOCK_SKEW_SECONDS = int(os.getenv('GOOGLE_CLOCK_SKEW_SECONDS', '10'))
+    # JWT identity -> user/team ids, cached per worker (see app.identity)
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', '10'))
+    IDENTITY_CACHE_SIZE = int(os.getenv('IDENTITY_CACHE_SIZE', '10000'))
+    # Request logging (see app.request_log). Endpoints listed in
+    # LOG_SAMPLE_RATES are logged at that fraction of requests, except errors
+    # and requests slower than LOG_SLOW_REQUEST_MS.
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_SAMPLE_RATES = _parse_rates(os.getenv(
+        'LOG_SAMPLE_RATES',
+        'players.get_players=0.1,dashboard.get_dashboard_data=0.1,teams.get_team=0.1,'
+        'leagues.get_league_details=0.1,leagues.get_public_leagues=0.1,metrics=0.01'
+    ))
+    LOG_SLOW_REQUEST_MS = float(os.getenv('LOG_SLOW_REQUEST_MS', '1000'))
+    LOG_REQUEST_HEADERS = os.getenv('LOG_REQUEST_HEADERS', 'False') == 'True'
+    # Prometheus metrics at /metrics, and a warning log for SQL statements
+    # slower than SLOW_QUERY_MS (unset: off)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS')) if os.getenv('SLOW_QUERY_MS') else None
@@ -0,0 +1,113 @@
+from flask import current_app, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+# Engine setup from config, SQLite pragmas, and read-replica routing.
+# With DB_REPLICA_URL set, SELECTs issued while serving GET and HEAD requests
+# go to the replica engine in app.extensions['db_replica']; everything else,
+# and any view marked @use_primary, uses the primary database. Replicas lag,
+# so a client may not see its own write on the very next GET. The replica is
+# not a Flask-SQLAlchemy bind, so create_all and migrations never touch it.
+_READ_REPLICA = 'read_replica'
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and self.info.get(_READ_REPLICA) and not self._flushing
+                and getattr(clause, 'is_select', False) and getattr(clause, '_for_update_arg', None) is None):
+            return current_app.extensions['db_replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def engine_options(url, config):
+    """
+    Build SQLAlchemy engine options for a database URL.
+    Args:
+        url (str): Database URL.
+        config (dict): App config holding the DB_POOL_* settings.
+    Returns:
+        dict: Keyword arguments for create_engine.
+    """
+    options = {'pool_pre_ping': config['DB_POOL_PRE_PING']}
+    if make_url(url).get_backend_name() != 'sqlite':
+        # SQLite's file and in-memory pools size themselves
+        options.update(
+            pool_size=config['DB_POOL_SIZE'],
+            max_overflow=config['DB_MAX_OVERFLOW'],
+            pool_timeout=config['DB_POOL_TIMEOUT'],
+            pool_recycle=config['DB_POOL_RECYCLE'],
+        )
+    return options
+
+
+def configure_engines(app):
+    """
+    Fill in SQLALCHEMY_ENGINE_OPTIONS from config unless set explicitly.
+    Must run before db.init_app.
+    """
+    config = app.config
+    config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(config['SQLALCHEMY_DATABASE_URI'], config))
+
+
+def app_engines(app):
+    """The primary engine and the replica engine, if any. Needs an app context."""
+    from . import db
+
+    replica = app.extensions.get('db_replica')
+    return [db.engine] + ([replica] if replica is not None else [])
+
+
+def _sqlite_pragmas(config):
+    pragmas = []
+    if config['SQLITE_JOURNAL_MODE']:
+        pragmas.append(f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}")
+    if config['SQLITE_SYNCHRONOUS']:
+        pragmas.append(f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}")
+    if config['SQLITE_MMAP_SIZE']:
+        pragmas.append(f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}")
+    return pragmas
+
+
+def use_primary(view):
+    """Serve a GET view from the primary database, e.g. to read a write it just made."""
+    view.use_primary = True
+    return view
+
+
+def register_database(app):
+    """
+    Apply the SQLite pragmas to every new connection and, with a replica
+    configured, route read-only requests to it.
+    """
+    from . import db
+
+    pragmas = _sqlite_pragmas(app.config)
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    replica_url = app.config['DB_REPLICA_URL']
+    if replica_url:
+        app.extensions['db_replica'] = create_engine(replica_url, **engine_options(replica_url, app.config))
+
+    with app.app_context():
+        for engine in app_engines(app):
+            if pragmas and engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', set_pragmas)
+
+    if not replica_url:
+        return
+
+    @app.before_request
+    def route_reads():
+        view = current_app.view_functions.get(request.endpoint)
+        if request.method in ('GET', 'HEAD') and not getattr(view, 'use_primary', False):
+            db.session.info[_READ_REPLICA] = True
+
+    @app.teardown_request
+    def end_read_routing(exc):
+        db.session.info.pop(_READ_REPLICA, None)
@@ -0,0 +1,145 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from flask import current_app
+
+# Responses worth retrying: quota exceeded and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FootballAPIError(Exception):
+    """Raised when API-Football cannot be reached or rejects a request."""
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `rate` requests per `per` seconds, with
+    bursts of up to `burst` requests.
+    """
+
+    def __init__(self, rate, per=60.0, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.interval = per / rate
+        self.capacity = burst or 1
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) / self.interval)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) * self.interval
+            self.sleep(wait)
+
+
+class FootballAPIClient:
+    """
+    API-Football client over one keep-alive connection pool. Pages after the
+    first are fetched in parallel by a bounded worker pool; every request goes
+    through the rate limiter and is retried with exponential backoff.
+    """
+
+    def __init__(self, api_key, base_url='https://v3.football.api-sports.io', workers=4,
+                 timeout=20, max_retries=3, backoff=0.5, requests_per_minute=30):
+        self.base_url = base_url.rstrip('/')
+        self.workers = workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.limiter = RateLimiter(requests_per_minute, per=60.0, burst=workers)
+        self.session = requests.Session()
+        self.session.headers['x-apisports-key'] = api_key
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config['API_FOOTBALL_KEY'],
+            base_url=config['API_FOOTBALL_URL'],
+            workers=config['API_FOOTBALL_WORKERS'],
+            timeout=config['API_FOOTBALL_TIMEOUT'],
+            max_retries=config['API_FOOTBALL_MAX_RETRIES'],
+            backoff=config['API_FOOTBALL_BACKOFF'],
+            requests_per_minute=config['API_FOOTBALL_REQUESTS_PER_MINUTE'],
+        )
+
+    def _retry_delay(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) * (1 + random.random() / 2)
+
+    def get(self, endpoint, params):
+        """
+        GET one page of an endpoint, retrying transient failures.
+        Returns:
+            dict: Decoded JSON payload.
+        Raises:
+            FootballAPIError: When the request still fails after all retries.
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            response = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    data = response.json()
+                    errors = data.get('errors')
+                    # API-Football reports quota errors with a 200 status
+                    if not (errors and 'rateLimit' in errors):
+                        if errors:
+                            raise FootballAPIError(f'API-Football error: {errors}')
+                        return data
+                error = f'API-Football returned {response.status_code} for {params}'
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = f'API-Football request failed: {e}'
+            except (requests.RequestException, ValueError) as e:
+                raise FootballAPIError(f'API-Football request failed: {e}') from e
+            if attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, response))
+        raise FootballAPIError(error)
+
+    def fetch_pages(self, endpoint, params):
+        """
+        Fetch every page of a paginated endpoint.
+        The first page is fetched alone to learn paging.total; the remaining
+        pages are fetched concurrently and yielded in page order.
+        """
+        first = self.get(endpoint, {**params, 'page': 1})
+        yield first
+        total_pages = first.get('paging', {}).get('total', 1)
+        if total_pages <= 1:
+            return
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='api-football')
+        try:
+            yield from pool.map(lambda page: self.get(endpoint, {**params, 'page': page}),
+                                range(2, total_pages + 1))
+        finally:
+            # Don't keep fetching pages nobody will read after a failure
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def get_client():
+    """
+    Return the app's shared API-Football client, creating it on first use so
+    its connection pool is reused across syncs.
+    """
+    client = current_app.extensions.get('football_api')
+    if client is None:
+        client = FootballAPIClient.from_config(current_app.config)
+        current_app.extensions['football_api'] = client
+    return client
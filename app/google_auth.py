@@ -0,0 +1,117 @@
+import re
+import threading
+import time
+from flask import current_app
+from sqlalchemy import select
+from . import db
+from .models import User
+
+# Google rotates its signing keys every few days and publishes them with a
+# Cache-Control max-age. Certificates are kept in memory for that long and
+# fetched over one keep-alive session per worker, so verifying a token does
+# not normally make any HTTP request. requests and google-auth are imported
+# on first use, so workers that never see a Google login don't load them.
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+class GoogleCertCache:
+    """Google's public signing certificates, refreshed when their max-age expires."""
+
+    def __init__(self, certs_url, timeout=10, default_max_age=300, min_refresh_interval=60,
+                 clock=time.monotonic):
+        import requests
+
+        self.certs_url = certs_url
+        self.timeout = timeout
+        self.default_max_age = default_max_age
+        self.min_refresh_interval = min_refresh_interval
+        self.clock = clock
+        self.session = requests.Session()
+        self._certs = None
+        self._expires_at = 0.0
+        self._fetched_at = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config['GOOGLE_CERTS_URL'], timeout=config['GOOGLE_CERTS_TIMEOUT'])
+
+    def _fetch(self):
+        response = self.session.get(self.certs_url, timeout=self.timeout)
+        response.raise_for_status()
+        match = _MAX_AGE.search(response.headers.get('Cache-Control', ''))
+        max_age = int(match.group(1)) if match else self.default_max_age
+        now = self.clock()
+        self._certs = response.json()
+        self._fetched_at = now
+        self._expires_at = now + max_age
+
+    def get(self, key_id=None):
+        """
+        Return the current certificates.
+        Args:
+            key_id (str): Key the caller needs. If it is missing from an
+                unexpired set, the set is refetched early (at most once per
+                min_refresh_interval) in case Google has just rotated keys.
+        Returns:
+            dict: Key id -> PEM certificate.
+        """
+        with self._lock:
+            now = self.clock()
+            stale = self._certs is None or now >= self._expires_at
+            rotated = (key_id is not None and self._certs is not None and key_id not in self._certs
+                       and now - self._fetched_at >= self.min_refresh_interval)
+            if stale or rotated:
+                self._fetch()
+            return self._certs
+
+
+def get_cert_cache():
+    """Return the app's shared certificate cache, creating it on first use."""
+    cache = current_app.extensions.get('google_certs')
+    if cache is None:
+        cache = GoogleCertCache.from_config(current_app.config)
+        current_app.extensions['google_certs'] = cache
+    return cache
+
+
+def verify_google_token(token):
+    """
+    Verify a Google ID token against the cached certificates.
+    Args:
+        token (str): The ID token from Google Sign-In.
+    Returns:
+        dict: The token's claims.
+    Raises:
+        ValueError: If the token is malformed, expired, for another audience,
+            from another issuer or not signed by Google.
+    """
+    from google.auth import jwt as google_jwt
+
+    header = google_jwt.decode_header(token)
+    certs = get_cert_cache().get(header.get('kid'))
+    claims = google_jwt.decode(token, certs=certs, audience=current_app.config['GOOGLE_CLIENT_ID'],
+                               clock_skew_in_seconds=current_app.config['GOOGLE_CLOCK_SKEW_SECONDS'])
+    if claims.get('iss') not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer: {claims.get('iss')}")
+    return claims
+
+
+def next_free_username(base_username):
+    """
+    Find the first of base_username, base_username1, base_username2, ... that
+    is not taken, with a single prefix query.
+    Returns:
+        str: An unused username.
+    """
+    escaped = base_username.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    taken = set(db.session.scalars(
+        select(User.username).where(User.username.like(f'{escaped}%', escape='\\'))
+    ))
+    if base_username not in taken:
+        return base_username
+    counter = 1
+    while f'{base_username}{counter}' in taken:
+        counter += 1
+    return f'{base_username}{counter}'
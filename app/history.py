@@ -0,0 +1,91 @@
+from sqlalchemy import func, select
+from . import db
+from .models import Gameweek, Player, PlayerGameweekPoints
+
+# Reports over the per-gameweek points history. The history side of every
+# query is answered from one of the covering indexes on player_gameweek_points,
+# so report cost does not grow with the number of rows in the table.
+
+
+def _first_of_recent_gameweeks(last_n):
+    recent = select(Gameweek.id).order_by(Gameweek.id.desc()).limit(last_n).subquery()
+    return select(func.min(recent.c.id)).scalar_subquery()
+
+
+def player_form(player_ids, last_n=5):
+    """
+    Total points per player over the last N scored gameweeks.
+    Args:
+        player_ids (iterable): Players to report on.
+        last_n (int): Number of most recent gameweeks (default: 5).
+    Returns:
+        dict: player_id -> points (players without history are omitted).
+    """
+    first_gameweek = _first_of_recent_gameweeks(last_n)
+    stmt = (
+        select(PlayerGameweekPoints.player_id, func.sum(PlayerGameweekPoints.points))
+        .where(PlayerGameweekPoints.player_id.in_(list(player_ids)))
+        .where(PlayerGameweekPoints.gameweek >= first_gameweek)
+        .group_by(PlayerGameweekPoints.player_id)
+    )
+    return dict(db.session.execute(stmt).all())
+
+
+def player_history(player_id, last_n=None):
+    """
+    Points per gameweek for one player, most recent first.
+    Returns:
+        list[dict]: Rows with gameweek and points.
+    """
+    stmt = (
+        select(PlayerGameweekPoints.gameweek, PlayerGameweekPoints.points)
+        .where(PlayerGameweekPoints.player_id == player_id)
+        .order_by(PlayerGameweekPoints.gameweek.desc())
+    )
+    if last_n is not None:
+        stmt = stmt.limit(last_n)
+    return [dict(row._mapping) for row in db.session.execute(stmt)]
+
+
+def season_totals(from_gameweek=None, to_gameweek=None, limit=None):
+    """
+    Points per player summed over a gameweek range, highest first.
+    Args:
+        from_gameweek (int): First gameweek included (default: the first).
+        to_gameweek (int): Last gameweek included (default: the latest).
+        limit (int): Only return the top N players.
+    Returns:
+        list[dict]: Rows with player_id and points.
+    """
+    total = func.sum(PlayerGameweekPoints.points).label('points')
+    stmt = select(PlayerGameweekPoints.player_id, total).group_by(PlayerGameweekPoints.player_id)
+    if from_gameweek is not None:
+        stmt = stmt.where(PlayerGameweekPoints.gameweek >= from_gameweek)
+    if to_gameweek is not None:
+        stmt = stmt.where(PlayerGameweekPoints.gameweek <= to_gameweek)
+    stmt = stmt.order_by(total.desc(), PlayerGameweekPoints.player_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [dict(row._mapping) for row in db.session.execute(stmt)]
+
+
+def top_scorers(gameweek, limit=10):
+    """
+    Highest scoring players of a single gameweek.
+    Returns:
+        list[dict]: Rows with player_id, name, position, team_name and points.
+    """
+    top = (
+        select(PlayerGameweekPoints.player_id, PlayerGameweekPoints.points)
+        .where(PlayerGameweekPoints.gameweek == gameweek)
+        # Walks ix_player_gameweek_points_top backwards, no sort step
+        .order_by(PlayerGameweekPoints.points.desc(), PlayerGameweekPoints.player_id.desc())
+        .limit(limit)
+        .subquery()
+    )
+    stmt = (
+        select(top.c.player_id, Player.name, Player.position, Player.team_name, top.c.points)
+        .join(Player, Player.id == top.c.player_id)
+        .order_by(top.c.points.desc(), top.c.player_id.desc())
+    )
+    return [dict(row._mapping) for row in db.session.execute(stmt)]
@@ -0,0 +1,135 @@
+import gzip
+import hashlib
+from datetime import datetime
+from functools import wraps
+from flask import current_app, make_response, request
+from sqlalchemy import select
+from . import db
+from .models import ResourceVersion
+from .utils import dialect_insert
+
+# Version counters behind conditional GETs. Writers bump the counters of what
+# they changed in the same transaction; cached views derive a strong ETag from
+# the counters they depend on, so an unchanged resource costs one indexed
+# lookup and a bodiless 304.
+CATALOGUE = 'catalogue'          # Player rows and points (sync, scoring)
+PUBLIC_LEAGUES = 'leagues'       # League list and membership counts
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript'}
+
+
+def league_key(league_id):
+    return f'league:{league_id}'
+
+
+def team_key(team_id):
+    return f'team:{team_id}'
+
+
+def bump_versions(*names):
+    """
+    Increment the given version counters in the current transaction.
+    Args:
+        *names (str): Counter names; falsy names are ignored.
+    """
+    names = sorted({name for name in names if name})
+    if not names:
+        return
+    now = datetime.utcnow()
+    stmt = dialect_insert(ResourceVersion, db.session.get_bind().dialect.name).values(
+        [{'name': name, 'version': 1, 'updated_at': now} for name in names]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['name'],
+        set_={'version': ResourceVersion.version + 1, 'updated_at': stmt.excluded.updated_at},
+    )
+    db.session.execute(stmt)
+
+
+def current_versions(names):
+    """
+    Return {name: (version, updated_at)} for the given counters; counters that
+    were never bumped are reported as (0, None).
+    """
+    rows = db.session.execute(
+        select(ResourceVersion.name, ResourceVersion.version, ResourceVersion.updated_at)
+        .where(ResourceVersion.name.in_(names))
+    ).all()
+    versions = {name: (0, None) for name in names}
+    versions.update({name: (version, updated_at) for name, version, updated_at in rows})
+    return versions
+
+
+def _etag(names, versions):
+    parts = [request.endpoint, request.query_string.decode()]
+    parts += [f'{name}={versions[name][0]}' for name in names]
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+def cached_by(*resources):
+    """
+    Serve a GET view with a strong ETag and Last-Modified derived from version
+    counters, answering 304 Not Modified without running the view when the
+    client already has the current representation.
+    Args:
+        *resources: Counter names, or callables taking the view's kwargs and
+            returning a counter name.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            names = [r(**kwargs) if callable(r) else r for r in resources]
+            versions = current_versions(names)
+            etag = _etag(names, versions)
+            modified = [updated_at for _, updated_at in versions.values() if updated_at]
+            last_modified = max(modified).replace(microsecond=0) if modified else None
+
+            # Compressed responses carry a '-gzip' suffixed ETag; a 304 echoes
+            # whichever variant the client holds
+            matched = next((tag for tag in (etag, f'{etag}-gzip') if request.if_none_match.contains(tag)), None)
+            if request.if_none_match:
+                not_modified = matched is not None
+            else:
+                not_modified = bool(last_modified and request.if_modified_since
+                                    and last_modified <= request.if_modified_since.replace(tzinfo=None))
+            if not_modified:
+                response = current_app.response_class(status=304)
+                response.set_etag(matched or etag)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+def register_compression(app):
+    """
+    Gzip responses above GZIP_MIN_SIZE bytes for clients that accept it.
+    """
+    @app.after_request
+    def compress_response(response):
+        min_size = app.config.get('GZIP_MIN_SIZE', 1024)
+        if (min_size is None
+                or response.status_code != 200
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'gzip' not in request.accept_encodings):
+            return response
+        data = response.get_data()
+        response.vary.add('Accept-Encoding')
+        if len(data) < min_size:
+            return response
+
+        response.set_data(gzip.compress(data, compresslevel=app.config.get('GZIP_LEVEL', 6)))
+        response.headers['Content-Encoding'] = 'gzip'
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f'{etag}-gzip', weak=weak)
+        return response
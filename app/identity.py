@@ -0,0 +1,70 @@
+import threading
+from collections import namedtuple
+from cachetools import TTLCache
+from flask import current_app, jsonify
+from sqlalchemy import select
+from . import db, jwt
+from .models import User, Team
+
+# The JWT identity resolved to the caller's user and team ids in one query
+# and kept per worker for IDENTITY_CACHE_TTL seconds. Routes read it through
+# flask_jwt_extended's `current_user`. Writes that change these fields call
+# forget_identity() so this worker sees them at once; other workers pick
+# them up when their entry expires, so keep the TTL short and don't rely on
+# league_id for writes.
+Identity = namedtuple('Identity', ['user_id', 'username', 'team_id', 'league_id'])
+
+_identities_lock = threading.Lock()
+
+
+def _identity_cache():
+    with _identities_lock:
+        cache = current_app.extensions.get('identities')
+        if cache is None:
+            cache = TTLCache(maxsize=current_app.config['IDENTITY_CACHE_SIZE'],
+                             ttl=current_app.config['IDENTITY_CACHE_TTL'])
+            current_app.extensions['identities'] = cache
+        return cache
+
+
+def load_identity(user_id):
+    """
+    Return the cached identity for a user, querying it on a miss.
+    Returns:
+        Identity: The user's ids, or None if the user no longer exists.
+    """
+    cache = _identity_cache()
+    with _identities_lock:
+        identity = cache.get(user_id)
+    if identity is not None:
+        return identity
+
+    row = db.session.execute(
+        select(User.id, User.username, Team.id, Team.league_id)
+        .outerjoin(Team, Team.user_id == User.id)
+        .where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+    identity = Identity(*row)
+    with _identities_lock:
+        cache[user_id] = identity
+    return identity
+
+
+def forget_identity(*user_ids):
+    """Drop cached identities after a write that changes them."""
+    cache = _identity_cache()
+    with _identities_lock:
+        for user_id in user_ids:
+            cache.pop(user_id, None)
+
+
+@jwt.user_lookup_loader
+def _user_lookup(jwt_header, jwt_data):
+    return load_identity(jwt_data[current_app.config['JWT_IDENTITY_CLAIM']])
+
+
+@jwt.user_lookup_error_loader
+def _user_lookup_error(jwt_header, jwt_data):
+    return jsonify({'message': 'User not found'}), 401
@@ -0,0 +1,137 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from . import db
+from .models import Job
+from .scoring import score_gameweek
+from .sync import sync_players
+
+# In-process job runner backed by the job table. Each gunicorn worker runs
+# jobs on its own small thread pool; the partial unique index on Job.kind
+# makes enqueueing single-flight across all workers, and the jobs table is
+# what GET /jobs/<id> reports from, whichever worker runs the job.
+ACTIVE_STATUSES = ('queued', 'running')
+JOB_HANDLERS = {}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class JobAlreadyRunning(Exception):
+    """Raised when a job of the same kind is already queued or running."""
+
+    def __init__(self, job):
+        super().__init__(f'A {job.kind} job is already {job.status}' if job else 'Job already running')
+        self.job = job
+
+
+def job_handler(kind):
+    """Register the function that runs jobs of the given kind."""
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def _get_executor(app):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=app.config['JOB_WORKERS'], thread_name_prefix='job')
+        return _executor
+
+
+def active_job(kind):
+    return Job.query.filter(Job.kind == kind, Job.status.in_(ACTIVE_STATUSES)).first()
+
+
+def _fail_stale_jobs(kind, stale_seconds):
+    """Release the single-flight slot held by jobs whose worker died."""
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_seconds)
+    db.session.execute(
+        update(Job)
+        .where(Job.kind == kind, Job.status.in_(ACTIVE_STATUSES), Job.updated_at < cutoff)
+        .values(status='failed', error='Abandoned: no progress reported', finished_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def enqueue(kind, params=None, user_id=None):
+    """
+    Record a job and start it on this worker's pool.
+    Returns:
+        Job: The queued job.
+    Raises:
+        JobAlreadyRunning: If a job of this kind is already queued or running.
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f'Unknown job kind: {kind}')
+    app = current_app._get_current_object()
+    _fail_stale_jobs(kind, app.config['JOB_STALE_SECONDS'])
+    job = Job(kind=kind, params=params or {}, created_by=user_id)
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise JobAlreadyRunning(active_job(kind))
+
+    if app.config.get('JOBS_RUN_INLINE'):
+        run_job(app, job.id)
+        db.session.expire(job)  # Written by the job's own session
+    else:
+        _get_executor(app).submit(run_job, app, job.id)
+    return job
+
+
+def run_job(app, job_id):
+    """Run one job in its own app context and record the outcome."""
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        job.status = 'running'
+        job.started_at = datetime.utcnow()
+        db.session.commit()
+        try:
+            job.result = JOB_HANDLERS[job.kind](job, **(job.params or {}))
+            job.status = 'succeeded'
+        except Exception as e:
+            app.logger.exception('Job %s (%s) failed', job_id, job.kind)
+            db.session.rollback()
+            job = db.session.get(Job, job_id)
+            job.status = 'failed'
+            job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        # Commits the handler's work and the final status together
+        db.session.commit()
+
+
+@job_handler('players_sync')
+def _sync_players_job(job):
+    def on_page(pages_done, pages_total, rows_written):
+        # Commit page by page: progress becomes visible and write locks stay short
+        job.pages_done = pages_done
+        job.pages_total = pages_total
+        job.rows_written += rows_written
+        db.session.commit()
+
+    from .football_api import get_client  # Keeps requests out of web worker startup
+
+    added, updated = sync_players(get_client(), on_page=on_page)
+    return {
+        'message': f'Player sync complete. Added {added} new players, updated {updated}.',
+        'added': added,
+        'updated': updated,
+    }
+
+
+@job_handler('gameweek_scoring')
+def _score_gameweek_job(job, gameweek):
+    players_scored = score_gameweek(gameweek)
+    if players_scored is None:
+        return {'message': f'Gameweek {gameweek} has already been scored.', 'gameweek': gameweek}
+    job.pages_done = job.pages_total = 1
+    job.rows_written = players_scored
+    return {'message': f'Successfully updated scores for {players_scored} players.', 'gameweek': gameweek}
@@ -0,0 +1,109 @@
+import logging
+import os
+import time
+from flask import Response, g, has_request_context, request
+from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY,
+                               generate_latest, multiprocess)
+from sqlalchemy import event
+from .database import app_engines
+
+# Per-endpoint request latency, SQL query counts and DB time in Prometheus
+# format. Under gunicorn, PROMETHEUS_MULTIPROC_DIR (set in gunicorn.conf.py)
+# makes every worker write its samples to files in that directory, and
+# /metrics merges them, so any worker can answer a scrape for all of them.
+# Queries run outside a request (background jobs, CLI) count as 'background'.
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency', ['endpoint', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL statements run per request', ['endpoint'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+DB_QUERIES = Counter('db_queries_total', 'SQL statements executed', ['endpoint'])
+DB_SECONDS = Counter('db_query_seconds_total', 'Time spent in SQL statements', ['endpoint'])
+
+slow_query_logger = logging.getLogger('app.sql')
+
+
+def _endpoint():
+    if not has_request_context():
+        return 'background'
+    return request.endpoint or 'unmatched'
+
+
+def _register_query_timing(app):
+    def record_query(statement, started):
+        elapsed = time.perf_counter() - started
+        endpoint = _endpoint()
+        DB_QUERIES.labels(endpoint).inc()
+        DB_SECONDS.labels(endpoint).inc(elapsed)
+        if endpoint != 'background':
+            g.db_queries = g.get('db_queries', 0) + 1
+        threshold_ms = app.config['SLOW_QUERY_MS']
+        if threshold_ms is not None and elapsed * 1000 >= threshold_ms:
+            slow_query_logger.warning('slow query', extra={'fields': {
+                'endpoint': endpoint,
+                'duration_ms': round(elapsed * 1000, 2),
+                'statement': statement[:1000],
+            }})
+
+    # The start time lives on the statement's execution context, so a
+    # statement that raises leaves nothing behind on the pooled connection
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.metrics_started = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, 'metrics_started', None)
+        if started is not None:
+            record_query(statement, started)
+
+    def handle_error(exception_context):
+        # Failed statements (e.g. an expected IntegrityError) count too
+        started = getattr(exception_context.execution_context, 'metrics_started', None)
+        if started is not None:
+            record_query(exception_context.statement or '', started)
+
+    with app.app_context():
+        for engine in app_engines(app):
+            event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+            event.listen(engine, 'handle_error', handle_error)
+
+
+def render_metrics():
+    """Return the current samples in Prometheus text format."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def register_metrics(app):
+    """
+    Time every request and its SQL, and serve the results at /metrics.
+    Does nothing when METRICS_ENABLED is off.
+    """
+    if not app.config['METRICS_ENABLED']:
+        return
+    _register_query_timing(app)
+
+    @app.before_request
+    def start_metrics():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_metrics(response):
+        started = g.pop('metrics_started', None)
+        if started is None or request.endpoint == 'metrics':
+            return response
+        endpoint = request.endpoint or 'unmatched'
+        REQUEST_LATENCY.labels(endpoint, request.method, str(response.status_code)).observe(
+            time.perf_counter() - started)
+        REQUEST_QUERIES.labels(endpoint).observe(g.get('db_queries', 0))
+        return response
+
+    app.add_url_rule('/metrics', 'metrics', render_metrics)
@@ -1,17 +1,21 @@
 from . import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from .passwords import get_hasher
 from datetime import datetime
 
 # Association table for the many-to-many relationship between Users and Leagues
 league_member_table = db.Table('league_member',
     db.Column('user_id', db.Integer, db.ForeignKey('user.id'), primary_key=True),
-    db.Column('league_id', db.Integer, db.ForeignKey('league.id'), primary_key=True)
+    db.Column('league_id', db.Integer, db.ForeignKey('league.id'), primary_key=True),
+    # The primary key serves lookups by user; member lists and counts go by league
+    db.Index('ix_league_member_league_id', 'league_id', 'user_id'),
 )
 
 # Association table for the many-to-many relationship between Teams and Players
 team_player_table = db.Table('team_player',
     db.Column('team_id', db.Integer, db.ForeignKey('team.id'), primary_key=True),
-    db.Column('player_id', db.Integer, db.ForeignKey('player.id'), primary_key=True)
+    db.Column('player_id', db.Integer, db.ForeignKey('player.id'), primary_key=True),
+    # The primary key serves squads; this finds the teams that own a player
+    db.Index('ix_team_player_player_id', 'player_id', 'team_id'),
 )
 
 class User(db.Model):
@@ -26,33 +30,49 @@ class User(db.Model):
     owned_leagues = db.relationship('League', back_populates='owner')
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = get_hasher().hash(password)
 
     def check_password(self, password):
-        # --- FINAL FIX ---
-        # First, check if a password hash exists at all.
-        # If it doesn't, this user can't log in with a password.
+        # Users who signed up with Google have no password hash
         if not self.password_hash:
             return False
-        # If it does exist, then check it.
-        return check_password_hash(self.password_hash, password)
+        return get_hasher().verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return bool(self.password_hash) and get_hasher().needs_rehash(self.password_hash)
 
 class Team(db.Model):
+    __table_args__ = (
+        # Standings read teams of one league ordered by points
+        db.Index('ix_team_league_id_total_points', 'league_id', 'total_points'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, unique=True)
     league_id = db.Column(db.Integer, db.ForeignKey('league.id'), nullable=True)
     budget_left = db.Column(db.Float, default=100.0)
+    # Sum of the squad's player points and number of players, maintained by
+    # app.squad and app.points
+    total_points = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    squad_size = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     user = db.relationship('User', back_populates='team')
     league = db.relationship('League', back_populates='teams')
     players = db.relationship('Player', secondary=team_player_table, back_populates='teams')
-    
-    @property
-    def total_points(self):
-        return sum(player.points for player in self.players)
 
 class Player(db.Model):
+    __table_args__ = (
+        # Keyset pagination of the /players catalogue: one index per sort key,
+        # with and without the equality filters, always ending in id
+        db.Index('ix_player_points_id', 'points', 'id'),
+        db.Index('ix_player_value_id', 'value', 'id'),
+        db.Index('ix_player_name_id', 'name', 'id'),
+        db.Index('ix_player_position_points_id', 'position', 'points', 'id'),
+        db.Index('ix_player_position_value_id', 'position', 'value', 'id'),
+        db.Index('ix_player_team_name_points_id', 'team_name', 'points', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     api_player_id = db.Column(db.Integer, unique=True, nullable=False)
     name = db.Column(db.String(100), nullable=False)
@@ -67,11 +87,91 @@ class Player(db.Model):
 class League(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    owner_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    owner_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     code = db.Column(db.String(8), unique=True, nullable=True, index=True)
     is_private = db.Column(db.Boolean, default=True)
     max_members = db.Column(db.Integer, default=12)
+    # Sum of total_points over the league's teams, maintained by app.points
+    total_points = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Rows in league_member for this league, maintained by the league routes
+    # and app.points
+    member_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     owner = db.relationship('User', back_populates='owned_leagues')
     users = db.relationship('User', secondary=league_member_table, back_populates='leagues')
     teams = db.relationship('Team', back_populates='league')
+
+# The public league listing: keyset pages in case-insensitive name order,
+# which also serve name-prefix searches as a range scan
+db.Index('ix_league_public_name', League.is_private, db.func.lower(League.name), League.id)
+
+
+class Gameweek(db.Model):
+    # One row per scored gameweek; the primary key makes re-scoring a no-op
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    players_scored = db.Column(db.Integer, nullable=False, default=0)
+    scored_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class PlayerGameweekPoints(db.Model):
+    # Append-only history of the points each player earned per gameweek
+    __tablename__ = 'player_gameweek_points'
+    __table_args__ = (
+        # Covering indexes: form/season totals scan by player, top scorers by gameweek
+        db.Index('ix_player_gameweek_points_player', 'player_id', 'gameweek', 'points'),
+        db.Index('ix_player_gameweek_points_top', 'gameweek', 'points', 'player_id'),
+    )
+
+    gameweek = db.Column(db.Integer, db.ForeignKey('gameweek.id'), primary_key=True)
+    player_id = db.Column(db.Integer, db.ForeignKey('player.id'), primary_key=True)
+    points = db.Column(db.Integer, nullable=False)
+
+
+class ResourceVersion(db.Model):
+    # Change counters behind the ETags of cacheable GET responses (see app.http_cache)
+    __tablename__ = 'resource_version'
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class Job(db.Model):
+    # Background work (player sync, gameweek scoring) run by app.jobs
+    __table_args__ = (
+        # Single flight: at most one queued or running job of each kind, across all workers
+        db.Index('uq_job_active_kind', 'kind', unique=True,
+                 sqlite_where=db.text("status IN ('queued', 'running')"),
+                 postgresql_where=db.text("status IN ('queued', 'running')")),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default='queued')
+    params = db.Column(db.JSON, nullable=True)
+    pages_done = db.Column(db.Integer, nullable=False, default=0)
+    pages_total = db.Column(db.Integer, nullable=True)
+    rows_written = db.Column(db.Integer, nullable=False, default=0)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    # Doubles as a heartbeat: every progress update touches it
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'params': self.params,
+            'pages_done': self.pages_done,
+            'pages_total': self.pages_total,
+            'rows_written': self.rows_written,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
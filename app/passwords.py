@@ -0,0 +1,166 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Password hashing is deliberately slow, so it runs on a small per-process
+# pool instead of on whichever request thread asked for it. bcrypt and
+# hashlib's scrypt/pbkdf2 release the GIL, so the pool hashes in parallel,
+# but never with more threads than PASSWORD_HASH_WORKERS; callers beyond
+# PASSWORD_HASH_MAX_PENDING are turned away instead of queueing behind them.
+#
+# Costs per scheme: bcrypt log2 rounds, pbkdf2 iterations, scrypt log2 N.
+DEFAULT_COSTS = {'bcrypt': 12, 'pbkdf2': 600000, 'scrypt': 15}
+MAX_BCRYPT_PASSWORD_BYTES = 72
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashes are already pending on this worker."""
+
+
+def _werkzeug_method(scheme, cost):
+    if scheme == 'pbkdf2':
+        return f'pbkdf2:sha256:{cost}'
+    return f'scrypt:{2 ** cost}:8:1'
+
+
+def hash_password(password, scheme, cost=None):
+    """
+    Hash a password with the given scheme, synchronously.
+    Args:
+        password (str): Plain-text password.
+        scheme (str): 'bcrypt', 'pbkdf2' or 'scrypt'.
+        cost (int): Scheme-specific work factor (default: DEFAULT_COSTS).
+    Returns:
+        str: Self-describing hash string.
+    """
+    if scheme not in DEFAULT_COSTS:
+        raise ValueError(f'Unknown password scheme: {scheme}')
+    cost = cost or DEFAULT_COSTS[scheme]
+    if scheme == 'bcrypt':
+        # bcrypt ignores bytes past 72; refuse rather than silently truncate
+        password_bytes = password.encode()
+        if len(password_bytes) > MAX_BCRYPT_PASSWORD_BYTES:
+            raise ValueError('Password is too long.')
+        return bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=cost)).decode()
+    return generate_password_hash(password, method=_werkzeug_method(scheme, cost))
+
+
+def verify_password(password_hash, password):
+    """
+    Check a password against a hash made by any supported scheme, synchronously.
+    Returns:
+        bool: True if the password matches.
+    """
+    if not password_hash:
+        return False
+    if password_hash.startswith('$2'):
+        password_bytes = password.encode()
+        if len(password_bytes) > MAX_BCRYPT_PASSWORD_BYTES:
+            return False
+        return bcrypt.checkpw(password_bytes, password_hash.encode())
+    return check_password_hash(password_hash, password)
+
+
+def hash_parameters(password_hash):
+    """
+    Read the scheme and cost a hash was made with.
+    Returns:
+        tuple: (scheme, cost), or (None, None) for an unrecognised hash.
+    """
+    try:
+        if password_hash.startswith('$2'):
+            return 'bcrypt', int(password_hash.split('$')[2])
+        method = password_hash.split('$', 1)[0].split(':')
+        if method[0] == 'pbkdf2':
+            return 'pbkdf2', int(method[2])
+        if method[0] == 'scrypt':
+            return 'scrypt', int(method[1]).bit_length() - 1
+    except (IndexError, ValueError):
+        pass
+    return None, None
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a bounded pool using the app's configured scheme."""
+
+    def __init__(self, scheme, cost=None, workers=2, max_pending=8, wait_seconds=5.0):
+        if scheme not in DEFAULT_COSTS:
+            raise ValueError(f'Unknown password scheme: {scheme}')
+        self.scheme = scheme
+        self.cost = cost or DEFAULT_COSTS[scheme]
+        self.wait_seconds = wait_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password')
+        self._pending = threading.BoundedSemaphore(max_pending)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            scheme=config['PASSWORD_SCHEME'],
+            cost=config['PASSWORD_COST'],
+            workers=config['PASSWORD_HASH_WORKERS'],
+            max_pending=config['PASSWORD_HASH_MAX_PENDING'],
+            wait_seconds=config['PASSWORD_HASH_WAIT_SECONDS'],
+        )
+
+    def _run(self, func, *args):
+        if not self._pending.acquire(timeout=self.wait_seconds):
+            raise PasswordHasherBusy('Too many password checks in progress')
+        try:
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._pending.release()
+
+    def hash(self, password):
+        return self._run(hash_password, password, self.scheme, self.cost)
+
+    def verify(self, password_hash, password):
+        if not password_hash:
+            return False
+        return self._run(verify_password, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with a different scheme or cost than configured."""
+        return hash_parameters(password_hash) != (self.scheme, self.cost)
+
+
+def get_hasher():
+    """Return this app's PasswordHasher, creating it on first use."""
+    app = current_app._get_current_object()
+    hasher = app.extensions.get('password_hasher')
+    if hasher is None:
+        hasher = app.extensions.setdefault('password_hasher', PasswordHasher.from_config(app.config))
+    return hasher
+
+
+def benchmark(scheme, target_ms, password='correct horse battery staple'):
+    """
+    Time hashes at increasing cost and pick the highest cost within the target.
+    Args:
+        scheme (str): Scheme to tune.
+        target_ms (float): Acceptable time for one hash, in milliseconds.
+    Returns:
+        tuple: (chosen cost, [(cost, milliseconds), ...] for every cost tried).
+    """
+    if scheme == 'bcrypt':
+        costs = iter(range(4, 32))
+    elif scheme == 'scrypt':
+        costs = iter(range(10, 24))
+    elif scheme == 'pbkdf2':
+        costs = (10000 * 2 ** i for i in range(20))
+    else:
+        raise ValueError(f'Unknown password scheme: {scheme}')
+
+    timings = []
+    chosen = None
+    for cost in costs:
+        started = time.perf_counter()
+        hash_password(password, scheme, cost)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        timings.append((cost, elapsed_ms))
+        if elapsed_ms > target_ms:
+            break
+        chosen = cost
+    return chosen if chosen is not None else timings[0][0], timings
@@ -0,0 +1,87 @@
+from sqlalchemy import func, select, update
+from . import db
+from .models import Team, League, Player, league_member_table, team_player_table
+
+# Team.total_points and League.total_points are stored sums so standings can be
+# read with an indexed ORDER BY. Drafts and removals adjust them in app.squad;
+# scoring and league moves recompute them with the helpers below.
+# League.member_count is kept by the league routes; rebuild_member_counts
+# only repairs it.
+
+
+def _team_points_subquery():
+    return (
+        select(func.coalesce(func.sum(Player.points), 0))
+        .select_from(team_player_table.join(Player, Player.id == team_player_table.c.player_id))
+        .where(team_player_table.c.team_id == Team.id)
+        .scalar_subquery()
+    )
+
+
+def _squad_size_subquery():
+    return (
+        select(func.count())
+        .select_from(team_player_table)
+        .where(team_player_table.c.team_id == Team.id)
+        .scalar_subquery()
+    )
+
+
+def _member_count_subquery():
+    return (
+        select(func.count())
+        .select_from(league_member_table)
+        .where(league_member_table.c.league_id == League.id)
+        .scalar_subquery()
+    )
+
+
+def _league_points_subquery():
+    return (
+        select(func.coalesce(func.sum(Team.total_points), 0))
+        .where(Team.league_id == League.id)
+        .scalar_subquery()
+    )
+
+
+def refresh_league_points(league_ids=None):
+    """
+    Recompute League.total_points from the stored team totals.
+    Args:
+        league_ids (iterable): Leagues to refresh (default: all leagues).
+    """
+    db.session.flush()
+    stmt = update(League).values(total_points=_league_points_subquery())
+    if league_ids is not None:
+        league_ids = [league_id for league_id in set(league_ids) if league_id]
+        if not league_ids:
+            return
+        stmt = stmt.where(League.id.in_(league_ids))
+    db.session.execute(stmt.execution_options(synchronize_session=False))
+    db.session.expire_all()
+
+
+def rebuild_points():
+    """
+    Recompute every team's points and squad size and every league total from
+    the squads, in two set-based UPDATE statements.
+    """
+    db.session.flush()
+    db.session.execute(
+        update(Team).values(total_points=_team_points_subquery(), squad_size=_squad_size_subquery())
+        .execution_options(synchronize_session=False)
+    )
+    refresh_league_points()
+
+
+def rebuild_member_counts():
+    """
+    Recount League.member_count from league_member in one UPDATE. Joins and
+    leaves keep it current; this repairs drift from manual edits.
+    """
+    db.session.flush()
+    db.session.execute(
+        update(League).values(member_count=_member_count_subquery())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.expire_all()
@@ -0,0 +1,105 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, request
+
+# Everything logged under the 'app' logger (Flask's app.logger and the
+# module loggers in this package) goes through a QueueHandler, so a request
+# thread only appends to an in-memory queue; a single listener thread per
+# process formats the records as JSON lines and writes them to stdout.
+SENSITIVE_HEADERS = {'authorization', 'cookie', 'set-cookie', 'proxy-authorization', 'x-apisports-key'}
+REDACTED = '[redacted]'
+
+_listener = None
+_handler = None
+_sampler = random.Random()
+
+logger = logging.getLogger('app.request')
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any `fields` extra."""
+
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def redact_headers(headers):
+    """
+    Copy request headers with credentials masked.
+    Args:
+        headers (Headers): Incoming request headers.
+    Returns:
+        dict: Header name -> value, with SENSITIVE_HEADERS replaced.
+    """
+    return {name: REDACTED if name.lower() in SENSITIVE_HEADERS else value for name, value in headers.items()}
+
+
+def _start_listener(stream):
+    global _listener, _handler
+    if _listener is None:
+        log_queue = queue.SimpleQueue()
+        output = logging.StreamHandler(stream)
+        output.setFormatter(JsonFormatter())
+        _listener = QueueListener(log_queue, output, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_listener.stop)
+        _handler = QueueHandler(log_queue)
+    return _handler
+
+
+def register_request_logging(app):
+    """
+    Log one structured line per request (method, path, status, duration).
+    Requests to endpoints in LOG_SAMPLE_RATES are logged at that rate, except
+    errors and requests slower than LOG_SLOW_REQUEST_MS, which are always logged.
+    """
+    handler = _start_listener(sys.stdout)
+    package_logger = logging.getLogger('app')
+    if handler not in package_logger.handlers:
+        package_logger.addHandler(handler)
+    package_logger.setLevel(app.config['LOG_LEVEL'])
+    package_logger.propagate = False
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        started = g.pop('request_started', None)
+        if started is None or not logger.isEnabledFor(logging.INFO):
+            return response
+        duration_ms = (time.perf_counter() - started) * 1000
+        rate = app.config['LOG_SAMPLE_RATES'].get(request.endpoint, 1.0)
+        if (rate < 1.0 and response.status_code < 500 and duration_ms < app.config['LOG_SLOW_REQUEST_MS']
+                and _sampler.random() >= rate):
+            return response
+
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 2),
+        }
+        if rate < 1.0:
+            fields['sample_rate'] = rate
+        if app.config['LOG_REQUEST_HEADERS']:
+            fields['headers'] = redact_headers(request.headers)
+        logger.info('request', extra={'fields': fields})
+        return response
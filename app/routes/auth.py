@@ -1,9 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from .. import db
 from ..models import User, Team
+from ..passwords import PasswordHasherBusy
 from flask_cors import cross_origin, CORS
 
 bp = Blueprint('auth', __name__, url_prefix='/auth')
@@ -14,6 +13,11 @@ CORS(bp, resources={r"/auth/*": {"origins": [
     "https://jade-griffin-db7ea0.netlify.app"
 ], "supports_credentials": True}})
 
+def _busy_response():
+    response = jsonify({'message': 'Server busy, please try again shortly.'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 @bp.route('/register', methods=['POST'])
 @cross_origin(origins=['http://localhost:5173', 'https://jade-griffin-db7ea0.netlify.app'], supports_credentials=True)
 def register():
@@ -37,6 +41,8 @@ def register():
         description: User registered successfully.
       400:
         description: Invalid input or user already exists.
+      503:
+        description: Too many sign-ups in progress; retry shortly.
     """
     data = request.get_json()
     username = data.get('username')
@@ -50,7 +56,12 @@ def register():
         return jsonify({'message': 'User with that email or username already exists'}), 400
 
     user = User(username=username, email=email)
-    user.set_password(password)
+    try:
+        user.set_password(password)
+    except PasswordHasherBusy:
+        return _busy_response()
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     db.session.add(user)
     db.session.flush()
 
@@ -83,6 +94,8 @@ def login():
         description: Login successful.
       401:
         description: Invalid credentials.
+      503:
+        description: Too many logins in progress; retry shortly.
     """
     data = request.get_json()
     email = data.get('email')
@@ -93,7 +106,21 @@ def login():
 
     user = User.query.filter_by(email=email).first()
 
-    if user and user.check_password(password):
+    try:
+        valid = user is not None and user.check_password(password)
+        if valid and user.password_needs_rehash():
+            # Move the hash to the configured scheme and cost while we have the password
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except ValueError:
+                # The configured scheme can't take this password (bcrypt stops
+                # at 72 bytes); the old hash still verifies, so keep it
+                db.session.rollback()
+    except PasswordHasherBusy:
+        return _busy_response()
+
+    if valid:
         access_token = create_access_token(identity=user.id)
         return jsonify(access_token=access_token, username=user.username), 200
 
@@ -129,27 +156,22 @@ def google_login():
     if not token:
         return jsonify({'message': 'Missing Google ID token'}), 400
 
+    # Imported here: google-auth is slow to import and most requests never need it
+    from ..google_auth import next_free_username, verify_google_token
+
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token,
-            requests.Request(),
-            '390480519666-5d2b8en0e3slv374hhm696mrtq0l4l0e.apps.googleusercontent.com'
-        )
+        idinfo = verify_google_token(token)
         google_id = idinfo['sub']
         email = idinfo['email']
-        base_username = idinfo.get('name', email.split('@')[0]).replace(" ", "_")
 
-        # Handle duplicate username
-        username = base_username
-        counter = 1
-        while User.query.filter_by(username=username).first():
-            username = f"{base_username}{counter}"
-            counter += 1
-
-        user = User.query.filter_by(google_id=google_id).first()
+        # One query finds both a returning Google user and an email clash
+        matches = User.query.filter((User.google_id == google_id) | (User.email == email)).all()
+        user = next((match for match in matches if match.google_id == google_id), None)
         if not user:
-            if User.query.filter_by(email=email).first():
+            if matches:
                 return jsonify({'message': f'An account with the email {email} already exists. Please log in with your existing credentials or use a different email.'}), 400
+            base_username = idinfo.get('name', email.split('@')[0]).replace(" ", "_")
+            username = next_free_username(base_username)
             user = User(username=username, email=email, google_id=google_id)
             db.session.add(user)
             db.session.flush()
@@ -157,10 +179,6 @@ def google_login():
             default_team = Team(name=f"{username}'s Team", user_id=user.id)
             db.session.add(default_team)
             db.session.commit()
-        else:
-            if user.username != username:
-                user.username = username
-                db.session.commit()
 
         access_token = create_access_token(identity=user.id)
         return jsonify({'access_token': access_token, 'username': user.username}), 200
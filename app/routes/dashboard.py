@@ -1,79 +1,66 @@
-from flask import Blueprint, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+import threading
+from cachetools import TTLCache
+from flask import Blueprint, current_app, jsonify
+from flask_jwt_extended import jwt_required, current_user
+from sqlalchemy import func, select
 from .. import db
-from ..models import User, Team
+from ..http_cache import CATALOGUE, current_versions, league_key, team_key
+from ..identity import forget_identity
+from ..models import Team, Player, team_player_table
+from ..standings import league_standings
 
 bp = Blueprint('dashboard', __name__, url_prefix='/dashboard')
 
-@bp.route('', methods=['GET'])  # Matches /dashboard/
-@jwt_required()
-def get_dashboard_data():
-    """
-    Get all aggregated data for the logged-in user's dashboard.
-    ---
-    tags: [Dashboard]
-    responses:
-      200:
-        description: Aggregated dashboard data.
-      404:
-        description: User or team not found.
-    """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)  # Avoid get_or_404 to handle gracefully
+# Per-app cache of user_id -> (snapshot key, payload). The key holds the
+# caller's identity and the team/league/catalogue versions, so a draft, a league
+# change or a scored gameweek misses the cache on every worker; the TTL bounds
+# memory and age.
+_snapshots_lock = threading.Lock()
 
-    if not user:
-        return jsonify({'message': 'User not found'}), 404
+def _snapshot_cache():
+    with _snapshots_lock:
+        cache = current_app.extensions.get('dashboard_snapshots')
+        if cache is None:
+            cache = TTLCache(maxsize=current_app.config['DASHBOARD_CACHE_SIZE'],
+                             ttl=current_app.config['DASHBOARD_CACHE_TTL'])
+            current_app.extensions['dashboard_snapshots'] = cache
+        return cache
 
-    team = getattr(user, 'team', None)  # Safely get team, handle None
+def _top_performers(team_id):
+    # Top 3 of the squad plus the squad size in one query
+    squad_size = func.count().over().label('squad_size')
+    rows = db.session.execute(
+        select(Player.name, Player.points, Player.position, Player.photo_url, squad_size)
+        .join(team_player_table, team_player_table.c.player_id == Player.id)
+        .where(team_player_table.c.team_id == team_id)
+        .order_by(Player.points.desc(), Player.id)
+        .limit(3)
+    ).all()
+    top_performers = [{
+        'name': row.name,
+        'points': row.points,
+        'position': row.position,
+        'photo': row.photo_url or 'https://via.placeholder.com/40'
+    } for row in rows]
+    return top_performers, rows[0].squad_size if rows else 0
 
-    if not team:
-        return jsonify({'message': 'No team found for this user'}), 404
-
-    # 1. Get League Standings Snippet
+def _build_dashboard(team):
+    # 1. Get League Standings Snippet (top 2 plus the user's own row, ranked in SQL)
     league_standings_snippet = []
     rank = 'N/A'
-    league = getattr(team, 'league', None)
-    if league and league.teams:
-        all_teams_in_league = sorted(league.teams, key=lambda t: getattr(t, 'total_points', 0), reverse=True)
-        try:
-            user_rank_index = all_teams_in_league.index(team)
-            rank = user_rank_index + 1
-            
-            # Get top 2 teams
-            top_two = all_teams_in_league[:2]
-            
-            # Add top teams to snippet
-            for i, t in enumerate(top_two):
-                league_standings_snippet.append({
-                    'rank': i + 1,
-                    'team_name': getattr(t, 'name', 'Unknown Team'),
-                    'owner_name': getattr(t.user, 'username', 'Unknown Owner'),
-                    'points': getattr(t, 'total_points', 0)
-                })
-            
-            # Add user's team to snippet if they are not in the top 2
-            if user_rank_index > 1:
-                league_standings_snippet.append({
-                    'rank': rank,
-                    'team_name': team.name,
-                    'owner_name': user.username,
-                    'points': getattr(team, 'total_points', 0)
-                })
-
-        except ValueError:
-            rank = 'N/A'
+    if team.league_id:
+        for row in league_standings(team.league_id, limit=2, team_id=team.team_id):
+            if row['team_id'] == team.team_id:
+                rank = row['rank']
+            league_standings_snippet.append({
+                'rank': row['rank'],
+                'team_name': row['team_name'],
+                'owner_name': row['owner_name'],
+                'points': row['points']
+            })
 
     # 2. Get Top 3 Performing Players
-    players = getattr(team, 'players', [])
-    top_performers = [
-        {
-            'name': getattr(p, 'name', 'Unknown Player'),
-            'points': getattr(p, 'points', 0),
-            'position': getattr(p, 'position', 'Unknown'),
-            'photo': getattr(p, 'photo_url', 'https://via.placeholder.com/40')
-        }
-        for p in sorted(players, key=lambda p: getattr(p, 'points', 0), reverse=True)[:3]
-    ]
+    top_performers, squad_size = _top_performers(team.team_id)
 
     # 3. Simulate Upcoming Match Data
     upcoming_match = {
@@ -82,15 +69,59 @@ def get_dashboard_data():
     }
 
     # --- Final Dashboard Payload ---
-    dashboard_data = {
-        'team_name': getattr(team, 'name', 'No Team'),
-        'total_points': getattr(team, 'total_points', 0),
+    return {
+        'team_name': team.name,
+        'total_points': team.total_points,
         'league_rank': rank,
-        'team_budget': getattr(team, 'budget_left', 100.0),
-        'squad_size': len(players),
+        'team_budget': team.budget_left,
+        'squad_size': squad_size,
         'top_performers': top_performers,
         'league_standings_snippet': league_standings_snippet,
         'upcoming_match': upcoming_match
     }
 
-    return jsonify(dashboard_data), 200
\ No newline at end of file
+@bp.route('', methods=['GET'])  # Matches /dashboard/
+@jwt_required()
+def get_dashboard_data():
+    """
+    Get all aggregated data for the logged-in user's dashboard.
+    Built from at most four queries and cached per user until their team,
+    their league or the gameweek changes; a cached dashboard costs one query.
+    ---
+    tags: [Dashboard]
+    responses:
+      200:
+        description: Aggregated dashboard data.
+      404:
+        description: User or team not found.
+    """
+    identity = current_user
+    if identity.team_id is None:
+        return jsonify({'message': 'No team found for this user'}), 404
+
+    names = [team_key(identity.team_id), CATALOGUE]
+    if identity.league_id:
+        names.append(league_key(identity.league_id))
+    versions = current_versions(names)
+    key = (identity, tuple(versions[name][0] for name in names))
+
+    cache = _snapshot_cache()
+    with _snapshots_lock:
+        cached = cache.get(identity.user_id)
+    if cached and cached[0] == key:
+        return jsonify(cached[1]), 200
+
+    team = db.session.execute(
+        select(Team.id.label('team_id'), Team.name, Team.budget_left, Team.total_points, Team.league_id)
+        .where(Team.id == identity.team_id)
+    ).first()
+    if not team or team.league_id != identity.league_id:
+        # Changed by another worker since the identity was cached
+        forget_identity(identity.user_id)
+        if not team:
+            return jsonify({'message': 'No team found for this user'}), 404
+
+    dashboard_data = _build_dashboard(team)
+    with _snapshots_lock:
+        cache[identity.user_id] = (key, dashboard_data)
+    return jsonify(dashboard_data), 200
@@ -0,0 +1,23 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+from ..database import use_primary
+from ..models import Job
+
+bp = Blueprint('jobs', __name__, url_prefix='/jobs')
+
+@bp.route('/<int:job_id>', methods=['GET'])
+@use_primary  # Polled right after the job is enqueued, so replica lag would hide it
+@jwt_required()
+def get_job(job_id):
+    """
+    Get the status and progress of a background job.
+    ---
+    tags: [Jobs]
+    responses:
+      200:
+        description: Job status, progress (pages done, rows written) and result.
+      404:
+        description: Job not found.
+    """
+    job = Job.query.get_or_404(job_id)
+    return jsonify(job.to_dict()), 200
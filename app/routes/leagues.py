@@ -1,62 +1,163 @@
+import string
+import sys
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from .. import db
-from ..models import League, User, Team
+from ..identity import forget_identity
+from ..models import League, Team, league_member_table
+from ..points import refresh_league_points
+from ..standings import league_standings, user_league_ranks, RANKING_FUNCTIONS
+from ..http_cache import CATALOGUE, PUBLIC_LEAGUES, bump_versions, cached_by, league_key, team_key
+from ..utils import encode_cursor, decode_cursor
 import uuid
-from sqlalchemy.orm import joinedload
 
 bp = Blueprint('leagues', __name__, url_prefix='/leagues')
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
 def generate_league_code():
     return str(uuid.uuid4()).upper()[:8]
 
+def _move_team(league_id):
+    """
+    Point the caller's team at a league (or at none).
+    Returns:
+        int: The league the team was in before, if any.
+    """
+    if not current_user.team_id:
+        return None
+    team = db.session.get(Team, current_user.team_id)
+    previous_league_id = team.league_id
+    team.league_id = league_id
+    refresh_league_points([previous_league_id, league_id])
+    return previous_league_id
+
+def _is_member(user_id, league_id):
+    return db.session.scalar(
+        select(league_member_table.c.league_id)
+        .where(league_member_table.c.user_id == user_id, league_member_table.c.league_id == league_id)
+    ) is not None
+
 @bp.route('/my-leagues', methods=['GET'])
 @jwt_required()
 def get_my_leagues():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    leagues_data = []
-    for league in user.leagues:
-        all_teams_in_league = sorted(league.teams, key=lambda t: t.total_points, reverse=True)
-        user_team = next((t for t in all_teams_in_league if t.user_id == user_id), None)
-        rank = (all_teams_in_league.index(user_team) + 1) if user_team else 'N/A'
+    user_id = current_user.user_id
+    return jsonify([{
+        'id': row['league_id'],
+        'name': row['name'],
+        'members': row['member_count'],
+        'maxMembers': row['max_members'],
+        'code': row['code'],
+        'rank': row['rank'] if row['rank'] is not None else 'N/A',
+        'points': row['points'] or 0,
+        'isOwner': row['owner_id'] == user_id
+    } for row in user_league_ranks(user_id, current_user.team_id)]), 200
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
 
-        leagues_data.append({
-            'id': league.id,
-            'name': league.name,
-            'members': len(league.users),
-            'maxMembers': league.max_members,
-            'code': league.code,
-            'rank': rank,
-            'points': user_team.total_points if user_team else 0,
-            'isOwner': league.owner_id == user_id
-        })
-        
-    return jsonify(leagues_data), 200
+
+def _fold_case(text):
+    """Lowercase text the way the database's lower() does; SQLite's only folds ASCII."""
+    if db.engine.dialect.name == 'sqlite':
+        return text.translate(_ASCII_LOWER)
+    return text.lower()
+
+
+def _prefix_upper_bound(prefix):
+    """
+    The smallest string above every string that starts with prefix.
+    Returns:
+        str: The bound, or None when no string is above them all.
+    """
+    stripped = prefix.rstrip(chr(sys.maxunicode))
+    if not stripped:
+        return None
+    code = ord(stripped[-1]) + 1
+    if 0xD800 <= code <= 0xDFFF:
+        code = 0xE000  # Surrogates cannot be encoded
+    return stripped[:-1] + chr(code)
 
 @bp.route('/public', methods=['GET'])
 @jwt_required()
+@cached_by(PUBLIC_LEAGUES)
 def get_public_leagues():
-    leagues = League.query.filter_by(is_private=False).all()
-    return jsonify([{
-        'id': league.id,
-        'name': league.name,
-        'members': f"{len(league.users)}/{league.max_members}",
-        'prize': 'Bragging Rights'
-    } for league in leagues]), 200
+    """
+    Get a page of public leagues in name order.
+    Pages are keyset paginated: pass the returned next_cursor to get the next page.
+    ---
+    tags: [Leagues]
+    parameters:
+      - {in: query, name: q, type: string, description: "League name prefix, case-insensitive (on SQLite, for ASCII letters only)."}
+      - {in: query, name: open, type: boolean, description: Only leagues with a free slot.}
+      - {in: query, name: limit, type: integer, default: 20}
+      - {in: query, name: cursor, type: string}
+    responses:
+      200:
+        description: A page of leagues and the cursor of the next page (null on the last page).
+      400:
+        description: Invalid limit or cursor.
+    """
+    args = request.args
+    limit = args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'message': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+
+    # Walks ix_league_public_name: is_private, then lower(name), then id
+    sort_name = func.lower(League.name)
+    query = League.query.filter(League.is_private.is_(False))
+    prefix = _fold_case(args.get('q', '').strip())
+    if prefix:
+        # A range rather than LIKE, so the index serves it on every backend
+        query = query.filter(sort_name >= prefix)
+        upper = _prefix_upper_bound(prefix)
+        if upper is not None:
+            query = query.filter(sort_name < upper)
+    if args.get('open', '').lower() in ('1', 'true'):
+        query = query.filter(League.member_count < League.max_members)
+    if args.get('cursor'):
+        try:
+            after = tuple(decode_cursor(args['cursor'], (str, int)))
+        except ValueError:
+            return jsonify({'message': 'Invalid cursor'}), 400
+        query = query.filter(tuple_(sort_name, League.id) > after)
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.add_columns(sort_name).order_by(sort_name, League.id).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, last_sort_name = rows[-1]
+        next_cursor = encode_cursor([last_sort_name, last.id])
+    leagues = [league for league, _ in rows]
+
+    return jsonify({
+        'leagues': [{
+            'id': league.id,
+            'name': league.name,
+            'members': f"{league.member_count}/{league.max_members}",
+            'prize': 'Bragging Rights'
+        } for league in leagues],
+        'next_cursor': next_cursor
+    }), 200
 
 @bp.route('/<int:league_id>', methods=['GET'])
 @jwt_required()
+@cached_by(lambda league_id: league_key(league_id), CATALOGUE)
 def get_league_details(league_id):
-    league = League.query.options(joinedload(League.teams).joinedload(Team.user)).get_or_404(league_id)
-    standings_data = sorted(league.teams, key=lambda t: t.total_points, reverse=True)
+    ranking = request.args.get('ranking', 'standard')
+    if ranking not in RANKING_FUNCTIONS:
+        return jsonify({'message': f"ranking must be one of: {', '.join(RANKING_FUNCTIONS)}"}), 400
+
+    league = League.query.get_or_404(league_id)
     standings_response = [{
-        'rank': i + 1,
-        'team_name': team.name,
-        'owner_name': team.user.username,
-        'points': team.total_points
-    } for i, team in enumerate(standings_data)]
+        'rank': row['rank'],
+        'team_name': row['team_name'],
+        'owner_name': row['owner_name'],
+        'points': row['points']
+    } for row in league_standings(league.id, ranking=ranking)]
     
     return jsonify({
         'id': league.id,
@@ -68,22 +169,22 @@ def get_league_details(league_id):
 @bp.route('/create', methods=['POST'])
 @jwt_required()
 def create_league():
-    user_id = get_jwt_identity()
+    user_id = current_user.user_id
     data = request.get_json()
     name = data.get('name')
     if not name:
         return jsonify({'message': 'League name is required'}), 400
 
-    new_league = League(name=name, owner_id=user_id, code=generate_league_code())
-    user = User.query.get(user_id)
-    user.leagues.append(new_league)
-    
-    team = Team.query.filter_by(user_id=user_id).first()
-    if team:
-        team.league_id = new_league.id
-
+    new_league = League(name=name, owner_id=user_id, code=generate_league_code(), member_count=1)
     db.session.add(new_league)
+    db.session.flush()  # Assigns new_league.id before the team points at it
+    db.session.execute(league_member_table.insert().values(user_id=user_id, league_id=new_league.id))
+
+    previous_league_id = _move_team(new_league.id)
+    bump_versions(PUBLIC_LEAGUES, league_key(new_league.id), previous_league_id and league_key(previous_league_id),
+                  current_user.team_id and team_key(current_user.team_id))
     db.session.commit()
+    forget_identity(user_id)
     
     return jsonify({
         'message': f"League '{name}' created successfully.",
@@ -94,7 +195,7 @@ def create_league():
 @bp.route('/join', methods=['POST'])
 @jwt_required()
 def join_league():
-    user_id = get_jwt_identity()
+    user_id = current_user.user_id
     data = request.get_json()
     code = data.get('code')
     if not code:
@@ -104,56 +205,78 @@ def join_league():
     if not league:
         return jsonify({'message': 'Invalid league code'}), 404
 
-    user = User.query.get(user_id)
-    if league in user.leagues:
+    if _is_member(user_id, league.id):
         return jsonify({'message': 'You are already in this league'}), 400
 
-    if len(league.users) >= league.max_members:
+    # Claim a slot with a conditional increment, so concurrent joins cannot
+    # overfill the league
+    claimed = db.session.execute(
+        update(League)
+        .where(League.id == league.id, League.member_count < League.max_members)
+        .values(member_count=League.member_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount == 0:
         return jsonify({'message': 'This league is full'}), 400
+    try:
+        db.session.execute(league_member_table.insert().values(user_id=user_id, league_id=league.id))
+    except IntegrityError:
+        # A concurrent request joined first; undo the claimed slot
+        db.session.rollback()
+        return jsonify({'message': 'You are already in this league'}), 400
 
-    user.leagues.append(league)
-    
-    team = Team.query.filter_by(user_id=user_id).first()
-    if team:
-        team.league_id = league.id
-        
+    previous_league_id = _move_team(league.id)
+    bump_versions(PUBLIC_LEAGUES, league_key(league.id), previous_league_id and league_key(previous_league_id),
+                  current_user.team_id and team_key(current_user.team_id))
     db.session.commit()
+    forget_identity(user_id)
     return jsonify({'message': f'Successfully joined {league.name}'}), 200
 
 @bp.route('/<int:league_id>/leave', methods=['POST'])
 @jwt_required()
 def leave_league(league_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.user_id
     league = League.query.get_or_404(league_id)
-    user = User.query.get(user_id)
 
     if league.owner_id == user_id:
         return jsonify({'message': 'Owners cannot leave a league. You must delete it instead.'}), 403
 
-    if league not in user.leagues:
+    left = db.session.execute(
+        league_member_table.delete().where(league_member_table.c.user_id == user_id,
+                                           league_member_table.c.league_id == league_id)
+    )
+    if left.rowcount == 0:
         return jsonify({'message': 'You are not a member of this league.'}), 400
+    db.session.execute(
+        update(League).where(League.id == league_id).values(member_count=League.member_count - 1)
+        .execution_options(synchronize_session=False)
+    )
 
-    user.leagues.remove(league)
-    
-    team = Team.query.filter_by(user_id=user_id).first()
+    team = db.session.get(Team, current_user.team_id) if current_user.team_id else None
     if team and team.league_id == league_id:
         team.league_id = None
+        refresh_league_points([league_id])
 
+    bump_versions(PUBLIC_LEAGUES, league_key(league_id), team and team_key(team.id))
     db.session.commit()
+    forget_identity(user_id)
     return jsonify({'message': f'You have successfully left {league.name}.'}), 200
 
 @bp.route('/<int:league_id>', methods=['DELETE'])
 @jwt_required()
 def delete_league(league_id):
-    user_id = get_jwt_identity()
+    user_id = current_user.user_id
     league = League.query.get_or_404(league_id)
 
     if league.owner_id != user_id:
         return jsonify({'message': 'Only the league owner can delete this league.'}), 403
 
+    moved = [(team.id, team.user_id) for team in league.teams]
     for team in league.teams:
         team.league_id = None
     
     db.session.delete(league)
+    bump_versions(PUBLIC_LEAGUES, league_key(league_id), *(team_key(team_id) for team_id, _ in moved))
     db.session.commit()
-    return jsonify({'message': f'League "{league.name}" has been deleted.'}), 200
\ No newline at end of file
+    forget_identity(*(member_id for _, member_id in moved))
+    return jsonify({'message': f'League "{league.name}" has been deleted.'}), 200
@@ -1,107 +1,139 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
-from .. import db
+from flask import Blueprint, current_app, jsonify, request, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..models import Player
-import requests
-import os
-import random
+from ..utils import encode_cursor, decode_cursor
+from ..http_cache import CATALOGUE, cached_by
+from ..jobs import JobAlreadyRunning, enqueue
+from sqlalchemy import tuple_
 
 bp = Blueprint('players', __name__, url_prefix='/players')
 
+# Sortable catalogue columns; each has a composite index ending in Player.id
+SORT_COLUMNS = {
+    'points': Player.points,
+    'value': Player.value,
+    'name': Player.name,
+}
+# What each sort key decodes to from a cursor; JSON may turn a whole-number value into an int
+SORT_TYPES = {'points': int, 'value': (int, float), 'name': str}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def serialize_player(p):
+    return {
+        'id': p.id,
+        'name': p.name,
+        'team': p.team_name,
+        'position': p.position,
+        'value': p.value,
+        'points': p.points,
+        'photo': p.photo_url
+    }
+
 @bp.route('', methods=['GET'])
 @jwt_required()
+@cached_by(CATALOGUE)
 def get_players():
     """
-    Get a list of all available players for drafting.
+    Get a page of available players for drafting.
+    Pages are keyset paginated: pass the returned next_cursor to get the next page.
     ---
     tags: [Players]
+    parameters:
+      - {in: query, name: position, type: string}
+      - {in: query, name: club, type: string, description: Player's club (team_name).}
+      - {in: query, name: min_value, type: number}
+      - {in: query, name: max_value, type: number}
+      - {in: query, name: min_points, type: integer}
+      - {in: query, name: sort, type: string, enum: [points, value, name], default: points}
+      - {in: query, name: order, type: string, enum: [asc, desc], description: Defaults to asc for name, desc otherwise.}
+      - {in: query, name: limit, type: integer, default: 50}
+      - {in: query, name: cursor, type: string}
     responses:
       200:
-        description: A list of players.
+        description: A page of players and the cursor of the next page (null on the last page).
+      400:
+        description: Invalid filter, sort or cursor.
     """
-    players = Player.query.all()
-    return jsonify([{
-        'id': p.id,
-        'name': p.name,
-        'team': p.team_name,
-        'position': p.position,
-        'value': p.value,
-        'points': p.points,
-        'photo': p.photo_url
-    } for p in players]), 200
+    args = request.args
+    sort = args.get('sort', 'points')
+    if sort not in SORT_COLUMNS:
+        return jsonify({'message': f"sort must be one of: {', '.join(SORT_COLUMNS)}"}), 400
+    order = args.get('order', 'asc' if sort == 'name' else 'desc')
+    if order not in ('asc', 'desc'):
+        return jsonify({'message': 'order must be asc or desc'}), 400
+    limit = args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'message': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+
+    query = Player.query
+    if args.get('position'):
+        query = query.filter(Player.position == args['position'])
+    if args.get('club'):
+        query = query.filter(Player.team_name == args['club'])
+    min_value = args.get('min_value', type=float)
+    max_value = args.get('max_value', type=float)
+    min_points = args.get('min_points', type=int)
+    if min_value is not None:
+        query = query.filter(Player.value >= min_value)
+    if max_value is not None:
+        query = query.filter(Player.value <= max_value)
+    if min_points is not None:
+        query = query.filter(Player.points >= min_points)
+
+    sort_column = SORT_COLUMNS[sort]
+    keyset = tuple_(sort_column, Player.id)
+    if args.get('cursor'):
+        try:
+            after = tuple(decode_cursor(args['cursor'], (SORT_TYPES[sort], int)))
+        except ValueError:
+            return jsonify({'message': 'Invalid cursor'}), 400
+        query = query.filter(keyset > after if order == 'asc' else keyset < after)
+    if order == 'asc':
+        query = query.order_by(sort_column.asc(), Player.id.asc())
+    else:
+        query = query.order_by(sort_column.desc(), Player.id.desc())
+
+    # Fetch one extra row to know whether another page exists
+    players = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(players) > limit:
+        players = players[:limit]
+        last = players[-1]
+        next_cursor = encode_cursor([getattr(last, sort_column.key), last.id])
+
+    return jsonify({
+        'players': [serialize_player(p) for p in players],
+        'next_cursor': next_cursor
+    }), 200
 
 @bp.route('/sync', methods=['POST'])
 @jwt_required()
 def sync_players():
     """
-    Syncs the player database with the external API-Football, fetching all pages.
+    Start a background sync of the player database with API-Football.
+    Pages after the first are fetched concurrently over a shared connection pool.
+    Poll the returned status URL (GET /jobs/<id>) for progress.
     ---
     tags: [Players]
     responses:
-      201:
-        description: Player sync complete.
+      202:
+        description: Sync job queued.
+      409:
+        description: A player sync is already running.
       500:
-        description: API key missing or request failed.
+        description: API key missing.
     """
-    api_key = os.getenv('API_FOOTBALL_KEY')
-    if not api_key:
+    if not current_app.config.get('API_FOOTBALL_KEY'):
         return jsonify({'message': 'API key for API-Football is missing'}), 500
 
-    headers = {'x-apisports-key': api_key}
-    base_params = {'league': '39', 'season': '2023'} # Premier League, 2023-2024 Season
-    url = 'https://v3.football.api-sports.io/players'
-    
-    current_page = 1
-    total_pages = 1 # Start with 1, will be updated after the first call
-    players_added = 0
-    
-    # --- PAGINATION LOOP ---
-    # Keep fetching pages as long as we haven't exceeded the total number of pages
-    while current_page <= total_pages:
-        try:
-            params = {**base_params, 'page': current_page}
-            response = requests.get(url, headers=headers, params=params, timeout=20)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # After the first request, update total_pages with the real value from the API
-            if current_page == 1:
-                total_pages = data.get('paging', {}).get('total', 1)
-
-            players_data = data.get('response', [])
-            if not players_data:
-                break # Stop if there's no data on the current page
-
-            for player_obj in players_data:
-                player_info = player_obj.get('player', {})
-                stats = player_obj.get('statistics', [{}])[0]
-                api_id = player_info.get('id')
-
-                if not api_id or not stats.get('games', {}).get('position'):
-                    continue
-
-                if not Player.query.filter_by(api_player_id=api_id).first():
-                    new_player = Player(
-                        api_player_id=api_id,
-                        name=player_info.get('name', 'N/A'),
-                        team_name=stats.get('team', {}).get('name', 'N/A'),
-                        position=stats.get('games', {}).get('position', 'Unknown'),
-                        photo_url=player_info.get('photo'),
-                        value=round(random.uniform(4.5, 13.0), 1),
-                        points=random.randint(20, 150)
-                    )
-                    db.session.add(new_player)
-                    players_added += 1
-            
-            # Move to the next page for the next iteration
-            current_page += 1
-
-        except requests.RequestException as e:
-            return jsonify({'message': f'API-Football request failed: {e}'}), 500
-        except Exception as e:
-            db.session.rollback()
-            return jsonify({'message': f'An error occurred during sync: {e}'}), 500
+    try:
+        job = enqueue('players_sync', user_id=get_jwt_identity())
+    except JobAlreadyRunning as e:
+        return jsonify({'message': 'A player sync is already running.', 'job_id': e.job.id if e.job else None}), 409
 
-    db.session.commit()
-    return jsonify({'message': f'Player sync complete. Added {players_added} new players.'}), 201
+    return jsonify({
+        'message': 'Player sync started.',
+        'job_id': job.id,
+        'status_url': url_for('jobs.get_job', job_id=job.id)
+    }), 202
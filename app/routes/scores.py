@@ -1,33 +1,114 @@
-from flask import Blueprint, jsonify
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, jsonify, request, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from .. import db
-from ..models import Player
-import random
+from ..history import player_history, top_scorers
+from ..jobs import JobAlreadyRunning, enqueue
+from ..models import Gameweek, Player
+from ..scoring import next_gameweek
 
 bp = Blueprint('scores', __name__, url_prefix='/scoreboard')
 
+MAX_ROWS = 100
+
 @bp.route('/update', methods=['POST'])
 @jwt_required()
 def update_scores():
     """
-    Simulates a gameweek by updating all player scores with a random value.
+    Start a background job simulating a gameweek: every player's score changes by a random value.
+    Scoring the same gameweek twice is a no-op. Poll the returned status URL (GET /jobs/<id>).
     ---
     tags: [Scoreboard]
+    parameters:
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            gameweek: {type: integer, description: Defaults to the next unscored gameweek.}
     responses:
       200:
-        description: Player scores updated successfully.
-      500:
-        description: Failed to update scores.
+        description: Gameweek already scored.
+      202:
+        description: Scoring job queued.
+      400:
+        description: Invalid gameweek.
+      409:
+        description: A gameweek is already being scored.
     """
+    data = request.get_json(silent=True) or {}
+    gameweek = data.get('gameweek')
+    if gameweek is not None and (not isinstance(gameweek, int) or isinstance(gameweek, bool) or gameweek < 1):
+        return jsonify({'message': 'gameweek must be a positive integer'}), 400
+
+    if gameweek is None:
+        gameweek = next_gameweek()
+    elif db.session.get(Gameweek, gameweek):
+        return jsonify({'message': f'Gameweek {gameweek} has already been scored.', 'gameweek': gameweek}), 200
+
     try:
-        players = Player.query.all()
-        for player in players:
-            player.points += random.randint(-2, 15)
-            if player.points < 0:
-                player.points = 0
-        
-        db.session.commit()
-        return jsonify({'message': f'Successfully updated scores for {len(players)} players.'}), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'message': 'Failed to update scores', 'error': str(e)}), 500
+        job = enqueue('gameweek_scoring', {'gameweek': gameweek}, user_id=get_jwt_identity())
+    except JobAlreadyRunning as e:
+        return jsonify({'message': 'A gameweek is already being scored.', 'job_id': e.job.id if e.job else None}), 409
+
+    return jsonify({
+        'message': f'Scoring of gameweek {gameweek} started.',
+        'gameweek': gameweek,
+        'job_id': job.id,
+        'status_url': url_for('jobs.get_job', job_id=job.id)
+    }), 202
+
+@bp.route('/gameweeks/<int:gameweek>/top-scorers', methods=['GET'])
+@jwt_required()
+def get_top_scorers(gameweek):
+    """
+    Get the highest scoring players of a gameweek.
+    ---
+    tags: [Scoreboard]
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        default: 10
+    responses:
+      200:
+        description: Top scorers, highest first.
+      400:
+        description: Invalid limit.
+    """
+    limit = request.args.get('limit', 10, type=int)
+    if not 1 <= limit <= MAX_ROWS:
+        return jsonify({'message': f'limit must be between 1 and {MAX_ROWS}'}), 400
+    return jsonify(top_scorers(gameweek, limit=limit)), 200
+
+@bp.route('/players/<int:player_id>/history', methods=['GET'])
+@jwt_required()
+def get_player_history(player_id):
+    """
+    Get a player's points per gameweek, most recent first.
+    ---
+    tags: [Scoreboard]
+    parameters:
+      - in: query
+        name: last
+        type: integer
+        description: Only return the last N gameweeks.
+    responses:
+      200:
+        description: Player points history.
+      400:
+        description: Invalid last.
+      404:
+        description: Player not found.
+    """
+    last = request.args.get('last', type=int)
+    if last is not None and not 1 <= last <= MAX_ROWS:
+        return jsonify({'message': f'last must be between 1 and {MAX_ROWS}'}), 400
+    player = Player.query.get_or_404(player_id)
+    history = player_history(player.id, last_n=last)
+    return jsonify({
+        'player_id': player.id,
+        'name': player.name,
+        'form': sum(row['points'] for row in history),
+        'history': history
+    }), 200
@@ -1,9 +1,13 @@
+import logging
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from .. import db
-from ..models import Team, Player
+from ..models import Team
+from ..squad import (SquadError, MAX_SQUAD_SIZE, apply_transfers, draft_player as draft_player_to_squad,
+                     remove_player as remove_player_from_squad)
 
 bp = Blueprint('teams', __name__, url_prefix='/teams')
+logger = logging.getLogger(__name__)
 
 @bp.route('/my-team', methods=['GET', 'OPTIONS'])
 @jwt_required()
@@ -18,11 +22,11 @@ def get_team():
       404:
         description: Team not found for this user.
     """
-    print(f"Request method: {request.method}, Headers: {request.headers}")
     if request.method == 'OPTIONS':
         return '', 200
-    user_id = get_jwt_identity()
-    team = Team.query.filter_by(user_id=user_id).first_or_404()
+    if current_user.team_id is None:
+        return jsonify({'message': 'Team not found.'}), 404
+    team = db.session.get(Team, current_user.team_id)
     
     return jsonify({
         'id': team.id,
@@ -60,8 +64,9 @@ def draft_player():
         description: Player drafted successfully.
       400:
         description: Invalid request (e.g., team full, insufficient budget).
+      404:
+        description: Player or team not found.
     """
-    print(f"Request method: {request.method}, Headers: {request.headers}")
     if request.method == 'OPTIONS':
         return '', 200
     user_id = get_jwt_identity()
@@ -69,33 +74,20 @@ def draft_player():
     player_id = data.get('player_id')
 
     if not player_id:
-        print(f"Draft failed: No player_id provided")
         return jsonify({'message': 'Player ID is required'}), 400
 
-    team = Team.query.filter_by(user_id=user_id).first_or_404()
-    player = Player.query.get_or_404(player_id)
-
-    if len(team.players) >= 11:
-        print(f"Draft failed: Team full for user {user_id}")
-        return jsonify({'message': 'Your team is full (11 players).'}), 400
-    
-    if player in team.players:
-        print(f"Draft failed: Player {player_id} already in team")
-        return jsonify({'message': 'This player is already in your team.'}), 400
-
-    if team.budget_left < player.value:
-        print(f"Draft failed: Insufficient budget for player {player_id}")
-        return jsonify({'message': 'Insufficient budget to draft this player.'}), 400
-
-    team.players.append(player)
-    team.budget_left -= player.value
     try:
+        player = draft_player_to_squad(user_id, player_id)
         db.session.commit()
-        print(f"Draft success: Player {player_id} added to team {team.id}")
+        logger.info('Player %s drafted by user %s', player_id, user_id)
         return jsonify({'message': f'{player.name} has been drafted to your team.'}), 201
-    except Exception as e:
+    except SquadError as e:
+        db.session.rollback()
+        logger.info('Draft rejected for user %s: %s', user_id, e.message)
+        return jsonify({'message': e.message}), e.status_code
+    except Exception:
         db.session.rollback()
-        print(f"Draft error: {str(e)}")
+        logger.exception('Draft failed for user %s', user_id)
         return jsonify({'message': 'Error drafting player.'}), 500
 
 @bp.route('/remove_player', methods=['POST', 'OPTIONS'])
@@ -118,10 +110,11 @@ def remove_player():
         description: Player removed successfully.
       400:
         description: Player not in team.
+      404:
+        description: Player not found.
       500:
         description: Database error.
     """
-    print(f"Request method: {request.method}, Headers: {request.headers}")
     if request.method == 'OPTIONS':
         return '', 200
     user_id = get_jwt_identity()
@@ -129,23 +122,77 @@ def remove_player():
     player_id = data.get('player_id')
 
     if not player_id:
-        print(f"Remove failed: No player_id provided")
         return jsonify({'message': 'Player ID is required'}), 400
         
-    team = Team.query.filter_by(user_id=user_id).first_or_404()
-    player = Player.query.get_or_404(player_id)
+    try:
+        player = remove_player_from_squad(user_id, player_id)
+        db.session.commit()
+        logger.info('Player %s removed by user %s', player_id, user_id)
+        return jsonify({'message': f'{player.name} has been removed from your team.'}), 200
+    except SquadError as e:
+        db.session.rollback()
+        logger.info('Removal rejected for user %s: %s', user_id, e.message)
+        return jsonify({'message': e.message}), e.status_code
+    except Exception:
+        db.session.rollback()
+        logger.exception('Removal failed for user %s', user_id)
+        return jsonify({'message': 'Error removing player.'}), 500
+
+
+@bp.route('/transfers', methods=['POST', 'OPTIONS'])
+@jwt_required()
+def make_transfers():
+    """
+    Remove and draft several players in one request.
+    Budget and squad size are checked against the squad after all transfers,
+    and either every transfer is applied or none is.
+    ---
+    tags: [Team]
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            out: {type: array, items: {type: integer}}
+            in: {type: array, items: {type: integer}}
+    responses:
+      200:
+        description: Transfers applied; returns the updated budget, squad size and points.
+      400:
+        description: Invalid request (e.g., team full, insufficient budget, player not in team).
+      404:
+        description: Player or team not found.
+      500:
+        description: Database error.
+    """
+    if request.method == 'OPTIONS':
+        return '', 200
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    out_ids, in_ids = data.get('out', []), data.get('in', [])
 
-    if player not in team.players:
-        print(f"Remove failed: Player {player_id} not in team {team.id}")
-        return jsonify({'message': 'This player is not in your team.'}), 400
+    if not all(isinstance(ids, list) and len(ids) <= 2 * MAX_SQUAD_SIZE
+               and all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+               for ids in (out_ids, in_ids)):
+        return jsonify({'message': 'out and in must be lists of player IDs.'}), 400
 
-    team.players.remove(player)
-    team.budget_left += player.value
     try:
+        team = apply_transfers(user_id, out_ids, in_ids)
         db.session.commit()
-        print(f"Remove success: Player {player_id} removed from team {team.id}")
-        return jsonify({'message': f'{player.name} has been removed from your team.'}), 200
-    except Exception as e:
+        logger.info('Transfers for team %s: %d out, %d in', team.id, len(out_ids), len(in_ids))
+        return jsonify({
+            'message': 'Transfers complete.',
+            'budget_left': team.budget_left,
+            'squad_size': team.squad_size,
+            'total_points': team.total_points
+        }), 200
+    except SquadError as e:
+        db.session.rollback()
+        logger.info('Transfers rejected for user %s: %s', user_id, e.message)
+        return jsonify({'message': e.message}), e.status_code
+    except Exception:
         db.session.rollback()
-        print(f"Remove error: {str(e)}")
-        return jsonify({'message': 'Error removing player.'}), 500
\ No newline at end of file
+        logger.exception('Transfers failed for user %s', user_id)
+        return jsonify({'message': 'Error applying transfers.'}), 500
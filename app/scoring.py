@@ -0,0 +1,103 @@
+import random
+from sqlalchemy import Integer, column, func, select, update, values
+from sqlalchemy.exc import IntegrityError
+from . import db
+from .models import Gameweek, Player, PlayerGameweekPoints
+from .http_cache import CATALOGUE, bump_versions
+from .points import rebuild_points
+from .utils import bulk_insert
+
+# Range of the simulated per-gameweek score change for a single player
+MIN_DELTA, MAX_DELTA = -2, 15
+# Players per UPDATE ... FROM (VALUES ...) statement on server databases
+UPDATE_CHUNK_SIZE = 5000
+
+_player_table = Player.__table__
+_history_table = PlayerGameweekPoints.__table__
+
+
+def _apply_points(connection, params):
+    if connection.dialect.name == 'sqlite':
+        # In-process, so a driver executemany costs no round trips, and plain
+        # tuples skip SQLAlchemy's per-row parameter processing
+        connection.exec_driver_sql(
+            f'UPDATE {_player_table.name} SET points = ? WHERE id = ?',
+            [(p['new_points'], p['player_id']) for p in params],
+        )
+        return
+    # One UPDATE ... FROM (VALUES ...) per chunk instead of a round trip per player
+    for start in range(0, len(params), UPDATE_CHUNK_SIZE):
+        new_points = values(column('id', Integer), column('points', Integer), name='new_points').data(
+            [(p['player_id'], p['new_points']) for p in params[start:start + UPDATE_CHUNK_SIZE]])
+        connection.execute(
+            update(_player_table).values(points=new_points.c.points)
+            .where(_player_table.c.id == new_points.c.id)
+        )
+
+
+def _record_history(connection, gameweek, params):
+    bulk_insert(connection, _history_table,
+                [{'gameweek': gameweek, 'player_id': p['player_id'], 'points': p['delta']} for p in params])
+
+
+def next_gameweek():
+    """
+    Return the id of the first gameweek that has not been scored yet.
+    """
+    return (db.session.scalar(select(func.max(Gameweek.id))) or 0) + 1
+
+
+def compute_deltas(rows, rng):
+    """
+    Compute the new points for every (player_id, points) row in one pass.
+    Returns:
+        list[dict]: executemany parameters with player_id, delta and new_points.
+    """
+    deltas = rng.choices(range(MIN_DELTA, MAX_DELTA + 1), k=len(rows))
+    params = []
+    for (player_id, points), delta in zip(rows, deltas):
+        points = points or 0
+        new_points = max(points + delta, 0)
+        params.append({'player_id': player_id, 'delta': new_points - points, 'new_points': new_points})
+    return params
+
+
+def score_gameweek(gameweek, rng=None):
+    """
+    Score a whole gameweek in one transaction.
+
+    The gameweek row is inserted first, so a second run of the same gameweek
+    (or a concurrent one) fails on its primary key and does nothing. Player
+    points are read as plain tuples, updated in bulk (a driver executemany on
+    SQLite, chunked UPDATE ... FROM (VALUES ...) elsewhere), the
+    per-gameweek points are appended to the history table in bulk and
+    team/league totals are rebuilt set-based. The caller commits.
+    Args:
+        gameweek (int): Gameweek id.
+        rng (random.Random): Source of the simulated scores.
+    Returns:
+        int | None: Number of players scored, or None if already scored.
+    """
+    rng = rng or random.Random()
+    if db.session.get(Gameweek, gameweek):
+        return None
+    db.session.add(Gameweek(id=gameweek))
+    try:
+        db.session.flush()
+    except IntegrityError:
+        # Another worker claimed the same gameweek first
+        db.session.rollback()
+        return None
+
+    # Core statements on the session's connection skip ORM row processing
+    connection = db.session.connection()
+    rows = connection.execute(select(_player_table.c.id, _player_table.c.points)).all()
+    params = compute_deltas(rows, rng)
+    if params:
+        _apply_points(connection, params)
+        _record_history(connection, gameweek, params)
+    rebuild_points()
+    bump_versions(CATALOGUE)
+
+    db.session.get(Gameweek, gameweek).players_scored = len(params)
+    return len(params)
@@ -0,0 +1,146 @@
+import random
+from faker import Faker
+from sqlalchemy import func, select, text
+from . import db
+from .models import User, Team, League, Player, league_member_table, team_player_table
+from .passwords import hash_password
+from .points import rebuild_points
+from .utils import bulk_insert
+
+# Synthetic data at production scale for benchmarks and local development.
+# Rows are built in Python with explicit ids and written in chunks with
+# utils.bulk_insert (a raw driver executemany on SQLite, multi-row INSERTs
+# elsewhere), so a million association rows take seconds.
+# The same seed always produces the same dataset.
+CLUBS = [
+    'Arsenal', 'Aston Villa', 'Bournemouth', 'Brentford', 'Brighton', 'Chelsea', 'Crystal Palace',
+    'Everton', 'Fulham', 'Ipswich', 'Leicester', 'Liverpool', 'Man City', 'Man United', 'Newcastle',
+    "Nott'm Forest", 'Southampton', 'Spurs', 'West Ham', 'Wolves',
+]
+POSITIONS = ['Goalkeeper', 'Defender', 'Midfielder', 'Attacker']
+SEED_PASSWORD = 'password123'
+SQUAD_BUDGET = 100.0
+
+
+def _next_id(model):
+    return (db.session.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def _sync_sequences(tables):
+    # Explicit ids leave Postgres serial sequences behind
+    if db.engine.dialect.name != 'postgresql':
+        return
+    for table in tables:
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM \"{table}\"))"
+        ))
+
+
+def seed_dataset(users=1000, leagues=100, players=500, squad_size=11, seed=42, chunk_size=5000):
+    """
+    Add users with teams, leagues, memberships, players and full squads.
+    Every team joins a league, up to each league's capacity, and every squad
+    fits the starting budget. All users share the password SEED_PASSWORD.
+    Args:
+        users (int): Users to create, each with a team.
+        leagues (int): Leagues to create; owners are drawn from the new users.
+        players (int): Players to add to the catalogue.
+        squad_size (int): Players drafted into each team.
+        seed (int): Seed for names, values and squads.
+        chunk_size (int): Rows per executemany batch.
+    Returns:
+        dict: Rows inserted per table.
+    """
+    leagues = min(leagues, users)  # Every league needs an owner
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    password_hash = hash_password(SEED_PASSWORD, 'pbkdf2', 1000)  # Cheap on purpose: every seeded user shares it
+
+    first_player = _next_id(Player)
+    api_offset = (db.session.scalar(select(func.max(Player.api_player_id))) or 0) + 1
+    player_rows = [{
+        'id': first_player + i,
+        'api_player_id': api_offset + i,
+        'name': fake.name(),
+        'team_name': rng.choice(CLUBS),
+        'position': rng.choice(POSITIONS),
+        'photo_url': None,
+        'value': round(rng.uniform(4.5, 13.0), 1),
+        'points': rng.randint(20, 150),
+    } for i in range(players)]
+
+    # Faker is slow per call, so draw name parts once and combine them
+    first_names = [fake.first_name().lower() for _ in range(500)]
+    last_names = [fake.last_name().lower() for _ in range(500)]
+    cities = [fake.city() for _ in range(500)]
+
+    first_user = _next_id(User)
+    user_rows = [{
+        'id': first_user + i,
+        'username': f'{rng.choice(first_names)}.{rng.choice(last_names)}{first_user + i}',
+        'email': f'user{first_user + i}@example.com',
+        'password_hash': password_hash,
+        'google_id': None,
+    } for i in range(users)]
+
+    max_members = League.max_members.default.arg
+    first_league = _next_id(League)
+    league_rows = []
+    for i in range(leagues):
+        league_rows.append({
+            'id': first_league + i,
+            'name': f'{rng.choice(cities)} League',
+            'owner_id': first_user + i,
+            # From the id, like usernames and emails, so seeding again never
+            # repeats one; real codes are hex, so 'S' keeps the two apart
+            'code': f'S{first_league + i:07X}',
+            'is_private': rng.random() < 0.7,
+            'max_members': max_members,
+            'total_points': 0,
+            'member_count': 0,
+        })
+
+    # Round-robin teams into leagues while there is room; user i owns and is
+    # the first member of league i
+    first_team = _next_id(Team)
+    # Drafting only players worth at most an equal share keeps every squad in budget
+    affordable = [row for row in player_rows if row['value'] * squad_size <= SQUAD_BUDGET] if squad_size else []
+    team_rows, member_rows, squad_rows = [], [], []
+    for i, user in enumerate(user_rows):
+        league_id = first_league + (i % leagues) if leagues and i < leagues * max_members else None
+        squad = rng.sample(affordable, min(squad_size, len(affordable)))
+        spent = sum(row['value'] for row in squad)
+        team_rows.append({
+            'id': first_team + i,
+            'name': f"{user['username']}'s Team",
+            'user_id': user['id'],
+            'league_id': league_id,
+            'budget_left': round(SQUAD_BUDGET - spent, 1),
+            'total_points': 0,
+            'squad_size': 0,
+        })
+        if league_id:
+            member_rows.append({'user_id': user['id'], 'league_id': league_id})
+        squad_rows.extend({'team_id': first_team + i, 'player_id': row['id']} for row in squad)
+
+    for row in member_rows:
+        league_rows[row['league_id'] - first_league]['member_count'] += 1
+
+    # Rows give every column: bulk_insert applies no column defaults on SQLite
+    connection = db.session.connection()
+    for table, rows in ((Player.__table__, player_rows), (User.__table__, user_rows), (League.__table__, league_rows),
+                        (Team.__table__, team_rows), (league_member_table, member_rows),
+                        (team_player_table, squad_rows)):
+        bulk_insert(connection, table, rows, chunk_size)
+    _sync_sequences(['player', 'user', 'league', 'team'])
+    rebuild_points()
+    return {
+        'players': len(player_rows),
+        'users': len(user_rows),
+        'teams': len(team_rows),
+        'leagues': len(league_rows),
+        'league_members': len(member_rows),
+        'team_players': len(squad_rows),
+    }
@@ -0,0 +1,205 @@
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
+from . import db
+from .http_cache import bump_versions, league_key, team_key
+from .models import League, Player, Team, team_player_table
+
+# Drafts and removals are conditional writes rather than read-check-write:
+# the squad size and budget rules live in the UPDATE's WHERE clause and the
+# duplicate rule in team_player's primary key, so concurrent requests from
+# different workers cannot overspend a budget or grow a squad past the limit.
+# The team row is only locked for the duration of the short transaction.
+MAX_SQUAD_SIZE = 11
+
+_team = Team.__table__
+_league = League.__table__
+
+
+class SquadError(Exception):
+    """A draft or removal that breaks a squad rule."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _player_column(column, player_id):
+    return select(column).where(Player.id == player_id).scalar_subquery()
+
+
+def _apply_to_league(league_id, points):
+    if league_id and points:
+        db.session.execute(
+            _league.update().where(_league.c.id == league_id)
+            .values(total_points=_league.c.total_points + points)
+        )
+
+
+def _draft_failure(user_id, player_id):
+    """Work out which rule made the conditional UPDATE match no row."""
+    team = db.session.execute(
+        select(Team.budget_left, Team.squad_size).where(Team.user_id == user_id)
+    ).first()
+    if not team:
+        return SquadError('Team not found.', 404)
+    value = db.session.scalar(select(Player.value).where(Player.id == player_id))
+    if value is None:
+        return SquadError('Player not found.', 404)
+    if team.squad_size >= MAX_SQUAD_SIZE:
+        return SquadError(f'Your team is full ({MAX_SQUAD_SIZE} players).')
+    return SquadError('Insufficient budget to draft this player.')
+
+
+def draft_player(user_id, player_id):
+    """
+    Add a player to the user's squad. The caller commits.
+    Returns:
+        Row: The player's name, value and points.
+    Raises:
+        SquadError: When the squad is full, the budget is too low, the player
+            is already in the squad or either side does not exist.
+    """
+    value = _player_column(Player.value, player_id)
+    points = func.coalesce(_player_column(Player.points, player_id), 0)
+    team = db.session.execute(
+        _team.update()
+        .where(_team.c.user_id == user_id,
+               _team.c.squad_size < MAX_SQUAD_SIZE,
+               _team.c.budget_left >= value)
+        .values(budget_left=_team.c.budget_left - value,
+                squad_size=_team.c.squad_size + 1,
+                total_points=_team.c.total_points + points)
+        .returning(_team.c.id, _team.c.league_id)
+    ).first()
+    if not team:
+        raise _draft_failure(user_id, player_id)
+
+    try:
+        db.session.execute(team_player_table.insert().values(team_id=team.id, player_id=player_id))
+    except IntegrityError:
+        db.session.rollback()  # Also undoes the budget update
+        raise SquadError('This player is already in your team.')
+
+    player = db.session.execute(
+        select(Player.name, Player.value, Player.points).where(Player.id == player_id)
+    ).first()
+    _apply_to_league(team.league_id, player.points)
+    bump_versions(team_key(team.id), team.league_id and league_key(team.league_id))
+    return player
+
+
+def remove_player(user_id, player_id):
+    """
+    Remove a player from the user's squad and refund their value. The caller commits.
+    Returns:
+        Row: The player's name, value and points.
+    Raises:
+        SquadError: When the player is not in the squad or does not exist.
+    """
+    team_id = select(Team.id).where(Team.user_id == user_id).scalar_subquery()
+    deleted = db.session.execute(
+        team_player_table.delete().where(team_player_table.c.team_id == team_id,
+                                         team_player_table.c.player_id == player_id)
+    )
+    if deleted.rowcount == 0:
+        if not db.session.scalar(select(Player.id).where(Player.id == player_id)):
+            raise SquadError('Player not found.', 404)
+        raise SquadError('This player is not in your team.')
+
+    player = db.session.execute(
+        select(Player.name, Player.value, Player.points).where(Player.id == player_id)
+    ).first()
+    team = db.session.execute(
+        _team.update()
+        .where(_team.c.user_id == user_id)
+        .values(budget_left=_team.c.budget_left + player.value,
+                squad_size=_team.c.squad_size - 1,
+                total_points=_team.c.total_points - (player.points or 0))
+        .returning(_team.c.id, _team.c.league_id)
+    ).first()
+    _apply_to_league(team.league_id, -(player.points or 0))
+    bump_versions(team_key(team.id), team.league_id and league_key(team.league_id))
+    return player
+
+
+def _transfer_failure(user_id, size_change):
+    """Work out which rule made the conditional transfer UPDATE match no row."""
+    team = db.session.execute(
+        select(Team.squad_size).where(Team.user_id == user_id)
+    ).first()
+    if not team:
+        return SquadError('Team not found.', 404)
+    if team.squad_size + size_change > MAX_SQUAD_SIZE:
+        return SquadError(f'Your team is full ({MAX_SQUAD_SIZE} players).')
+    return SquadError('Insufficient budget for these transfers.')
+
+
+def apply_transfers(user_id, out_ids, in_ids):
+    """
+    Remove and add several players in one go. Budget and squad size are
+    checked once against the squad after every transfer, so a full squad can
+    swap players. The caller commits; on SquadError it must roll back.
+    Args:
+        user_id (int): Owner of the squad.
+        out_ids (list): Players leaving the squad.
+        in_ids (list): Players joining the squad.
+    Returns:
+        Row: The team's id, budget_left, squad_size and total_points afterwards.
+    Raises:
+        SquadError: When a rule is broken or a player does not exist.
+    """
+    out_ids, in_ids = list(dict.fromkeys(out_ids)), list(dict.fromkeys(in_ids))
+    if set(out_ids) & set(in_ids):
+        raise SquadError('A player cannot be transferred both out and in.')
+    all_ids = out_ids + in_ids
+    if not all_ids:
+        raise SquadError('No transfers given.')
+
+    signed = case((Player.id.in_(in_ids), 1), else_=-1)
+    value_change = (
+        select(func.coalesce(func.sum(Player.value * signed), 0))
+        .where(Player.id.in_(all_ids)).scalar_subquery()
+    )
+    points_change = func.coalesce(func.sum(Player.points * signed), 0)
+    size_change = len(in_ids) - len(out_ids)
+
+    # Write first: the team row is locked before anything is read
+    team = db.session.execute(
+        _team.update()
+        .where(_team.c.user_id == user_id,
+               _team.c.squad_size + size_change <= MAX_SQUAD_SIZE,
+               _team.c.budget_left >= value_change)
+        .values(budget_left=_team.c.budget_left - value_change,
+                squad_size=_team.c.squad_size + size_change,
+                total_points=_team.c.total_points
+                + select(points_change).where(Player.id.in_(all_ids)).scalar_subquery())
+        .returning(_team.c.id, _team.c.league_id, _team.c.budget_left,
+                   _team.c.squad_size, _team.c.total_points)
+    ).first()
+    if not team:
+        raise _transfer_failure(user_id, size_change)
+
+    found, points = db.session.execute(
+        select(func.count(), points_change).where(Player.id.in_(all_ids))
+    ).one()
+    if found != len(all_ids):
+        raise SquadError('Player not found.', 404)
+
+    if out_ids:
+        deleted = db.session.execute(
+            team_player_table.delete().where(team_player_table.c.team_id == team.id,
+                                             team_player_table.c.player_id.in_(out_ids))
+        )
+        if deleted.rowcount != len(out_ids):
+            raise SquadError('A transferred-out player is not in your team.')
+    if in_ids:
+        try:
+            db.session.execute(team_player_table.insert(),
+                               [{'team_id': team.id, 'player_id': player_id} for player_id in in_ids])
+        except IntegrityError:
+            raise SquadError('A transferred-in player is already in your team.')
+
+    _apply_to_league(team.league_id, points)
+    bump_versions(team_key(team.id), team.league_id and league_key(team.league_id))
+    return team
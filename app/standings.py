@@ -0,0 +1,99 @@
+from sqlalchemy import and_, func, or_, select
+from . import db
+from .models import League, Team, User, league_member_table
+
+# League standings are ranked in SQL with window functions over the stored
+# Team.total_points column (SQLite >= 3.25 and Postgres both support them).
+# RANK() leaves gaps after ties (1, 1, 3), DENSE_RANK() does not (1, 1, 2).
+RANKING_FUNCTIONS = {
+    'standard': func.rank,
+    'dense': func.dense_rank,
+}
+
+
+def _ranked_teams(league_id, ranking='standard'):
+    order = Team.total_points.desc()
+    return (
+        select(
+            Team.id.label('team_id'),
+            Team.user_id.label('user_id'),
+            Team.name.label('team_name'),
+            User.username.label('owner_name'),
+            Team.total_points.label('points'),
+            RANKING_FUNCTIONS[ranking]().over(order_by=order).label('rank'),
+            # Stable position used for top-N slicing when ranks are tied
+            func.row_number().over(order_by=(order, Team.id)).label('position'),
+        )
+        .join(User, User.id == Team.user_id)
+        .where(Team.league_id == league_id)
+        .subquery()
+    )
+
+
+def league_standings(league_id, limit=None, team_id=None, ranking='standard'):
+    """
+    Rank the teams of a league in a single query.
+    Args:
+        league_id (int): League to rank.
+        limit (int): Only return the top N rows (default: all teams).
+        team_id (int): Also return this team's row when it falls outside the top N.
+        ranking (str): 'standard' for RANK(), 'dense' for DENSE_RANK().
+    Returns:
+        list[dict]: Rows with team_id, user_id, team_name, owner_name, points,
+        rank and position, ordered by position.
+    """
+    if ranking not in RANKING_FUNCTIONS:
+        raise ValueError(f'Unknown ranking: {ranking}')
+    ranked = _ranked_teams(league_id, ranking)
+    stmt = select(ranked).order_by(ranked.c.position)
+    if limit is not None:
+        condition = ranked.c.position <= limit
+        if team_id is not None:
+            condition = or_(condition, ranked.c.team_id == team_id)
+        stmt = stmt.where(condition)
+    return [dict(row._mapping) for row in db.session.execute(stmt)]
+
+
+def user_league_ranks(user_id, team_id=None, ranking='standard'):
+    """
+    List every league a user belongs to with the user's rank there, in a
+    single query however many leagues that is. A team plays in one league at
+    a time, so rank and points are None in the others.
+    Args:
+        user_id (int): Member whose leagues to list.
+        team_id (int): The member's team, if they have one.
+        ranking (str): 'standard' for RANK(), 'dense' for DENSE_RANK().
+    Returns:
+        list[dict]: Rows with league_id, name, code, owner_id, member_count,
+        max_members, rank and points, ordered by league id.
+    """
+    if ranking not in RANKING_FUNCTIONS:
+        raise ValueError(f'Unknown ranking: {ranking}')
+    team_league = select(Team.league_id).where(Team.id == team_id).scalar_subquery()
+    ranked = (
+        select(
+            Team.id.label('team_id'),
+            Team.league_id.label('league_id'),
+            Team.total_points.label('points'),
+            RANKING_FUNCTIONS[ranking]().over(order_by=Team.total_points.desc()).label('rank'),
+        )
+        .where(Team.league_id == team_league)
+        .subquery()
+    )
+    stmt = (
+        select(
+            League.id.label('league_id'),
+            League.name,
+            League.code,
+            League.owner_id,
+            League.member_count,
+            League.max_members,
+            ranked.c.rank,
+            ranked.c.points,
+        )
+        .join(league_member_table, league_member_table.c.league_id == League.id)
+        .outerjoin(ranked, and_(ranked.c.league_id == League.id, ranked.c.team_id == team_id))
+        .where(league_member_table.c.user_id == user_id)
+        .order_by(League.id)
+    )
+    return [dict(row._mapping) for row in db.session.execute(stmt)]
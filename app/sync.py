@@ -0,0 +1,92 @@
+import random
+from sqlalchemy import or_, select
+from . import db
+from .models import Player
+from .http_cache import CATALOGUE, bump_versions
+from .utils import dialect_insert
+
+# Premier League, 2023-2024 Season
+PLAYERS_ENDPOINT = 'players'
+PLAYERS_PARAMS = {'league': '39', 'season': '2023'}
+# Columns refreshed from the API for players we already have
+UPDATED_COLUMNS = ('name', 'team_name', 'position', 'photo_url')
+
+
+def parse_player(player_obj):
+    """
+    Map one API-Football player entry to Player column values.
+    Returns:
+        dict | None: Column values, or None for entries without an id or position.
+    """
+    player_info = player_obj.get('player', {})
+    stats = (player_obj.get('statistics') or [{}])[0]
+    api_id = player_info.get('id')
+    position = stats.get('games', {}).get('position')
+    if not api_id or not position:
+        return None
+    return {
+        'api_player_id': api_id,
+        'name': player_info.get('name', 'N/A'),
+        'team_name': stats.get('team', {}).get('name', 'N/A'),
+        'position': position,
+        'photo_url': player_info.get('photo'),
+    }
+
+
+def upsert_players(rows, known_ids):
+    """
+    Insert or update one page of players in a single statement.
+    New players get a random value and starting points; existing ones only
+    have their club, position, name and photo refreshed, and only when one of
+    them actually changed.
+    Args:
+        rows (list[dict]): Parsed player values (see parse_player).
+        known_ids (set): api_player_ids already stored; updated in place.
+    Returns:
+        tuple: (players added, players updated).
+    """
+    rows = list({row['api_player_id']: row for row in rows}.values())
+    if not rows:
+        return 0, 0
+    added = sum(1 for row in rows if row['api_player_id'] not in known_ids)
+    stmt = dialect_insert(Player, db.session.get_bind().dialect.name).values([{
+        **row,
+        'value': round(random.uniform(4.5, 13.0), 1),
+        'points': random.randint(20, 150),
+    } for row in rows])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['api_player_id'],
+        set_={column: stmt.excluded[column] for column in UPDATED_COLUMNS},
+        where=or_(*(getattr(Player, column).is_distinct_from(stmt.excluded[column]) for column in UPDATED_COLUMNS)),
+    )
+    result = db.session.execute(stmt)
+    known_ids.update(row['api_player_id'] for row in rows)
+    return added, max(result.rowcount - added, 0)
+
+
+def sync_players(client, on_page=None):
+    """
+    Import every player page from API-Football, one bulk upsert per page.
+    Each page that changes the catalogue bumps its version along with its
+    writes, so a caller committing per page (or a sync failing partway)
+    never leaves clients with stale 304s. The caller commits.
+    Args:
+        client (FootballAPIClient): Client used to fetch the pages.
+        on_page (callable): Called as on_page(pages_done, pages_total, rows_written)
+            after each page is written, e.g. to report progress and commit.
+    Returns:
+        tuple: (players added, players updated).
+    """
+    known_ids = set(db.session.scalars(select(Player.api_player_id)))
+    players_added = players_updated = 0
+    for pages_done, page in enumerate(client.fetch_pages(PLAYERS_ENDPOINT, PLAYERS_PARAMS), start=1):
+        rows = [values for values in map(parse_player, page.get('response', [])) if values]
+        added, updated = upsert_players(rows, known_ids)
+        players_added += added
+        players_updated += updated
+        if added or updated:
+            bump_versions(CATALOGUE)
+        if on_page:
+            on_page(pages_done, page.get('paging', {}).get('total', pages_done), added + updated)
+
+    return players_added, players_updated
@@ -1,5 +1,8 @@
+import base64
+import json
 import uuid
 import secrets
+from operator import itemgetter
 
 def generate_league_code():
     """
@@ -17,4 +20,84 @@ def generate_random_string(length=32):
     Returns:
         str: Random hexadecimal string.
     """
-    return secrets.token_hex(length // 2)
\ No newline at end of file
+    return secrets.token_hex(length // 2)
+
+def encode_cursor(values):
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+    Args:
+        values (list): JSON-serialisable keyset values, e.g. [points, id].
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor, types):
+    """
+    Decode a cursor produced by encode_cursor.
+    Args:
+        cursor (str): Cursor string from a previous page.
+        types (tuple): Expected type (or tuple of types) of each keyset value.
+    Returns:
+        list: The keyset values.
+    Raises:
+        ValueError: If the cursor is malformed or holds values of other types.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError('Invalid cursor')
+    # A tampered cursor could smuggle lists or objects into the bound parameters
+    for value, expected in zip(values, types):
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError('Invalid cursor')
+    return values
+
+
+def dialect_insert(table, dialect_name):
+    """
+    Build an INSERT that supports ON CONFLICT for the given dialect.
+    Args:
+        table: Table or model to insert into.
+        dialect_name (str): 'sqlite' or 'postgresql'.
+    Returns:
+        Insert: Dialect-specific insert with on_conflict_do_update/do_nothing.
+    """
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f'ON CONFLICT is not supported for {dialect_name}')
+    return insert(table)
+
+
+def bulk_insert(connection, table, rows, chunk_size=5000):
+    """
+    Insert many rows with as little per-row work as the backend allows.
+    On SQLite the INSERT is compiled once and each chunk goes straight to the
+    driver's executemany: it runs in-process, and SQLAlchemy's per-row
+    parameter binding would cost more than the insert itself. Elsewhere the
+    rows go through SQLAlchemy's insertmanyvalues, which sends multi-row
+    INSERTs instead of one round trip per row.
+    Args:
+        connection: Connection to insert on.
+        table: Table to insert into.
+        rows (list[dict]): Rows giving the same columns; column defaults are
+            not applied on the SQLite path.
+        chunk_size (int): Rows per executemany call.
+    """
+    if not rows:
+        return
+    if connection.dialect.name == 'sqlite':
+        compiled = table.insert().compile(dialect=connection.dialect, column_keys=list(rows[0]))
+        as_tuple = itemgetter(*compiled.positiontup)
+        for start in range(0, len(rows), chunk_size):
+            connection.exec_driver_sql(compiled.string, [as_tuple(row) for row in rows[start:start + chunk_size]])
+    else:
+        for start in range(0, len(rows), chunk_size):
+            connection.execute(table.insert(), rows[start:start + chunk_size])
@@ -0,0 +1,346 @@
+"""
+Load benchmark for every route in app/routes.
+
+Seeds a reproducible Faker dataset (see app.seed), then drives each scenario
+either through the Flask test client in this process (--mode client) or over
+HTTP against gunicorn workers (--mode http), and prints a JSON report with
+p50/p95/p99 latency, throughput and SQL queries per request.
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --database-url postgresql://localhost/dreamsquad_bench --mode http --workers 4
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from prometheus_client.parser import text_string_to_metric_families
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JWT_SECRET = 'benchmark-jwt-secret'
+SKIPPED = {
+    'players.sync_players': 'calls the API-Football service',
+    'auth.google_login': 'needs a token signed by Google',
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Actor:
+    """A seeded user the scenarios act as."""
+
+    def __init__(self, user_id, email, token, team_player_ids, league_id):
+        self.user_id = user_id
+        self.email = email
+        self.headers = {'Authorization': f'Bearer {token}'}
+        self.team_player_ids = team_player_ids
+        self.league_id = league_id
+
+
+def build_scenarios(data, rng, count):
+    """
+    Return scenario name -> list of tasks. A task is a list of requests run in
+    order by one thread, as (method, path, json body, headers) tuples.
+    """
+    actors = data['actors']
+
+    def each(build, n=count):
+        return [build(i, actors[i % len(actors)]) for i in range(n)]
+
+    def swap(i, actor):
+        # Remove a squad player and draft them back: the squad ends as it started
+        player_id = actor.team_player_ids[i % len(actor.team_player_ids)]
+        return [('POST', '/teams/remove_player', {'player_id': player_id}, actor.headers),
+                ('POST', '/teams/draft', {'player_id': player_id}, actor.headers)]
+
+    def transfer(i, actor):
+        out_id = actor.team_player_ids[i % len(actor.team_player_ids)]
+        return [('POST', '/teams/transfers', {'out': [out_id]}, actor.headers),
+                ('POST', '/teams/transfers', {'in': [out_id]}, actor.headers)]
+
+    positions = ['Goalkeeper', 'Defender', 'Midfielder', 'Attacker']
+    return {
+        'players_catalogue': each(lambda i, a: [('GET', '/players', None, a.headers)]),
+        'players_filtered': each(lambda i, a: [(
+            'GET', f'/players?position={positions[i % 4]}&sort=value&limit=20', None, a.headers)]),
+        'my_team': each(lambda i, a: [('GET', '/teams/my-team', None, a.headers)]),
+        'dashboard': each(lambda i, a: [('GET', '/dashboard', None, a.headers)]),
+        'my_leagues': each(lambda i, a: [('GET', '/leagues/my-leagues', None, a.headers)]),
+        'public_leagues': each(lambda i, a: [('GET', '/leagues/public', None, a.headers)]),
+        'league_details': each(lambda i, a: [('GET', f'/leagues/{a.league_id}', None, a.headers)]),
+        'top_scorers': each(lambda i, a: [('GET', '/scoreboard/gameweeks/1/top-scorers', None, a.headers)]),
+        'player_history': each(lambda i, a: [(
+            'GET', f'/scoreboard/players/{rng.choice(data["player_ids"])}/history', None, a.headers)]),
+        'job_status': each(lambda i, a: [('GET', f'/jobs/{data["job_id"]}', None, a.headers)]),
+        'draft_and_remove': each(swap),
+        'transfers': each(transfer),
+        'login': each(lambda i, a: [('POST', '/auth/login', {'email': a.email, 'password': data['password']}, {})],
+                      n=min(count, len(actors))),
+        'register': [[('POST', '/auth/register', {
+            'username': f'bench{data["run_id"]}_{i}', 'email': f'bench{data["run_id"]}_{i}@example.com',
+            'password': data['password']}, {})] for i in range(count)],
+        'create_league': each(lambda i, a: [('POST', '/leagues/create', {'name': f'Bench {i}'}, a.headers)],
+                              n=min(count, 20)),
+        'join_league': [[('POST', '/leagues/join', {'code': code}, actor.headers)]
+                        for code, actor in zip(data['open_codes'], reversed(actors))],
+        'score_gameweek': each(lambda i, a: [('POST', '/scoreboard/update', {}, a.headers)], n=min(count, 3)),
+    }
+
+
+def prepare(app, args):
+    """Seed (unless --reuse) and pick actors; returns the data scenarios need."""
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import select
+    from app import db
+    from app.models import Job, League, Player, Team, User, team_player_table
+    from app.scoring import score_gameweek
+    from app.seed import SEED_PASSWORD, seed_dataset
+
+    with app.app_context():
+        if not args.reuse:
+            db.drop_all()
+            db.create_all()
+            started = time.perf_counter()
+            seeded = seed_dataset(users=args.users, leagues=args.leagues, players=args.players, seed=args.seed)
+            score_gameweek(1, rng=random.Random(args.seed))
+            db.session.commit()
+            print(f'Seeded {seeded} in {time.perf_counter() - started:.1f}s', file=sys.stderr)
+
+        rng = random.Random(args.seed)
+        team_ids = db.session.scalars(
+            select(Team.id).where(Team.squad_size > 0, Team.league_id.is_not(None)).order_by(Team.id)
+        ).all()
+        sample = rng.sample(team_ids, min(args.actors, len(team_ids)))
+        actors = []
+        for team in db.session.execute(
+            select(Team.id, Team.user_id, Team.league_id, User.email)
+            .join(User, User.id == Team.user_id).where(Team.id.in_(sample)).order_by(Team.id)
+        ):
+            squad = db.session.scalars(select(team_player_table.c.player_id)
+                                       .where(team_player_table.c.team_id == team.id)).all()
+            actors.append(Actor(team.user_id, team.email, create_access_token(identity=team.user_id), squad,
+                                team.league_id))
+
+        open_codes = db.session.scalars(
+            select(League.code).where(League.member_count < League.max_members).limit(args.requests)
+        ).all()
+        job = Job(kind='benchmark', status='succeeded', params={})
+        db.session.add(job)
+        db.session.commit()
+        return {
+            'actors': actors,
+            'player_ids': db.session.scalars(select(Player.id)).all(),
+            'open_codes': open_codes,
+            'job_id': job.id,
+            'password': SEED_PASSWORD,
+            'run_id': int(time.time()),
+        }
+
+
+class ClientDriver:
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def request(self, method, path, body, headers):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        return client.open(path, method=method, json=body, headers=headers).status_code
+
+    def metrics_text(self):
+        return self.app.test_client().get('/metrics').get_data(as_text=True)
+
+    def close(self):
+        pass
+
+
+class HTTPDriver:
+    def __init__(self, env, workers, port):
+        import requests
+        self.requests = requests
+        self.base_url = f'http://127.0.0.1:{port}'
+        self.local = threading.local()
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}', 'app:create_app()'],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                requests.get(self.base_url + '/', timeout=1)
+                break
+            except requests.RequestException:
+                if time.monotonic() > deadline or self.process.poll() is not None:
+                    self.close()
+                    raise RuntimeError('gunicorn did not start')
+                time.sleep(0.2)
+
+    def request(self, method, path, body, headers):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = self.requests.Session()
+        return session.request(method, self.base_url + path, json=body, headers=headers, timeout=60).status_code
+
+    def metrics_text(self):
+        return self.requests.get(self.base_url + '/metrics', timeout=10).text
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait(timeout=10)
+
+
+def query_totals(text):
+    """Sum and count of http_request_db_queries per endpoint from a /metrics scrape."""
+    totals = {}
+    for family in text_string_to_metric_families(text):
+        if family.name != 'http_request_db_queries':
+            continue
+        for sample in family.samples:
+            if sample.name.endswith(('_sum', '_count')):
+                entry = totals.setdefault(sample.labels['endpoint'], {'sum': 0.0, 'count': 0.0})
+                entry['sum' if sample.name.endswith('_sum') else 'count'] += sample.value
+    return totals
+
+
+def run_scenario(driver, tasks, concurrency):
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def run_task(task):
+        nonlocal errors
+        for method, path, body, headers in task:
+            started = time.perf_counter()
+            try:
+                status = driver.request(method, path, body, headers)
+            except Exception:
+                status = None
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed_ms)
+                if status is None or status >= 500:
+                    errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run_task, tasks))
+    wall = time.perf_counter() - started
+    return sorted(latencies), errors, wall
+
+
+def run_benchmark(args):
+    """Run every scenario and return the JSON-serialisable report."""
+    db_dir = tempfile.mkdtemp(prefix='dreamsquad-bench-')
+    database_url = args.database_url or f'sqlite:///{os.path.join(db_dir, "bench.db")}'
+    env = {**os.environ, 'SQLALCHEMY_DATABASE_URI': database_url, 'JWT_SECRET_KEY': JWT_SECRET,
+           'LOG_LEVEL': 'WARNING', 'PROMETHEUS_MULTIPROC_DIR': os.path.join(db_dir, 'metrics')}
+    os.makedirs(env['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+    sys.path.insert(0, ROOT)
+    from app import create_app, db
+    app = driver = None
+    results = {}
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': database_url, 'JWT_SECRET_KEY': JWT_SECRET,
+                          'LOG_LEVEL': 'WARNING', 'JOBS_RUN_INLINE': args.mode == 'client'})
+        data = prepare(app, args)
+        scenarios = build_scenarios(data, random.Random(args.seed), args.requests)
+        url_adapter = app.url_map.bind('localhost')
+
+        driver = ClientDriver(app) if args.mode == 'client' else HTTPDriver(env, args.workers, args.port)
+        for name, tasks in scenarios.items():
+            if args.only and name not in args.only:
+                continue
+            endpoints = {url_adapter.match(path.split('?')[0], method=method)[0]
+                         for task in tasks for method, path, _, _ in task}
+            before = query_totals(driver.metrics_text())
+            latencies, errors, wall = run_scenario(driver, tasks, args.concurrency)
+            after = query_totals(driver.metrics_text())
+            queries = sum(after.get(e, {}).get('sum', 0) - before.get(e, {}).get('sum', 0) for e in endpoints)
+            observed = sum(after.get(e, {}).get('count', 0) - before.get(e, {}).get('count', 0) for e in endpoints)
+            results[name] = {
+                'endpoints': sorted(endpoints),
+                'requests': len(latencies),
+                'errors': errors,
+                'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+                'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+                'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+                'throughput_rps': round(len(latencies) / wall, 1) if wall else None,
+                'queries_per_request': round(queries / observed, 2) if observed else None,
+            }
+    finally:
+        if driver is not None:
+            driver.close()
+        if app is not None:
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+        # The SQLite database (unless --database-url was given) and the metrics files
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'meta': {
+            'commit': commit,
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'mode': args.mode,
+            'workers': args.workers if args.mode == 'http' else 1,
+            'concurrency': args.concurrency,
+            'database': database_url.split(':', 1)[0],
+            'dataset': {'users': args.users, 'leagues': args.leagues, 'players': args.players, 'seed': args.seed},
+            'python': platform.python_version(),
+        },
+        'scenarios': results,
+        'skipped': SKIPPED,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='Defaults to a fresh SQLite file in a temp directory.')
+    parser.add_argument('--reuse', action='store_true', help='Benchmark the existing data instead of reseeding.')
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--leagues', type=int, default=5000)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--actors', type=int, default=200, help='Distinct users sending requests.')
+    parser.add_argument('--requests', type=int, default=200, help='Requests (or request pairs) per scenario.')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--mode', choices=['client', 'http'], default='client')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers in http mode.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--only', nargs='*', help='Run only these scenarios.')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = json.dumps(run_benchmark(args), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+# Loaded automatically by gunicorn (see Procfile).
+import glob
+import os
+
+# Must be set before prometheus_client is imported anywhere, so workers
+# write their metrics to shared files that /metrics can merge.
+metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/dreamsquad-metrics')
+
+
+def on_starting(server):
+    # Samples from a previous run would otherwise be merged into this one.
+    # Only prometheus_client's own *.db files go: the directory may be shared.
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, '*.db')):
+        os.remove(path)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
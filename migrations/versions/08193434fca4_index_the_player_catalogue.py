@@ -0,0 +1,39 @@
+"""Index the player catalogue
+
+Revision ID: 08193434fca4
+Revises: 384b904685ce
+Create Date: 2026-10-18 14:05:45.460127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '08193434fca4'
+down_revision = '384b904685ce'
+branch_labels = None
+depends_on = None
+
+
+# Built without locking writes on Postgres; CONCURRENTLY cannot run inside a transaction
+INDEXES = [
+    ('ix_player_points_id', ['points', 'id']),
+    ('ix_player_value_id', ['value', 'id']),
+    ('ix_player_name_id', ['name', 'id']),
+    ('ix_player_position_points_id', ['position', 'points', 'id']),
+    ('ix_player_position_value_id', ['position', 'value', 'id']),
+    ('ix_player_team_name_points_id', ['team_name', 'points', 'id']),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, 'player', columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='player', postgresql_concurrently=True)
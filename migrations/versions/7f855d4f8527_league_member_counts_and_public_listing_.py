@@ -0,0 +1,38 @@
+"""League member counts and public listing index
+
+Revision ID: 7f855d4f8527
+Revises: ff9128728ec6
+Create Date: 2026-10-18 14:08:39.697105
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f855d4f8527'
+down_revision = 'ff9128728ec6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('league', sa.Column('member_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        'UPDATE league SET member_count = '
+        '(SELECT count(*) FROM league_member WHERE league_member.league_id = league.id)'
+    )
+    # Built without locking writes on Postgres; CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_league_public_name', 'league', ['is_private', sa.text('lower(name)'), 'id'],
+                        unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_league_is_private_id', table_name='league', postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_league_is_private_id', 'league', ['is_private', 'id'],
+                        unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_league_public_name', table_name='league', postgresql_concurrently=True)
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.drop_column('member_count')
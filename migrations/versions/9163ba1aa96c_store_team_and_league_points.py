@@ -0,0 +1,45 @@
+"""Store team and league points
+
+Revision ID: 9163ba1aa96c
+Revises: 0dddf4716f20
+Create Date: 2026-10-18 14:05:43.512310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9163ba1aa96c'
+down_revision = '0dddf4716f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('team', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_points', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_team_league_id_total_points', ['league_id', 'total_points'], unique=False)
+
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_points', sa.Integer(), server_default='0', nullable=False))
+
+    # The same set-based recount as app.points.rebuild_points
+    op.execute(
+        'UPDATE team SET total_points = '
+        '(SELECT coalesce(sum(player.points), 0) FROM team_player '
+        'JOIN player ON player.id = team_player.player_id WHERE team_player.team_id = team.id)'
+    )
+    op.execute(
+        'UPDATE league SET total_points = '
+        '(SELECT coalesce(sum(team.total_points), 0) FROM team WHERE team.league_id = league.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('league', schema=None) as batch_op:
+        batch_op.drop_column('total_points')
+
+    with op.batch_alter_table('team', schema=None) as batch_op:
+        batch_op.drop_index('ix_team_league_id_total_points')
+        batch_op.drop_column('total_points')
@@ -0,0 +1,32 @@
+"""Store team squad size
+
+Revision ID: cecbb82943e3
+Revises: 47cfd5b7e0c9
+Create Date: 2026-10-18 14:05:47.390846
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cecbb82943e3'
+down_revision = '47cfd5b7e0c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('team', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('squad_size', sa.Integer(), server_default='0', nullable=False))
+
+    # The same set-based recount as app.points.rebuild_points
+    op.execute(
+        'UPDATE team SET squad_size = '
+        '(SELECT count(*) FROM team_player WHERE team_player.team_id = team.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('team', schema=None) as batch_op:
+        batch_op.drop_column('squad_size')
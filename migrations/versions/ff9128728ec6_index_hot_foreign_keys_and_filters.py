@@ -0,0 +1,37 @@
+"""Index hot foreign keys and filters
+
+Revision ID: ff9128728ec6
+Revises: cecbb82943e3
+Create Date: 2026-10-18 14:05:54.850665
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ff9128728ec6'
+down_revision = 'cecbb82943e3'
+branch_labels = None
+depends_on = None
+
+
+# Built without locking writes on Postgres; CONCURRENTLY cannot run inside a transaction
+INDEXES = [
+    ('ix_league_is_private_id', 'league', ['is_private', 'id']),
+    ('ix_league_owner_id', 'league', ['owner_id']),
+    ('ix_league_member_league_id', 'league_member', ['league_id', 'user_id']),
+    ('ix_team_player_player_id', 'team_player', ['player_id', 'team_id']),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,72 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from app.models import User, Team, Player
+
+TEST_CONFIG = {
+    'TESTING': True,
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+    'JWT_SECRET_KEY': 'test-jwt-secret',
+    # Run background jobs before the enqueueing request returns
+    'JOBS_RUN_INLINE': True,
+}
+
+
+def count_queries(app, func):
+    """
+    Run func and count the SQL statements it sends to the app's engine.
+    Returns:
+        tuple: (func's return value, number of statements).
+    """
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return result, len(statements)
+
+
+@pytest.fixture
+def app():
+    app = create_app(TEST_CONFIG)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    """Create a user with a default team; returns (user, auth headers)."""
+    def _make_user(username, budget_left=100.0):
+        user = User(username=username, email=f'{username}@example.com')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Team(name=f"{username}'s Team", user_id=user.id, budget_left=budget_left))
+        db.session.commit()
+        token = create_access_token(identity=user.id)
+        return user, {'Authorization': f'Bearer {token}'}
+    return _make_user
+
+
+@pytest.fixture
+def make_player(app):
+    counter = {'api_id': 1000}
+
+    def _make_player(name, points=0, value=5.0, position='Midfielder', team_name='Arsenal'):
+        counter['api_id'] += 1
+        player = Player(api_player_id=counter['api_id'], name=name, team_name=team_name,
+                        position=position, value=value, points=points)
+        db.session.add(player)
+        db.session.commit()
+        return player
+    return _make_player
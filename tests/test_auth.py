@@ -1,24 +1,20 @@
-import pytest
-from app import create_app, db
+from app import db
 from app.models import User
 
-@pytest.fixture
-def client():
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    with app.test_client() as client:
-        with app.app_context():
-            db.create_all()
-            yield client
 
 def test_register(client):
     response = client.post('/auth/register', json={
+        'username': 'tester',
         'email': 'test@example.com',
         'password': 'password123'
     })
-    assert response.status_code ==200 ==201
-    assert b'User registered' in response.data
+    assert response.status_code == 201
+    assert b'User tester registered' in response.data
+    assert User.query.filter_by(username='tester').one().team is not None
+
+    again = client.post('/auth/register', json={'username': 'tester', 'email': 'x@example.com', 'password': 'p'})
+    assert again.status_code == 400
+
 
 def test_login(client):
     user = User(username='test', email='test@example.com')
@@ -30,5 +26,8 @@ def test_login(client):
         'email': 'test@example.com',
         'password': 'password123'
     })
-    assert response.status_code ==200 ==200
-    assert 'access_token' in response.json()
\ No newline at end of file
+    assert response.status_code == 200
+    assert 'access_token' in response.get_json()
+
+    wrong = client.post('/auth/login', json={'email': 'test@example.com', 'password': 'nope'})
+    assert wrong.status_code == 401
@@ -0,0 +1,23 @@
+from benchmarks.run import parse_args, percentile, run_benchmark
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (50, 95, 99)
+    assert percentile([], 50) is None
+
+
+def test_benchmark_report(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.tempdir', str(tmp_path))
+    args = parse_args(['--users', '40', '--leagues', '4', '--players', '60', '--actors', '5',
+                       '--requests', '4', '--concurrency', '2', '--only', 'my_team', 'transfers'])
+    report = run_benchmark(args)
+    assert set(report['scenarios']) == {'my_team', 'transfers'}
+    my_team = report['scenarios']['my_team']
+    assert my_team['endpoints'] == ['teams.get_team']
+    assert my_team['requests'] == 4 and my_team['errors'] == 0
+    assert my_team['p50_ms'] <= my_team['p95_ms'] <= my_team['p99_ms']
+    assert my_team['queries_per_request'] > 0
+    assert report['scenarios']['transfers']['requests'] == 8
+    assert report['meta']['database'] == 'sqlite'
+    assert list(tmp_path.iterdir()) == []  # Database and metrics files are cleaned up
@@ -0,0 +1,28 @@
+from sqlalchemy import func, select
+from app import db
+from app.models import User, Team, League, team_player_table
+
+
+def test_seed_data_command(app):
+    result = app.test_cli_runner().invoke(args=['seed', 'data', '--rows', '220', '--players', '60', '--seed', '1'])
+    assert result.exit_code == 0, result.output
+    assert 'team_players: 220' in result.output
+    assert User.query.count() == Team.query.count() == 20
+    assert League.query.count() == 2
+    assert db.session.scalar(select(func.count()).select_from(team_player_table)) == 220
+
+
+def test_seed_user_command(app, client):
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['seed', 'user', 'sam@example.com', '--password', 'first-pass'])
+    assert result.exit_code == 0, result.output
+    user = User.query.filter_by(email='sam@example.com').one()
+    assert user.username == 'sam' and user.team is not None
+
+    result = runner.invoke(args=['seed', 'user', 'sam@example.com', '--password', 'second-pass'])
+    assert 'Updated user sam' in result.output
+    response = client.post('/auth/login', json={'email': 'sam@example.com', 'password': 'second-pass'})
+    assert response.status_code == 200
+
+    result = runner.invoke(args=['seed', 'user', 'sam@example.org', '--password', 'x'])
+    assert result.exit_code != 0 and 'taken' in result.output
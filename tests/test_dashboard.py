@@ -0,0 +1,44 @@
+from app import db
+from conftest import count_queries
+
+
+def test_dashboard_uses_fixed_queries_and_cache(app, client, make_user, make_player):
+    _, headers = make_user('rae')
+    client.post('/leagues/create', json={'name': 'Rho'}, headers=headers)
+    for i in range(4):
+        player = make_player(f'P{i}', points=10 * i)
+        client.post('/teams/draft', json={'player_id': player.id}, headers=headers)
+
+    response, queries = count_queries(app, lambda: client.get('/dashboard', headers=headers))
+    data = response.get_json()
+    assert queries <= 4
+    assert data['squad_size'] == 4
+    assert [p['points'] for p in data['top_performers']] == [30, 20, 10]
+    assert data['league_rank'] == 1
+
+    response, queries = count_queries(app, lambda: client.get('/dashboard', headers=headers))
+    assert response.get_json() == data
+    assert queries == 1
+
+
+def test_dashboard_cache_invalidated_by_draft_and_scoring(client, make_user, make_player):
+    _, headers = make_user('sid')
+    first = client.get('/dashboard', headers=headers).get_json()
+    assert first['squad_size'] == 0
+
+    player = make_player('Isak', points=15)
+    client.post('/teams/draft', json={'player_id': player.id}, headers=headers)
+    drafted = client.get('/dashboard', headers=headers).get_json()
+    assert drafted['squad_size'] == 1
+    assert drafted['total_points'] == 15
+
+    client.post('/scoreboard/update', headers=headers)
+    scored = client.get('/dashboard', headers=headers).get_json()
+    assert scored['top_performers'][0]['points'] == db.session.get(type(player), player.id).points
+
+
+def test_dashboard_without_team(client, make_user):
+    user, headers = make_user('tia')
+    db.session.delete(user.team)
+    db.session.commit()
+    assert client.get('/dashboard', headers=headers).status_code == 404
@@ -0,0 +1,72 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from app import create_app, db
+from app.config import Config
+from app.database import engine_options
+from app.models import User, Team, Player, Job
+from conftest import TEST_CONFIG
+
+
+def test_engine_options():
+    config = {key: getattr(Config, key) for key in dir(Config) if key.startswith('DB_')}
+    assert engine_options('sqlite:///dreamsquad.db', config) == {'pool_pre_ping': True}
+    assert engine_options('postgresql://localhost/dreamsquad', config) == {
+        'pool_pre_ping': True, 'pool_size': 5, 'max_overflow': 10, 'pool_timeout': 30.0, 'pool_recycle': 1800}
+
+
+def test_sqlite_pragmas(tmp_path):
+    app = create_app({**TEST_CONFIG, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "wal.db"}',
+                      'SQLITE_MMAP_SIZE': 1 << 20})
+    with app.app_context():
+        assert db.session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert db.session.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+        assert db.session.execute(text('PRAGMA mmap_size')).scalar() == 1 << 20
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    app = create_app({**TEST_CONFIG, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "primary.db"}',
+                      'DB_REPLICA_URL': f'sqlite:///{tmp_path / "replica.db"}'})
+    with app.app_context():
+        try:
+            yield app
+        finally:
+            db.session.remove()
+            app.extensions['db_replica'].dispose()
+            db.engine.dispose()
+
+
+def test_reads_go_to_replica_and_writes_to_primary(replica_app):
+    replica = replica_app.extensions['db_replica']
+    db.create_all()
+    db.metadata.create_all(replica)
+    # The same user and team on both sides, as replication would leave them
+    rows = [(User.__table__, {'id': 1, 'username': 'rae', 'email': 'rae@example.com'}),
+            (Team.__table__, {'id': 1, 'name': "rae's Team", 'user_id': 1, 'budget_left': 100.0})]
+    for engine in (db.engine, replica):
+        with engine.begin() as connection:
+            for table, row in rows:
+                connection.execute(table.insert(), row)
+    player = {'api_player_id': 1, 'team_name': 'Arsenal', 'position': 'Midfielder', 'value': 5.0, 'points': 0}
+    with db.engine.begin() as connection:
+        connection.execute(Player.__table__.insert(), {**player, 'id': 1, 'name': 'On primary'})
+    with replica.begin() as connection:
+        connection.execute(Player.__table__.insert(), {**player, 'id': 2, 'name': 'On replica'})
+
+    client = replica_app.test_client()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=1)}'}
+    players = client.get('/players', headers=headers).get_json()['players']
+    assert [p['name'] for p in players] == ['On replica']
+
+    assert client.post('/teams/draft', json={'player_id': 1}, headers=headers).status_code == 201
+    with db.engine.connect() as connection:
+        assert connection.execute(text('SELECT squad_size FROM team')).scalar() == 1
+    with replica.connect() as connection:
+        assert connection.execute(text('SELECT squad_size FROM team')).scalar() == 0
+
+    # Views marked @use_primary read their own writes
+    job = Job(kind='sync_players', status='succeeded')
+    db.session.add(job)
+    db.session.commit()
+    assert client.get(f'/jobs/{job.id}', headers=headers).status_code == 200
@@ -0,0 +1,155 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+from app.football_api import FootballAPIClient, FootballAPIError, RateLimiter
+from app.models import Player
+
+
+class FakeFootballAPI:
+    """Local stand-in for API-Football's paginated /players endpoint."""
+
+    def __init__(self, total_pages=5, per_page=3, delay=0.0, failures=None):
+        self.total_pages = total_pages
+        self.per_page = per_page
+        self.delay = delay
+        self.failures = dict(failures or {})  # page -> number of 503s before success
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def payload(self, page):
+        players = [{
+            'player': {'id': page * 100 + i, 'name': f'Player {page}-{i}', 'photo': None},
+            'statistics': [{'games': {'position': 'Midfielder'}, 'team': {'name': 'Arsenal'}}],
+        } for i in range(self.per_page)]
+        return {'paging': {'current': page, 'total': self.total_pages}, 'errors': [], 'response': players}
+
+    def __enter__(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                page = int(parse_qs(urlparse(self.path).query)['page'][0])
+                with api.lock:
+                    api.requests.append((page, self.headers.get('x-apisports-key')))
+                    api.in_flight += 1
+                    api.max_in_flight = max(api.max_in_flight, api.in_flight)
+                    failing = api.failures.get(page, 0) > 0
+                    if failing:
+                        api.failures[page] -= 1
+                time.sleep(api.delay)
+                body = b'{}' if failing else json.dumps(api.payload(page)).encode()
+                self.send_response(503 if failing else 200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with api.lock:
+                    api.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_client(api, **kwargs):
+    options = {'workers': 4, 'backoff': 0.01, 'requests_per_minute': 60000}
+    options.update(kwargs)
+    return FootballAPIClient('test-key', base_url=api.url, **options)
+
+
+def test_remaining_pages_are_fetched_concurrently_in_order():
+    with FakeFootballAPI(total_pages=8, delay=0.05) as api:
+        pages = list(make_client(api).fetch_pages('players', {'league': '39'}))
+
+    assert [p['paging']['current'] for p in pages] == list(range(1, 9))
+    assert api.requests[0] == (1, 'test-key')
+    assert 1 < api.max_in_flight <= 4
+
+
+def test_transient_errors_are_retried_with_backoff():
+    with FakeFootballAPI(total_pages=3, failures={2: 2}) as api:
+        pages = list(make_client(api).fetch_pages('players', {}))
+    assert len(pages) == 3
+    assert [page for page, _ in api.requests].count(2) == 3
+
+
+def test_gives_up_after_max_retries():
+    with FakeFootballAPI(total_pages=2, failures={2: 10}) as api:
+        with pytest.raises(FootballAPIError):
+            list(make_client(api, max_retries=2).fetch_pages('players', {}))
+    assert [page for page, _ in api.requests].count(2) == 3
+
+
+def test_rate_limiter_spaces_requests():
+    clock = {'now': 0.0}
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock['now'] += seconds
+
+    limiter = RateLimiter(60, per=60.0, burst=2, clock=lambda: clock['now'], sleep=sleep)
+    for _ in range(4):
+        limiter.acquire()
+    # Two requests from the burst, then one per second
+    assert clock['now'] == pytest.approx(2.0)
+
+
+def test_sync_route_imports_every_page(app, client, make_user):
+    _, headers = make_user('ned')
+    with FakeFootballAPI(total_pages=4, per_page=2) as api:
+        app.config.update(API_FOOTBALL_KEY='test-key', API_FOOTBALL_URL=api.url,
+                          API_FOOTBALL_BACKOFF=0.01, API_FOOTBALL_REQUESTS_PER_MINUTE=60000)
+        response = client.post('/players/sync', headers=headers)
+
+    assert response.status_code == 202
+    job = client.get(response.get_json()['status_url'], headers=headers).get_json()
+    assert job['status'] == 'succeeded'
+    assert (job['pages_done'], job['pages_total'], job['rows_written']) == (4, 4, 8)
+    assert Player.query.count() == 8
+
+
+def test_sync_upserts_changed_players(app, client, make_user):
+    _, headers = make_user('ola')
+
+    def sync():
+        job_url = client.post('/players/sync', headers=headers).get_json()['status_url']
+        return client.get(job_url, headers=headers).get_json()['result']
+
+    with FakeFootballAPI(total_pages=2, per_page=2) as api:
+        app.config.update(API_FOOTBALL_KEY='test-key', API_FOOTBALL_URL=api.url,
+                          API_FOOTBALL_BACKOFF=0.01, API_FOOTBALL_REQUESTS_PER_MINUTE=60000)
+        first = sync()
+        assert (first['added'], first['updated']) == (4, 0)
+        points = {p.api_player_id: p.points for p in Player.query}
+
+        # Unchanged rows are not rewritten
+        second = sync()
+        assert (second['added'], second['updated']) == (0, 0)
+
+        original_payload = api.payload
+        def transferred(page):
+            data = original_payload(page)
+            data['response'][0]['statistics'][0]['team']['name'] = 'Chelsea'
+            return data
+        api.payload = transferred
+        third = sync()
+
+    assert (third['added'], third['updated']) == (0, 2)
+    assert Player.query.filter_by(team_name='Chelsea').count() == 2
+    assert {p.api_player_id: p.points for p in Player.query} == points
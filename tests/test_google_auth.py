@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import rsa
+from google.auth import crypt, jwt as google_jwt
+from app import db
+from app.google_auth import GoogleCertCache, next_free_username
+from app.models import User
+
+CLIENT_ID = 'test-client.apps.googleusercontent.com'
+
+
+class FakeGoogleCerts:
+    """Local stand-in for Google's certificate endpoint, with freshly generated keys."""
+
+    def __init__(self, max_age=3600):
+        self.max_age = max_age
+        self.keys = {}
+        self.rotations = 0
+        self.hits = 0
+        self.rotate()
+
+    def rotate(self):
+        public_key, private_key = rsa.newkeys(1024)
+        self.rotations += 1
+        self.key_id = f'key-{self.rotations}'
+        self.keys = {self.key_id: (public_key.save_pkcs1().decode(), private_key.save_pkcs1().decode())}
+
+    def token(self, **claims):
+        now = int(time.time())
+        payload = {'iss': 'https://accounts.google.com', 'aud': CLIENT_ID, 'iat': now, 'exp': now + 600,
+                   'sub': 'google-1', 'email': 'ann@example.com', 'name': 'Ann Lee', **claims}
+        signer = crypt.RSASigner.from_string(self.keys[self.key_id][1], key_id=self.key_id)
+        return google_jwt.encode(signer, payload).decode()
+
+    def __enter__(self):
+        certs = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                certs.hits += 1
+                body = json.dumps({kid: public for kid, (public, _) in certs.keys.items()}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Cache-Control', f'public, max-age={certs.max_age}, must-revalidate')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/oauth2/v1/certs'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def google(app):
+    with FakeGoogleCerts() as certs:
+        app.config.update(GOOGLE_CERTS_URL=certs.url, GOOGLE_CLIENT_ID=CLIENT_ID)
+        yield certs
+
+
+def test_google_login_fetches_certs_once(client, google):
+    first = client.post('/auth/google', json={'id_token': google.token()})
+    assert first.status_code == 200
+    assert first.get_json()['username'] == 'Ann_Lee'
+    again = client.post('/auth/google', json={'id_token': google.token()})
+    assert again.get_json()['username'] == 'Ann_Lee'  # Returning users keep their name
+    assert google.hits == 1
+    assert User.query.filter_by(google_id='google-1').one().team is not None
+
+
+def test_google_login_rejects_bad_tokens(client, google):
+    for token in (google.token(aud='someone-else'), google.token(iss='https://evil.example.com'),
+                  google.token(exp=int(time.time()) - 3600), 'not-a-jwt'):
+        response = client.post('/auth/google', json={'id_token': token})
+        assert response.status_code == 400
+        assert response.get_json()['message'].startswith('Token verification failed')
+
+
+def test_google_login_rejects_existing_email(client, google):
+    db.session.add(User(username='ann', email='ann@example.com'))
+    db.session.commit()
+    assert client.post('/auth/google', json={'id_token': google.token()}).status_code == 400
+
+
+def test_cert_cache_honours_max_age_and_rotation(google):
+    now = [0.0]
+    google.max_age = 100
+    cache = GoogleCertCache(google.url, clock=lambda: now[0], min_refresh_interval=10)
+    first_key = google.key_id
+    assert first_key in cache.get(first_key)
+    now[0] = 5
+    google.rotate()
+    assert google.key_id not in cache.get(google.key_id)  # Refetched too recently
+    assert google.hits == 1
+
+    now[0] = 20
+    assert google.key_id in cache.get(google.key_id)  # Early refetch for an unknown key
+    now[0] = 119
+    cache.get()
+    assert google.hits == 2
+    now[0] = 120
+    cache.get()
+    assert google.hits == 3
+
+
+def test_next_free_username_skips_taken_suffixes(app):
+    db.session.add_all([User(username=name, email=f'{i}@example.com')
+                        for i, name in enumerate(['Ann_Lee', 'Ann_Lee1', 'Ann_Lee3', 'AnnXLee2'])])
+    db.session.commit()
+    assert next_free_username('Ann_Lee') == 'Ann_Lee2'
+    assert next_free_username('Bob') == 'Bob'
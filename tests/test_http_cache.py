@@ -0,0 +1,69 @@
+import gzip
+
+
+def test_catalogue_etag_and_304(client, make_user, make_player):
+    _, headers = make_user('jay')
+    make_player('Foden', points=10)
+
+    first = client.get('/players', headers=headers)
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+
+    cached = client.get('/players', headers={**headers, 'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    # Different query string, different representation
+    other = client.get('/players?sort=name', headers={**headers, 'If-None-Match': etag})
+    assert other.status_code == 200
+
+    client.post('/scoreboard/update', headers=headers)
+    changed = client.get('/players', headers={**headers, 'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+
+def test_league_versions_follow_membership_and_drafts(client, make_user, make_player):
+    _, owner_headers = make_user('kim')
+    _, member_headers = make_user('lou')
+    league_id = client.post('/leagues/create', json={'name': 'Kappa'}, headers=owner_headers).get_json()['league_id']
+    code = client.get(f'/leagues/{league_id}', headers=owner_headers).get_json()['code']
+
+    def etag(path):
+        response = client.get(path, headers=owner_headers)
+        assert response.status_code == 200
+        return response.headers['ETag']
+
+    details, public = etag(f'/leagues/{league_id}'), etag('/leagues/public')
+    assert client.get(f'/leagues/{league_id}', headers={**owner_headers, 'If-None-Match': details}).status_code == 304
+
+    client.post('/leagues/join', json={'code': code}, headers=member_headers)
+    assert etag(f'/leagues/{league_id}') != details
+    assert etag('/leagues/public') != public
+
+    details = etag(f'/leagues/{league_id}')
+    player = make_player('Rodri', points=12)
+    client.post('/teams/draft', json={'player_id': player.id}, headers=member_headers)
+    assert etag(f'/leagues/{league_id}') != details
+
+
+def test_large_responses_are_gzipped(app, client, make_user, make_player):
+    _, headers = make_user('max')
+    for i in range(30):
+        make_player(f'Player number {i}', points=i)
+
+    response = client.get('/players', headers={**headers, 'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'].endswith('-gzip"')
+    assert b'Player number' in gzip.decompress(response.data)
+    cached = client.get('/players', headers={**headers, 'Accept-Encoding': 'gzip',
+                                             'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+    assert cached.headers['ETag'] == response.headers['ETag']
+
+    plain = client.get('/players', headers=headers)
+    assert 'Content-Encoding' not in plain.headers
+
+    app.config['GZIP_MIN_SIZE'] = 10 ** 6
+    small = client.get('/players', headers={**headers, 'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
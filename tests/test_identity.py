@@ -0,0 +1,36 @@
+from flask_jwt_extended import create_access_token
+from app.identity import Identity, load_identity
+from app.models import Team
+from conftest import count_queries
+
+
+def test_identity_loaded_once_and_cached(app, client, make_user):
+    user, headers = make_user('uma')
+    team = Team.query.filter_by(user_id=user.id).one()
+
+    identity, queries = count_queries(app, lambda: load_identity(user.id))
+    assert identity == Identity(user.id, 'uma', team.id, None)
+    assert queries == 1
+    assert count_queries(app, lambda: load_identity(user.id)) == (identity, 0)
+
+
+def test_league_moves_refresh_identity(client, make_user):
+    user, headers = make_user('vic')
+    client.get('/leagues/my-leagues', headers=headers)
+    league_id = client.post('/leagues/create', json={'name': 'Vee'}, headers=headers).get_json()['league_id']
+    assert load_identity(user.id).league_id == league_id
+
+    _, other_headers = make_user('wes')
+    code = client.post('/leagues/create', json={'name': 'Wee'}, headers=other_headers).get_json()['league_code']
+    client.post('/leagues/join', json={'code': code}, headers=headers)
+    assert load_identity(user.id).league_id != league_id
+
+    response = client.get('/leagues/my-leagues', headers=headers)
+    assert sorted(league['name'] for league in response.get_json()) == ['Vee', 'Wee']
+
+
+def test_unknown_user_is_rejected(client):
+    headers = {'Authorization': f'Bearer {create_access_token(identity=12345)}'}
+    response = client.get('/teams/my-team', headers=headers)
+    assert response.status_code == 401
+    assert response.get_json()['message'] == 'User not found'
@@ -0,0 +1,91 @@
+import pytest
+from app import db
+from app.football_api import FootballAPIError
+from app.jobs import JOB_HANDLERS, JobAlreadyRunning, enqueue
+from app.models import Job, Player
+
+
+def test_job_lifecycle_and_status_route(app, client, make_user, monkeypatch):
+    _, headers = make_user('pam')
+
+    def echo(job, value):
+        job.rows_written = value
+        return {'value': value}
+    monkeypatch.setitem(JOB_HANDLERS, 'test_echo', echo)
+
+    job = enqueue('test_echo', {'value': 3})
+    data = client.get(f'/jobs/{job.id}', headers=headers).get_json()
+    assert data['status'] == 'succeeded'
+    assert data['result'] == {'value': 3}
+    assert data['rows_written'] == 3
+    assert client.get('/jobs/999', headers=headers).status_code == 404
+
+
+def test_failed_job_records_error(app, monkeypatch):
+    def fail(job):
+        raise RuntimeError('boom')
+    monkeypatch.setitem(JOB_HANDLERS, 'test_fail', fail)
+
+    job = enqueue('test_fail')
+    db.session.expire_all()
+    assert job.status == 'failed'
+    assert job.error == 'boom'
+    # A failed job releases the single-flight slot
+    assert enqueue('test_fail').id != job.id
+
+
+def test_jobs_of_the_same_kind_never_overlap(app, client, make_user, monkeypatch):
+    _, headers = make_user('quinn')
+
+    def block(job):
+        return {}
+    monkeypatch.setitem(JOB_HANDLERS, 'test_block', block)
+
+    # Simulate a job picked up by another worker and still running
+    running = Job(kind='test_block', status='running')
+    db.session.add(running)
+    db.session.commit()
+    with pytest.raises(JobAlreadyRunning) as e:
+        enqueue('test_block')
+    assert e.value.job.id == running.id
+
+    response = client.post('/scoreboard/update', headers=headers)
+    assert response.status_code == 202  # Other kinds are unaffected
+
+
+def test_abandoned_jobs_are_failed_before_enqueueing(app, monkeypatch):
+    def stale(job):
+        return {}
+    monkeypatch.setitem(JOB_HANDLERS, 'test_stale', stale)
+
+    app.config['JOB_STALE_SECONDS'] = 0
+    abandoned = Job(kind='test_stale', status='running')
+    db.session.add(abandoned)
+    db.session.commit()
+
+    job = enqueue('test_stale')
+    db.session.expire_all()
+    assert abandoned.status == 'failed'
+    assert job.status == 'succeeded'
+
+
+def test_sync_failing_partway_still_invalidates_the_catalogue(client, make_user, monkeypatch):
+    _, headers = make_user('rita')
+    etag = client.get('/players', headers=headers).headers['ETag']
+
+    class FailingClient:
+        def fetch_pages(self, endpoint, params):
+            yield {'paging': {'total': 2}, 'response': [{
+                'player': {'id': 7, 'name': 'Saka'},
+                'statistics': [{'games': {'position': 'Midfielder'}, 'team': {'name': 'Arsenal'}}],
+            }]}
+            raise FootballAPIError('page 2 failed')
+
+    monkeypatch.setattr('app.football_api.get_client', FailingClient)
+    job = enqueue('players_sync')
+    db.session.expire_all()
+    assert job.status == 'failed' and job.pages_done == 1
+    # The first page stays committed, so cached player lists must not revalidate
+    assert Player.query.filter_by(api_player_id=7).count() == 1
+    response = client.get('/players', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
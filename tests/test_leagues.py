@@ -1,18 +1,97 @@
-import pytest
-from app import create_app, db
-from app.models import League
-
-@pytest.fixture
-def client():
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    with app.test_client() as client:
-        with app.app_context():
-            db.create_all()
-            yield client
-
-def test_create_league(client):
-    response = client.post('/leagues/league', json={'name': 'Test League', 'is_private': False}, headers={'Authorization': 'Bearer {mock_jwt}'})
+from app import db
+from app.models import League, Team
+from app.routes.leagues import _prefix_upper_bound
+from app.utils import encode_cursor
+
+
+def test_create_join_and_view_league(client, make_user, make_player):
+    owner, owner_headers = make_user('owner')
+    _, member_headers = make_user('member')
+    response = client.post('/leagues/create', json={'name': 'Test League'}, headers=owner_headers)
     assert response.status_code == 201
-    assert 'id' in response.json()
\ No newline at end of file
+    created = response.get_json()
+
+    assert client.post('/leagues/join', json={'code': created['league_code']}, headers=member_headers).status_code == 200
+    assert client.post('/leagues/join', json={'code': 'NOPE'}, headers=member_headers).status_code == 404
+    player = make_player('Palmer', points=12)
+    client.post('/teams/draft', json={'player_id': player.id}, headers=member_headers)
+
+    details = client.get(f"/leagues/{created['league_id']}", headers=owner_headers).get_json()
+    assert [(row['rank'], row['owner_name'], row['points']) for row in details['standings']] == [
+        (1, 'member', 12), (2, 'owner', 0)]
+
+    mine = client.get('/leagues/my-leagues', headers=owner_headers).get_json()
+    assert mine == [{'id': created['league_id'], 'name': 'Test League', 'members': 2, 'maxMembers': 12,
+                     'code': created['league_code'], 'rank': 2, 'points': 0, 'isOwner': True}]
+
+
+def test_leave_and_delete_league(client, make_user):
+    owner, owner_headers = make_user('owner')
+    member, member_headers = make_user('member')
+    created = client.post('/leagues/create', json={'name': 'Short-lived'}, headers=owner_headers).get_json()
+    league_id = created['league_id']
+    client.post('/leagues/join', json={'code': created['league_code']}, headers=member_headers)
+
+    assert client.post(f'/leagues/{league_id}/leave', headers=owner_headers).status_code == 403
+    assert client.post(f'/leagues/{league_id}/leave', headers=member_headers).status_code == 200
+    assert client.post(f'/leagues/{league_id}/leave', headers=member_headers).status_code == 400
+    assert db.session.get(League, league_id).member_count == 1
+    assert Team.query.filter_by(user_id=member.id).one().league_id is None
+
+    assert client.delete(f'/leagues/{league_id}', headers=member_headers).status_code == 403
+    assert client.delete(f'/leagues/{league_id}', headers=owner_headers).status_code == 200
+    assert Team.query.filter_by(user_id=owner.id).one().league_id is None
+    assert client.get('/leagues/my-leagues', headers=owner_headers).get_json() == []
+
+
+def test_join_respects_capacity(client, make_user):
+    _, owner_headers = make_user('owner')
+    created = client.post('/leagues/create', json={'name': 'Tiny'}, headers=owner_headers).get_json()
+    league = db.session.get(League, created['league_id'])
+    league.max_members = 2
+    db.session.commit()
+
+    _, first_headers = make_user('first')
+    _, second_headers = make_user('second')
+    assert client.post('/leagues/join', json={'code': created['league_code']}, headers=first_headers).status_code == 200
+    assert client.post('/leagues/join', json={'code': created['league_code']}, headers=first_headers).status_code == 400
+    response = client.post('/leagues/join', json={'code': created['league_code']}, headers=second_headers)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'This league is full'
+    db.session.expire_all()
+    assert db.session.get(League, created['league_id']).member_count == 2
+
+
+def test_public_leagues_pages_search_and_open_slots(client, make_user):
+    owner, headers = make_user('owner')
+    names = ['Alpha', 'alpine', 'Beta', 'Bravo', 'Charlie', 'Élan']
+    db.session.add_all([League(name=name, owner_id=owner.id, is_private=False, code=f'PUB{i}',
+                               member_count=12 if name == 'Beta' else 1) for i, name in enumerate(names)])
+    db.session.add(League(name='Hidden', owner_id=owner.id, is_private=True, code='PRIV'))
+    db.session.commit()
+
+    def names_of(url):
+        body = client.get(url, headers=headers).get_json()
+        return [league['name'] for league in body['leagues']], body['next_cursor']
+
+    first, cursor = names_of('/leagues/public?limit=2')
+    assert first == ['Alpha', 'alpine']
+    second, cursor = names_of(f'/leagues/public?limit=2&cursor={cursor}')
+    assert second == ['Beta', 'Bravo']
+    assert names_of(f'/leagues/public?limit=2&cursor={cursor}') == (['Charlie', 'Élan'], None)
+
+    assert names_of('/leagues/public?q=AL')[0] == ['Alpha', 'alpine']
+    assert names_of('/leagues/public?q=b&open=true')[0] == ['Bravo']
+    assert names_of('/leagues/public?q=É')[0] == ['Élan']
+    assert names_of('/leagues/public?q=\U0010FFFF')[0] == []
+    assert client.get('/leagues/public?cursor=bad', headers=headers).status_code == 400
+    for tampered in ([{'a': 1}, 1], [['x'], 1], ['alpha', 'x']):
+        assert client.get(f'/leagues/public?cursor={encode_cursor(tampered)}', headers=headers).status_code == 400
+    assert client.get('/leagues/public?limit=0', headers=headers).status_code == 400
+
+
+def test_prefix_upper_bound():
+    assert _prefix_upper_bound('ab') == 'ac'
+    assert _prefix_upper_bound('a\U0010FFFF') == 'b'
+    assert _prefix_upper_bound('\U0010FFFF') is None
+    assert _prefix_upper_bound('\ud7ff') == '\ue000'
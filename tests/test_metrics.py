@@ -0,0 +1,72 @@
+import logging
+import os
+import runpy
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from app import create_app, db
+from app.metrics import slow_query_logger
+from conftest import TEST_CONFIG
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_and_queries_are_recorded(client, make_user):
+    _, headers = make_user('zoe')
+    labels = {'endpoint': 'teams.get_team', 'method': 'GET', 'status': '200'}
+    before = sample('http_request_duration_seconds_count', **labels)
+    queries_before = sample('db_queries_total', endpoint='teams.get_team')
+
+    assert client.get('/teams/my-team', headers=headers).status_code == 200
+
+    assert sample('http_request_duration_seconds_count', **labels) == before + 1
+    assert sample('db_queries_total', endpoint='teams.get_team') > queries_before
+    assert sample('db_query_seconds_total', endpoint='teams.get_team') > 0
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    assert 'http_request_duration_seconds_bucket{endpoint="teams.get_team"' in body
+    assert 'http_request_db_queries_count{endpoint="teams.get_team"}' in body
+
+
+def test_failed_queries_are_counted(app, make_user):
+    make_user('bea')
+    before = sample('db_queries_total', endpoint='background')
+    with pytest.raises(IntegrityError):
+        db.session.execute(text("INSERT INTO user (username, email) VALUES ('bea', 'other@example.com')"))
+    db.session.rollback()
+    assert sample('db_queries_total', endpoint='background') == before + 1
+
+
+def test_slow_query_log(app, client, make_user):
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    slow_query_logger.addHandler(handler)
+    try:
+        app.config['SLOW_QUERY_MS'] = 0
+        _, headers = make_user('amy')
+        client.get('/teams/my-team', headers=headers)
+    finally:
+        slow_query_logger.removeHandler(handler)
+    fields = [record.fields for record in records if record.fields['endpoint'] == 'teams.get_team']
+    assert fields and all('SELECT' in f['statement'] for f in fields)
+
+
+def test_metrics_can_be_disabled():
+    app = create_app({**TEST_CONFIG, 'METRICS_ENABLED': False})
+    assert app.test_client().get('/metrics').status_code == 404
+
+
+def test_gunicorn_startup_clears_only_metric_files(tmp_path, monkeypatch):
+    (tmp_path / 'counter_123.db').write_text('')
+    (tmp_path / 'unrelated.txt').write_text('')
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    config = runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'gunicorn.conf.py'))
+    config['on_starting'](None)
+    assert os.listdir(tmp_path) == ['unrelated.txt']
@@ -0,0 +1,55 @@
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import inspect, text
+from app import create_app, db
+from app.commands import init_migrations
+from conftest import TEST_CONFIG
+
+
+def test_migrations_match_models(tmp_path):
+    app = create_app({**TEST_CONFIG, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "migrated.db"}'})
+    init_migrations(app)
+    with app.app_context():
+        upgrade()
+        with db.engine.connect() as connection:
+            assert compare_metadata(MigrationContext.configure(connection), db.metadata) == []
+
+        downgrade(revision='base')
+        assert inspect(db.engine).get_table_names() == ['alembic_version']
+
+
+def test_upgrade_from_baseline_backfills_stored_counts(tmp_path):
+    app = create_app({**TEST_CONFIG, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "old.db"}'})
+    init_migrations(app)
+    with app.app_context():
+        # A database as the original create_db.py built it, with a scored squad
+        upgrade(revision='0dddf4716f20')
+        with db.engine.begin() as connection:
+            for statement in (
+                "INSERT INTO user (id, username, email) VALUES (1, 'ann', 'ann@example.com')",
+                "INSERT INTO league (id, name, owner_id, code) VALUES (1, 'Old League', 1, 'OLD1')",
+                "INSERT INTO league_member (user_id, league_id) VALUES (1, 1)",
+                "INSERT INTO team (id, name, user_id, league_id, budget_left) VALUES (1, 'Ann FC', 1, 1, 90.0)",
+                "INSERT INTO player (id, api_player_id, name, team_name, position, value, points) VALUES "
+                "(1, 10, 'Saka', 'Arsenal', 'Midfielder', 5.0, 7), (2, 11, 'Raya', 'Arsenal', 'Goalkeeper', 5.0, 3)",
+                "INSERT INTO team_player (team_id, player_id) VALUES (1, 1), (1, 2)",
+            ):
+                connection.execute(text(statement))
+
+        upgrade()
+        with db.engine.connect() as connection:
+            assert connection.execute(text('SELECT total_points, squad_size FROM team')).one() == (10, 2)
+            assert connection.execute(text('SELECT total_points, member_count FROM league')).one() == (10, 1)
+
+
+def test_seed_init_stamps_latest_revision(tmp_path):
+    app = create_app({**TEST_CONFIG, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "seeded.db"}'})
+    result = app.test_cli_runner().invoke(args=['seed', 'init'])
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        with db.engine.connect() as connection:
+            head = MigrationContext.configure(connection).get_current_revision()
+    assert head is not None
+    result = app.test_cli_runner().invoke(args=['db', 'upgrade'])
+    assert result.exit_code == 0, result.output
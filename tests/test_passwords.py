@@ -0,0 +1,63 @@
+import pytest
+from app import db
+from app.models import User
+from app.passwords import PasswordHasher, hash_parameters, hash_password, verify_password
+
+
+@pytest.mark.parametrize('scheme, cost', [('bcrypt', 4), ('pbkdf2', 1000), ('scrypt', 10)])
+def test_hash_round_trip(scheme, cost):
+    password_hash = hash_password('s3cret', scheme, cost)
+    assert verify_password(password_hash, 's3cret')
+    assert not verify_password(password_hash, 'wrong')
+    assert hash_parameters(password_hash) == (scheme, cost)
+
+
+@pytest.fixture
+def fast_hasher(app):
+    hasher = PasswordHasher('bcrypt', cost=4, workers=1, max_pending=1, wait_seconds=0.01)
+    app.extensions['password_hasher'] = hasher
+    return hasher
+
+
+def test_login_rehashes_to_configured_scheme(client, fast_hasher):
+    user = User(username='old', email='old@example.com',
+                password_hash=hash_password('s3cret', 'pbkdf2', 1000))
+    db.session.add(user)
+    db.session.commit()
+
+    response = client.post('/auth/login', json={'email': 'old@example.com', 'password': 's3cret'})
+    assert response.status_code == 200
+    db.session.refresh(user)
+    assert hash_parameters(user.password_hash) == ('bcrypt', 4)
+    assert client.post('/auth/login', json={'email': 'old@example.com', 'password': 's3cret'}).status_code == 200
+    assert client.post('/auth/login', json={'email': 'old@example.com', 'password': 'nope'}).status_code == 401
+
+
+def test_login_keeps_hash_bcrypt_cannot_take(client, fast_hasher):
+    password = 'x' * 80
+    old_hash = hash_password(password, 'scrypt', 10)
+    db.session.add(User(username='long', email='long@example.com', password_hash=old_hash))
+    db.session.commit()
+
+    response = client.post('/auth/login', json={'email': 'long@example.com', 'password': password})
+    assert response.status_code == 200
+    assert db.session.scalar(db.select(User.password_hash).filter_by(email='long@example.com')) == old_hash
+
+
+def test_saturated_hasher_returns_503(client, fast_hasher):
+    assert client.post('/auth/register', json={'username': 'new', 'email': 'new@example.com',
+                                                'password': 's3cret'}).status_code == 201
+    fast_hasher._pending.acquire()  # Another request is hashing
+    try:
+        response = client.post('/auth/login', json={'email': 'new@example.com', 'password': 's3cret'})
+    finally:
+        fast_hasher._pending.release()
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_password_benchmark_command(app):
+    result = app.test_cli_runner().invoke(args=['password-benchmark', '--scheme', 'bcrypt', '--target-ms', '50'])
+    assert result.exit_code == 0
+    assert 'bcrypt cost 4:' in result.output
+    assert 'PASSWORD_SCHEME=bcrypt PASSWORD_COST=' in result.output
@@ -0,0 +1,65 @@
+from sqlalchemy import text
+from app import db
+from app.utils import encode_cursor
+
+
+def _pages(client, headers, **params):
+    """Follow next_cursor until the last page; returns the pages' player lists."""
+    pages = []
+    params = dict(params)
+    while True:
+        data = client.get('/players', query_string=params, headers=headers).get_json()
+        pages.append(data['players'])
+        if not data['next_cursor']:
+            return pages
+        params['cursor'] = data['next_cursor']
+
+
+def test_keyset_pages_cover_catalogue_once(client, make_user, make_player):
+    _, headers = make_user('gus')
+    for i in range(7):
+        make_player(f'Player {i}', points=i % 3)  # Lots of ties on points
+
+    pages = _pages(client, headers, limit=3)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    rows = [p for page in pages for p in page]
+    assert len({p['id'] for p in rows}) == 7
+    assert [p['points'] for p in rows] == sorted((p['points'] for p in rows), reverse=True)
+
+    names = [p['name'] for page in _pages(client, headers, sort='name', limit=2) for p in page]
+    assert names == sorted(names)
+
+
+def test_catalogue_filters(client, make_user, make_player):
+    _, headers = make_user('hal')
+    make_player('Keeper', position='Goalkeeper', value=4.5, points=50, team_name='Chelsea')
+    make_player('Cheap', position='Defender', value=4.0, points=5, team_name='Arsenal')
+    make_player('Pricey', position='Defender', value=9.0, points=80, team_name='Arsenal')
+
+    def names(**params):
+        data = client.get('/players', query_string=params, headers=headers).get_json()
+        return [p['name'] for p in data['players']]
+
+    assert names(position='Defender') == ['Pricey', 'Cheap']
+    assert names(club='Chelsea') == ['Keeper']
+    assert names(min_value=4.2, max_value=5.0) == ['Keeper']
+    assert names(min_points=40, sort='value', order='asc') == ['Keeper', 'Pricey']
+
+
+def test_catalogue_rejects_bad_params(client, make_user):
+    _, headers = make_user('ivy')
+    assert client.get('/players?sort=age', headers=headers).status_code == 400
+    assert client.get('/players?limit=0', headers=headers).status_code == 400
+    assert client.get('/players?cursor=not-a-cursor', headers=headers).status_code == 400
+    for tampered in ([{'a': 1}, 1], [['x'], 1], [10, '1'], [True, 1]):
+        assert client.get(f'/players?cursor={encode_cursor(tampered)}', headers=headers).status_code == 400
+    assert client.get(f"/players?sort=name&cursor={encode_cursor([5, 1])}", headers=headers).status_code == 400
+
+
+def test_catalogue_page_query_uses_index(app):
+    plan = db.session.execute(text(
+        'EXPLAIN QUERY PLAN SELECT * FROM player WHERE position = :p AND (points, id) < (:v, :i) '
+        'ORDER BY points DESC, id DESC LIMIT 51'), {'p': 'Defender', 'v': 10, 'i': 5}).all()
+    detail = ' '.join(row[-1] for row in plan)
+    assert 'ix_player_position_points_id' in detail
+    assert 'TEMP B-TREE' not in detail
@@ -1,24 +1,14 @@
-import pytest
-from app import create_app, db
-from app.models import Player
+def test_get_players(client, make_user, make_player):
+    _, headers = make_user('scout')
+    make_player('Erling Haaland', team_name='Man City', position='Attacker', value=15.0)
 
-@pytest.fixture
-def client():
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    with app.test_client() as client:
-        with app.app_context():
-            db.create_all()
-            yield client
+    response = client.get('/players', headers=headers)
+    assert response.status_code == 200
+    players = response.get_json()['players']
+    assert len(players) == 1
+    assert players[0]['name'] == 'Erling Haaland'
+    assert players[0]['team'] == 'Man City'
 
-def test_get_players(client):
-    player = Player(name='Erling Haaland', team='Man City', position='Forward', value=15.0)
-    db.session.add(player)
-    db.session.commit()
 
-    response = client.get('/players', headers={'Authorization': 'Bearer {mock_jwt}'})
-    assert response.status_code == 200
-    # Note: JWT auth requires proper setup
-    assert len(response.json()) == 1
-    assert response.json()[0]['name'] == 'Erling Haaland'
\ No newline at end of file
+def test_players_require_login(client):
+    assert client.get('/players').status_code == 401
@@ -0,0 +1,63 @@
+from app import db
+from app.models import Team, League
+from app.points import rebuild_points
+
+
+def test_draft_and_remove_maintain_team_and_league_points(client, make_user, make_player):
+    user, headers = make_user('alice')
+    assert client.post('/leagues/create', json={'name': 'Alpha'}, headers=headers).status_code == 201
+    salah = make_player('Salah', points=40)
+    saka = make_player('Saka', points=25)
+
+    assert client.post('/teams/draft', json={'player_id': salah.id}, headers=headers).status_code == 201
+    assert client.post('/teams/draft', json={'player_id': saka.id}, headers=headers).status_code == 201
+
+    team = Team.query.filter_by(user_id=user.id).one()
+    assert team.total_points == 65
+    assert db.session.get(League, team.league_id).total_points == 65
+
+    assert client.post('/teams/remove_player', json={'player_id': salah.id}, headers=headers).status_code == 200
+    db.session.expire_all()
+    assert team.total_points == 25
+    assert team.league.total_points == 25
+
+
+def test_update_scores_keeps_stored_points_in_sync(client, make_user, make_player):
+    user, headers = make_user('bob')
+    client.post('/leagues/create', json={'name': 'Beta'}, headers=headers)
+    for i in range(3):
+        player = make_player(f'Player {i}', points=10)
+        client.post('/teams/draft', json={'player_id': player.id}, headers=headers)
+
+    assert client.post('/scoreboard/update', headers=headers).status_code == 202
+
+    team = Team.query.filter_by(user_id=user.id).one()
+    assert team.total_points == sum(p.points for p in team.players)
+    assert team.league.total_points == team.total_points
+
+
+def test_rebuild_points_recomputes_from_squads(app, make_user, make_player):
+    user, _ = make_user('carol')
+    team = Team.query.filter_by(user_id=user.id).one()
+    league = League(name='Gamma', owner_id=user.id)
+    db.session.add(league)
+    db.session.flush()
+    team.league_id = league.id
+    squad = [make_player('A', points=7), make_player('B', points=5)]
+    team.players.extend(squad)
+    team.total_points = 999
+    db.session.commit()
+
+    rebuild_points()
+    db.session.commit()
+
+    assert team.total_points == 12
+    assert league.total_points == 12
+
+    runner = app.test_cli_runner()
+    team.total_points = 0
+    db.session.commit()
+    result = runner.invoke(args=['rebuild-points'])
+    assert result.exit_code == 0
+    db.session.expire_all()
+    assert team.total_points == 12
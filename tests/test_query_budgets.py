@@ -0,0 +1,74 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from app import db
+from app.identity import forget_identity
+from app.models import User, Team, League, Player, league_member_table, team_player_table
+from app.points import rebuild_points
+from conftest import count_queries
+
+# SQL statements each hot endpoint may run, including the JWT identity lookup
+# on a cold cache. Every budget must hold for a small and a large dataset,
+# so a lazy load per league, team or player fails here.
+QUERY_BUDGETS = {
+    '/dashboard': 5,
+    '/leagues/my-leagues': 2,
+    '/leagues/{league_id}': 3,
+    '/teams/my-team': 3,
+    '/players': 3,
+}
+
+
+def seed(size):
+    """
+    Seed `size` leagues the main user belongs to, `size` rival teams in the
+    user's current league and `size * 11` players, with full squads.
+    Returns:
+        tuple: (main user, the user's current league).
+    """
+    players = [Player(api_player_id=i, name=f'Player {i}', team_name='Arsenal', position='Midfielder',
+                      value=1.0, points=i % 17) for i in range(size * 11)]
+    users = [User(username=f'user{i}', email=f'user{i}@example.com') for i in range(size + 1)]
+    db.session.add_all(players + users)
+    db.session.flush()
+    main = users[0]
+    leagues = [League(name=f'League {i}', code=f'CODE{i:04d}', owner_id=main.id) for i in range(size)]
+    db.session.add_all(leagues)
+    db.session.flush()
+
+    current = leagues[0]
+    for i, user in enumerate(users):
+        db.session.add(Team(name=f'Team {i}', user_id=user.id, league_id=current.id))
+    db.session.flush()
+    teams = Team.query.all()
+    db.session.execute(league_member_table.insert(), [
+        {'user_id': main.id, 'league_id': league.id} for league in leagues
+    ] + [{'user_id': user.id, 'league_id': current.id} for user in users[1:]])
+    db.session.execute(team_player_table.insert(), [
+        {'team_id': team.id, 'player_id': players[(i + j) % len(players)].id}
+        for i, team in enumerate(teams) for j in range(11)
+    ])
+    rebuild_points()
+    db.session.commit()
+    return main, current
+
+
+@pytest.mark.parametrize('path', QUERY_BUDGETS)
+def test_query_budget_does_not_grow_with_data(app, client, path):
+    counts = []
+    for size in (2, 20):
+        db.session.remove()
+        db.drop_all()
+        db.create_all()
+        main, league = seed(size)
+        headers = {'Authorization': f'Bearer {create_access_token(identity=main.id)}'}
+        forget_identity(main.id)
+        app.extensions.pop('dashboard_snapshots', None)
+        db.session.expire_all()
+
+        url = path.format(league_id=league.id)
+        response, queries = count_queries(app, lambda: client.get(url, headers=headers))
+        assert response.status_code == 200, response.get_data(as_text=True)
+        counts.append(queries)
+
+    assert counts[0] <= QUERY_BUDGETS[path]
+    assert counts[1] == counts[0], f'{path} ran {counts[0]} queries for a small dataset, {counts[1]} for a large one'
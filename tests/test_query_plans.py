@@ -0,0 +1,134 @@
+import os
+import random
+import re
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, select
+from app import create_app, db
+from app.models import League, Team
+from app.scoring import score_gameweek
+from app.seed import SEED_PASSWORD, seed_dataset
+from conftest import TEST_CONFIG
+
+# Every statement a route sends is run through EXPLAIN, and the test fails if
+# the plan reads a whole large table instead of using an index. Run against
+# Postgres by pointing TEST_POSTGRES_URL at a scratch database.
+LARGE_TABLES = {'user', 'team', 'league', 'player', 'team_player', 'league_member', 'player_gameweek_points'}
+# Scoring rewrites every team's and league's stored points on purpose
+ALLOWED_SCANS = {'scores.update_scores': {'team', 'league'}}
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+POSTGRES_SCAN = re.compile(r'Seq Scan on "?(\w+)"?')
+
+# (method, path, body, optional request that must run first)
+ROUTES = [
+    ('GET', '/players', None),
+    ('GET', '/players?position=Defender&sort=value', None),
+    ('GET', '/players?club=Arsenal', None),
+    ('GET', '/players?club=Arsenal&sort=value', None),
+    ('GET', '/teams/my-team', None),
+    ('GET', '/dashboard', None),
+    ('GET', '/leagues/my-leagues', None),
+    ('GET', '/leagues/public', None),
+    ('GET', '/leagues/public?q=a&open=true', None),
+    ('GET', '/leagues/{league_id}', None),
+    ('GET', '/scoreboard/gameweeks/1/top-scorers', None),
+    ('GET', '/scoreboard/players/{player_id}/history', None),
+    ('POST', '/teams/remove_player', {'player_id': '{player_id}'}),
+    ('POST', '/teams/draft', {'player_id': '{player_id}'}, ('POST', '/teams/remove_player', {'player_id': '{player_id}'})),
+    ('POST', '/teams/transfers', {'out': ['{player_id}']}),
+    ('POST', '/leagues/join', {'code': '{other_code}'}),
+    ('POST', '/leagues/{other_league_id}/leave', None, ('POST', '/leagues/join', {'code': '{other_code}'})),
+    ('POST', '/leagues/create', {'name': 'Plans'}),
+    ('DELETE', '/leagues/{league_id}', None),
+    ('POST', '/auth/login', {'email': '{email}', 'password': SEED_PASSWORD}),
+    ('POST', '/scoreboard/update', {}),
+]
+
+
+def _backends():
+    yield 'sqlite'
+    yield pytest.param('postgresql', marks=pytest.mark.skipif(
+        not os.getenv('TEST_POSTGRES_URL'), reason='TEST_POSTGRES_URL is not set'))
+
+
+@pytest.fixture(params=list(_backends()))
+def planned_app(request):
+    url = 'sqlite:///:memory:' if request.param == 'sqlite' else os.environ['TEST_POSTGRES_URL']
+    app = create_app({**TEST_CONFIG, 'SQLALCHEMY_DATABASE_URI': url})
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def scanned_tables(statement, parameters):
+    """Large tables the plan of one statement reads in full."""
+    connection = db.session.connection()
+    if connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        plan = '\n'.join(row[0] for row in connection.exec_driver_sql('EXPLAIN ' + statement, parameters))
+        return {table for table in POSTGRES_SCAN.findall(plan) if table in LARGE_TABLES}
+
+    tables = set()
+    for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters):
+        detail = row[3]
+        match = SQLITE_SCAN.match(detail)
+        if match and match.group(1) in LARGE_TABLES:
+            tables.add(match.group(1))
+        elif 'AUTOMATIC' in detail:
+            # SQLite built a throwaway index because no real one fits
+            tables.add(detail.split()[1])
+    return tables
+
+
+@pytest.mark.parametrize('route', ROUTES, ids=lambda route: f'{route[0]} {route[1]}')
+def test_route_queries_use_indexes(planned_app, route):
+    method, path, body, *setup = route
+    seed_dataset(users=300, leagues=30, players=300, seed=5)
+    score_gameweek(1, rng=random.Random(5))
+    team = db.session.scalars(select(Team).where(Team.league_id.is_not(None)).order_by(Team.id)).first()
+    team.league.owner_id = team.user_id
+    other = db.session.scalars(select(League).where(League.id != team.league_id).order_by(League.id)).first()
+    values = {'league_id': team.league_id, 'other_league_id': other.id, 'other_code': other.code,
+              'player_id': team.players[0].id, 'email': team.user.email}
+    headers = {'Authorization': f'Bearer {create_access_token(identity=team.user_id)}'}
+    db.session.commit()
+
+    def fill(value):
+        if isinstance(value, str):
+            filled = value.format(**values)
+            return int(filled) if filled.isdigit() and value != filled else filled
+        if isinstance(value, list):
+            return [fill(item) for item in value]
+        if isinstance(value, dict):
+            return {key: fill(item) for key, item in value.items()}
+        return value
+
+    client = planned_app.test_client()
+    for setup_method, setup_path, setup_body in setup:
+        assert client.open(fill(setup_path), method=setup_method, json=fill(setup_body), headers=headers).status_code < 400
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and re.match(r'\s*(SELECT|UPDATE|DELETE|WITH)\b', statement):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        response = client.open(fill(path), method=method, json=fill(body), headers=headers)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    assert response.status_code < 400, response.get_data(as_text=True)
+
+    endpoint = planned_app.url_map.bind('localhost').match(fill(path).split('?')[0], method=method)[0]
+    allowed = ALLOWED_SCANS.get(endpoint, set())
+    problems = []
+    for statement, parameters in statements:
+        scanned = scanned_tables(statement, parameters) - allowed
+        if scanned:
+            problems.append(f"{', '.join(sorted(scanned))}: {' '.join(statement.split())}")
+    db.session.rollback()
+    assert not problems, f'{method} {path} reads whole tables:\n' + '\n'.join(problems)
@@ -0,0 +1,61 @@
+import json
+import logging
+import pytest
+from app import request_log
+
+
+@pytest.fixture
+def log_lines(app):
+    """Route the listener's output into a list; call the result to drain the queue."""
+    lines = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            lines.append(json.loads(request_log.JsonFormatter().format(record)))
+
+    listener = request_log._listener
+    listener.stop()
+    original = listener.handlers
+    listener.handlers = (ListHandler(),)
+    listener.start()
+
+    def drain():
+        listener.stop()
+        listener.start()
+        return lines
+
+    yield drain
+    listener.stop()
+    listener.handlers = original
+    listener.start()
+
+
+def test_one_line_per_request_without_credentials(app, client, make_user, log_lines):
+    app.config['LOG_REQUEST_HEADERS'] = True
+    _, headers = make_user('xena')
+    client.post('/teams/draft', json={'player_id': 9999}, headers={**headers, 'X-Trace': 'abc'})
+
+    lines = log_lines()
+    request_lines = [line for line in lines if line['logger'] == 'app.request']
+    assert len(request_lines) == 1
+    line = request_lines[0]
+    assert (line['method'], line['path'], line['status']) == ('POST', '/teams/draft', 404)
+    assert line['duration_ms'] >= 0
+    assert line['headers']['Authorization'] == request_log.REDACTED
+    assert line['headers']['X-Trace'] == 'abc'
+    assert 'Bearer' not in json.dumps(lines)
+    assert any(line['logger'] == 'app.routes.teams' for line in lines)
+
+
+def test_hot_endpoints_are_sampled(app, client, make_user, log_lines):
+    _, headers = make_user('yuri')
+    app.config['LOG_SAMPLE_RATES'] = {'teams.get_team': 0.0}
+    for _ in range(5):
+        client.get('/teams/my-team', headers=headers)
+    client.get('/teams/my-team')  # 401s are not errors, still sampled
+    app.config['LOG_SLOW_REQUEST_MS'] = 0
+    client.get('/teams/my-team', headers=headers)
+
+    request_lines = [line for line in log_lines() if line['logger'] == 'app.request']
+    assert len(request_lines) == 1
+    assert request_lines[0]['sample_rate'] == 0.0
@@ -1,26 +1,19 @@
-import pytest
-from app import create_app, db
-from app.models import Score, Team, User
+def test_update_scores_validates_gameweek(client, make_user):
+    _, headers = make_user('scorer')
+    for gameweek in (0, -1, 'two', True):
+        response = client.post('/scoreboard/update', json={'gameweek': gameweek}, headers=headers)
+        assert response.status_code == 400
 
-@pytest.fixture
-def client():
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    with app.test_client() as client:
-        with app.app_context():
-            db.create_all()
-            yield client
 
-def test_get_scores(client):
-    user = User(username='test', email='test@example.com')
-    db.session.add(user)
-    team = Team(user_id=user.id, name='Test Team')
-    db.session.add(team)
-    score = Score(team_id=team.id, matchday=1, points=50)
-    db.session.add(score)
-    db.session.commit()
+def test_scored_gameweek_is_reported_not_rescored(client, make_user, make_player):
+    _, headers = make_user('scorer')
+    make_player('Rice', points=5)
+    first = client.post('/scoreboard/update', json={'gameweek': 1}, headers=headers)
+    assert first.status_code == 202
 
-    response = client.get('/scoreboard?league_id=1', headers={'Authorization': 'Bearer {mock_jwt}'})
-    assert response.status_code == 200
-    assert len(response.json()) == 1
\ No newline at end of file
+    again = client.post('/scoreboard/update', json={'gameweek': 1}, headers=headers)
+    assert again.status_code == 200
+    assert again.get_json()['message'] == 'Gameweek 1 has already been scored.'
+
+    top = client.get('/scoreboard/gameweeks/1/top-scorers', headers=headers)
+    assert top.status_code == 200
@@ -0,0 +1,121 @@
+import random
+from types import SimpleNamespace
+from sqlalchemy.dialects import postgresql
+from app import db
+from app.history import player_form, player_history, season_totals, top_scorers
+from app.models import Gameweek, Player, PlayerGameweekPoints, Team
+from app.scoring import _apply_points, _record_history, next_gameweek, score_gameweek
+
+
+def test_score_gameweek_updates_all_players_in_one_batch(app, make_user, make_player):
+    user, _ = make_user('dave')
+    team = Team.query.filter_by(user_id=user.id).one()
+    squad = [make_player(f'P{i}', points=0) for i in range(5)]
+    team.players.extend(squad)
+    db.session.commit()
+
+    assert score_gameweek(1, rng=random.Random(7)) == 5
+    db.session.commit()
+
+    points = [p.points for p in Player.query.order_by(Player.id)]
+    assert all(p >= 0 for p in points)
+    assert team.total_points == sum(points)
+    assert db.session.get(Gameweek, 1).players_scored == 5
+    assert next_gameweek() == 2
+
+
+def test_rescoring_a_gameweek_is_a_no_op(app, make_player):
+    make_player('Rice', points=10)
+    score_gameweek(3)
+    db.session.commit()
+    after_first = Player.query.one().points
+
+    assert score_gameweek(3) is None
+    db.session.commit()
+    assert Player.query.one().points == after_first
+
+
+def test_update_scores_route_runs_a_job(client, make_user, make_player):
+    _, headers = make_user('erin')
+    make_player('Odegaard', points=10)
+
+    response = client.post('/scoreboard/update', json={'gameweek': 4}, headers=headers)
+    assert response.status_code == 202
+    assert response.get_json()['gameweek'] == 4
+    job = client.get(response.get_json()['status_url'], headers=headers).get_json()
+    assert job['status'] == 'succeeded'
+    assert job['rows_written'] == 1
+    assert job['result']['gameweek'] == 4
+
+    response = client.post('/scoreboard/update', json={'gameweek': 4}, headers=headers)
+    assert response.status_code == 200
+    assert 'already been scored' in response.get_json()['message']
+
+    response = client.post('/scoreboard/update', headers=headers)
+    assert response.get_json()['gameweek'] == 5
+
+    assert client.post('/scoreboard/update', json={'gameweek': 'x'}, headers=headers).status_code == 400
+
+
+def test_scoring_appends_gameweek_history(app, make_player):
+    salah = make_player('Salah', points=0)
+    saka = make_player('Saka', points=0)
+    for gameweek in (1, 2, 3):
+        score_gameweek(gameweek, rng=random.Random(gameweek))
+    db.session.commit()
+
+    rows = PlayerGameweekPoints.query.filter_by(player_id=salah.id).all()
+    assert sorted(r.gameweek for r in rows) == [1, 2, 3]
+    assert sum(r.points for r in rows) == salah.points
+
+    form = player_form([salah.id, saka.id], last_n=2)
+    assert form[salah.id] == sum(r.points for r in rows if r.gameweek >= 2)
+    assert [r['gameweek'] for r in player_history(salah.id, last_n=2)] == [3, 2]
+
+    totals = season_totals()
+    assert {r['player_id']: r['points'] for r in totals} == {salah.id: salah.points, saka.id: saka.points}
+    assert totals[0]['points'] >= totals[1]['points']
+
+    top = top_scorers(2, limit=1)
+    assert len(top) == 1
+    assert top[0]['points'] == max(r.points for r in PlayerGameweekPoints.query.filter_by(gameweek=2))
+
+
+def test_history_routes(client, make_user, make_player):
+    _, headers = make_user('fay')
+    player = make_player('Palmer', points=0)
+    client.post('/scoreboard/update', json={'gameweek': 1}, headers=headers)
+
+    top = client.get('/scoreboard/gameweeks/1/top-scorers', headers=headers).get_json()
+    assert top[0]['name'] == 'Palmer'
+
+    data = client.get(f'/scoreboard/players/{player.id}/history', headers=headers).get_json()
+    assert data['history'][0]['gameweek'] == 1
+    assert data['form'] == db.session.get(Player, player.id).points
+
+    for url in ('/scoreboard/gameweeks/1/top-scorers?limit=-5', '/scoreboard/gameweeks/1/top-scorers?limit=101',
+                f'/scoreboard/players/{player.id}/history?last=0'):
+        assert client.get(url, headers=headers).status_code == 400
+
+
+def test_server_databases_apply_points_in_chunked_updates(monkeypatch):
+    monkeypatch.setattr('app.scoring.UPDATE_CHUNK_SIZE', 2)
+    statements = []
+    connection = SimpleNamespace(dialect=postgresql.psycopg2.dialect(), execute=statements.append)
+    _apply_points(connection, [{'player_id': i, 'new_points': i * 10} for i in range(1, 6)])
+
+    assert len(statements) == 3
+    compiled = statements[0].compile(dialect=connection.dialect)
+    assert ' '.join(str(compiled).split()).startswith('UPDATE player SET points=new_points.points FROM (VALUES')
+    assert list(compiled.params.values()) == [1, 10, 2, 20]
+
+
+def test_server_databases_record_history_through_insertmanyvalues():
+    calls = []
+    connection = SimpleNamespace(dialect=postgresql.psycopg2.dialect(),
+                                 execute=lambda statement, rows: calls.append((statement, rows)))
+    _record_history(connection, 4, [{'player_id': 1, 'delta': 3}, {'player_id': 2, 'delta': -1}])
+
+    [(statement, rows)] = calls
+    assert statement.table.name == 'player_gameweek_points'
+    assert rows == [{'gameweek': 4, 'player_id': 1, 'points': 3}, {'gameweek': 4, 'player_id': 2, 'points': -1}]
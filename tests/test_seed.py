@@ -0,0 +1,50 @@
+from sqlalchemy import func, select
+from app import db
+from app.models import User, Team, League, Player, league_member_table, team_player_table
+from app.seed import SQUAD_BUDGET, seed_dataset
+
+
+def snapshot():
+    return (
+        db.session.execute(select(User.username, User.email).order_by(User.id)).all(),
+        db.session.execute(select(Player.name, Player.value, Player.position).order_by(Player.id)).all(),
+        db.session.execute(select(team_player_table).order_by(*team_player_table.c)).all(),
+    )
+
+
+def test_seed_dataset_is_consistent(app):
+    counts = seed_dataset(users=60, leagues=4, players=80, seed=7)
+    db.session.commit()
+    assert counts['users'] == counts['teams'] == 60
+    assert db.session.scalar(select(func.count()).select_from(team_player_table)) == counts['team_players'] == 660
+
+    for team in Team.query.all():
+        squad = team.players
+        assert team.squad_size == len(squad) == 11
+        assert team.total_points == sum(player.points for player in squad)
+        assert round(team.budget_left + sum(player.value for player in squad), 1) == SQUAD_BUDGET
+
+    for league in League.query.all():
+        members = db.session.scalar(select(func.count()).where(league_member_table.c.league_id == league.id))
+        assert 0 < members == league.member_count <= league.max_members
+        assert league.owner in league.users
+        assert league.total_points == sum(team.total_points for team in league.teams)
+
+
+def test_seed_dataset_is_reproducible(app):
+    seed_dataset(users=20, leagues=2, players=40, seed=3)
+    first = snapshot()
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    seed_dataset(users=20, leagues=2, players=40, seed=3)
+    assert snapshot() == first
+
+
+def test_seed_dataset_appends(app):
+    seed_dataset(users=20, leagues=2, players=40, seed=3)
+    db.session.commit()
+    seed_dataset(users=20, leagues=2, players=40, seed=3)
+    db.session.commit()
+    assert db.session.scalar(select(func.count()).select_from(User)) == 40
+    assert db.session.scalar(select(func.count(func.distinct(League.code)))) == 4
@@ -0,0 +1,143 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import func, select
+from app import create_app, db
+from app.models import User, Team, Player, team_player_table
+from app.squad import MAX_SQUAD_SIZE
+from conftest import TEST_CONFIG
+
+
+def test_draft_rules(client, make_user, make_player):
+    user, headers = make_user('dave', budget_left=12.0)
+    cheap = make_player('Cheap', points=3, value=5.0)
+    pricey = make_player('Pricey', value=50.0)
+
+    assert client.post('/teams/draft', json={'player_id': cheap.id}, headers=headers).status_code == 201
+    response = client.post('/teams/draft', json={'player_id': cheap.id}, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'This player is already in your team.'
+
+    response = client.post('/teams/draft', json={'player_id': pricey.id}, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Insufficient budget to draft this player.'
+
+    assert client.post('/teams/draft', json={'player_id': 9999}, headers=headers).status_code == 404
+
+    team = Team.query.filter_by(user_id=user.id).one()
+    assert (team.squad_size, team.budget_left, team.total_points) == (1, 7.0, 3)
+
+
+def test_draft_rejects_full_squad(client, make_user, make_player):
+    user, headers = make_user('erin')
+    players = [make_player(f'Player {i}', value=1.0) for i in range(MAX_SQUAD_SIZE + 1)]
+    for player in players[:MAX_SQUAD_SIZE]:
+        assert client.post('/teams/draft', json={'player_id': player.id}, headers=headers).status_code == 201
+
+    response = client.post('/teams/draft', json={'player_id': players[-1].id}, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Your team is full (11 players).'
+
+
+def test_remove_refunds_and_rejects_unknown(client, make_user, make_player):
+    user, headers = make_user('frank', budget_left=20.0)
+    drafted = make_player('Drafted', points=8, value=6.0)
+    other = make_player('Other')
+    client.post('/teams/draft', json={'player_id': drafted.id}, headers=headers)
+
+    response = client.post('/teams/remove_player', json={'player_id': other.id}, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'This player is not in your team.'
+    assert client.post('/teams/remove_player', json={'player_id': 9999}, headers=headers).status_code == 404
+
+    assert client.post('/teams/remove_player', json={'player_id': drafted.id}, headers=headers).status_code == 200
+    team = Team.query.filter_by(user_id=user.id).one()
+    assert (team.squad_size, team.budget_left, team.total_points) == (0, 20.0, 0)
+
+
+def test_transfers_swap_players_in_a_full_squad(client, make_user, make_player):
+    user, headers = make_user('gina', budget_left=60.0)
+    client.post('/leagues/create', json={'name': 'Delta'}, headers=headers)
+    squad = [make_player(f'Player {i}', points=2, value=5.0) for i in range(MAX_SQUAD_SIZE)]
+    star = make_player('Star', points=30, value=10.0)
+    response = client.post('/teams/transfers', json={'in': [p.id for p in squad]}, headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()['squad_size'] == MAX_SQUAD_SIZE
+
+    response = client.post('/teams/transfers', json={'out': [squad[0].id, squad[1].id], 'in': [star.id]},
+                           headers=headers)
+    assert response.status_code == 200
+    assert response.get_json() == {'message': 'Transfers complete.', 'budget_left': 5.0,
+                                   'squad_size': MAX_SQUAD_SIZE - 1, 'total_points': 48}
+    team = Team.query.filter_by(user_id=user.id).one()
+    assert len(team.players) == MAX_SQUAD_SIZE - 1
+    assert team.league.total_points == 48
+
+
+def test_transfers_are_all_or_nothing(client, make_user, make_player):
+    user, headers = make_user('hank', budget_left=12.0)
+    kept = make_player('Kept', points=4, value=5.0)
+    outsider = make_player('Outsider', value=1.0)
+    pricey = make_player('Pricey', value=20.0)
+    client.post('/teams/draft', json={'player_id': kept.id}, headers=headers)
+
+    cases = [
+        ({'in': [pricey.id]}, 400, 'Insufficient budget for these transfers.'),
+        ({'out': [outsider.id]}, 400, 'A transferred-out player is not in your team.'),
+        ({'in': [kept.id, outsider.id]}, 400, 'A transferred-in player is already in your team.'),
+        ({'out': [kept.id], 'in': [9999]}, 404, 'Player not found.'),
+        ({'out': [kept.id], 'in': [kept.id]}, 400, 'A player cannot be transferred both out and in.'),
+        ({'in': 'everyone'}, 400, 'out and in must be lists of player IDs.'),
+    ]
+    for payload, status, message in cases:
+        response = client.post('/teams/transfers', json=payload, headers=headers)
+        assert (response.status_code, response.get_json()['message']) == (status, message)
+
+    team = Team.query.filter_by(user_id=user.id).one()
+    assert (team.squad_size, team.budget_left, team.total_points) == (1, 7.0, 4)
+    assert [p.id for p in team.players] == [kept.id]
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    # Each thread needs its own connection to the same database, so no :memory:
+    app = create_app({**TEST_CONFIG, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/squad.db'})
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.mark.parametrize('budget_left', [100.0, 32.0])
+def test_concurrent_drafts_never_break_squad_rules(file_app, budget_left):
+    user = User(username='racer', email='racer@example.com')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(Team(name='Racers', user_id=user.id, budget_left=budget_left))
+    players = [Player(api_player_id=i, name=f'Player {i}', team_name='Arsenal', position='Midfielder',
+                      value=5.0, points=i) for i in range(1, 31)]
+    db.session.add_all(players)
+    db.session.commit()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
+    # Every player is requested twice so duplicates race as well
+    player_ids = [player.id for player in players] * 2
+
+    def draft(player_id):
+        with file_app.test_client() as client:
+            return client.post('/teams/draft', json={'player_id': player_id}, headers=headers).status_code
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(draft, player_ids))
+
+    db.session.expire_all()
+    team = Team.query.filter_by(user_id=user.id).one()
+    drafted = db.session.scalar(
+        select(func.count()).select_from(team_player_table).where(team_player_table.c.team_id == team.id)
+    )
+    expected_size = min(MAX_SQUAD_SIZE, int(budget_left // 5.0))
+    assert set(statuses) <= {201, 400}
+    assert statuses.count(201) == team.squad_size == drafted == expected_size
+    assert team.budget_left == budget_left - 5.0 * team.squad_size >= 0
+    assert team.total_points == sum(player.points for player in team.players)
@@ -0,0 +1,82 @@
+from flask_jwt_extended import create_access_token
+from app import db
+from app.models import Team, League, league_member_table
+from app.standings import league_standings, user_league_ranks
+from conftest import count_queries
+
+
+def _league_with_points(make_user, points_by_user):
+    """Create one league whose teams have the given stored points."""
+    users = {}
+    for username in points_by_user:
+        users[username], _ = make_user(username)
+    league = League(name='Standings', owner_id=next(iter(users.values())).id)
+    db.session.add(league)
+    db.session.flush()
+    for username, points in points_by_user.items():
+        team = Team.query.filter_by(user_id=users[username].id).one()
+        team.league_id = league.id
+        team.total_points = points
+    db.session.commit()
+    return league, users
+
+
+def test_ranks_are_tie_aware(app, make_user):
+    league, _ = _league_with_points(make_user, {'ann': 50, 'ben': 70, 'cat': 50, 'dan': 10})
+
+    standard = league_standings(league.id)
+    assert [(r['owner_name'], r['rank']) for r in standard] == [
+        ('ben', 1), ('ann', 2), ('cat', 2), ('dan', 4)]
+
+    dense = league_standings(league.id, ranking='dense')
+    assert [r['rank'] for r in dense] == [1, 2, 2, 3]
+
+
+def test_top_n_includes_my_row(app, make_user):
+    league, users = _league_with_points(make_user, {'ann': 90, 'ben': 80, 'cat': 70, 'dan': 10})
+    dan_team = Team.query.filter_by(user_id=users['dan'].id).one()
+
+    rows = league_standings(league.id, limit=2, team_id=dan_team.id)
+    assert [(r['owner_name'], r['rank']) for r in rows] == [('ann', 1), ('ben', 2), ('dan', 4)]
+
+    assert [r['rank'] for r in league_standings(league.id, limit=0, team_id=dan_team.id)] == [4]
+    assert league_standings(league.id + 1, limit=0, team_id=dan_team.id) == []
+
+
+def test_league_details_route_uses_sql_ranking(client, make_user):
+    league, _ = _league_with_points(make_user, {'ann': 30, 'ben': 30})
+    _, headers = make_user('viewer')
+
+    response = client.get(f'/leagues/{league.id}', headers=headers)
+    assert response.status_code == 200
+    assert [s['rank'] for s in response.get_json()['standings']] == [1, 1]
+
+    response = client.get(f'/leagues/{league.id}?ranking=bogus', headers=headers)
+    assert response.status_code == 400
+
+
+def test_dashboard_snippet_shows_top_two_and_user(client, make_user):
+    league, users = _league_with_points(make_user, {'ann': 90, 'ben': 80, 'cat': 70})
+    headers = {'Authorization': f"Bearer {create_access_token(identity=users['cat'].id)}"}
+
+    data = client.get('/dashboard', headers=headers).get_json()
+    assert data['league_rank'] == 3
+    assert [row['rank'] for row in data['league_standings_snippet']] == [1, 2, 3]
+
+
+def test_user_league_ranks_in_one_query(app, make_user):
+    league, users = _league_with_points(make_user, {'ann': 50, 'ben': 70, 'cat': 50})
+    other = League(name='Other', owner_id=users['ann'].id, member_count=1)
+    db.session.add(other)
+    db.session.flush()
+    db.session.execute(league_member_table.insert(), [
+        {'user_id': users['ann'].id, 'league_id': league.id}, {'user_id': users['ann'].id, 'league_id': other.id}])
+    db.session.commit()
+    ann_team = Team.query.filter_by(user_id=users['ann'].id).one()
+
+    rows, queries = count_queries(app, lambda: user_league_ranks(users['ann'].id, ann_team.id))
+    assert queries == 1
+    assert [(r['name'], r['rank'], r['points'], r['owner_id']) for r in rows] == [
+        ('Standings', 2, 50, users['ann'].id), ('Other', None, None, users['ann'].id)]
+    assert user_league_ranks(users['ann'].id)[0]['rank'] is None
+    assert user_league_ranks(users['ben'].id) == []